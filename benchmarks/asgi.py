@@ -0,0 +1,46 @@
+from typing import Iterable, Tuple
+from urllib.parse import urlsplit
+
+
+async def call(
+        app,
+        method: str,
+        url: str,
+        body: bytes = b"",
+        headers: Iterable[Tuple[str, str]] = ()) -> Tuple[int, bytes]:
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers]
+        + [(b"content-length", str(len(body)).encode()), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    request_sent = False
+    status_code = 0
+    chunks = []
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code, b"".join(chunks)
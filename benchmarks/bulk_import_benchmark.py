@@ -0,0 +1,71 @@
+import argparse
+import json
+import time
+from fastapi.testclient import TestClient
+from config.endpoints import EndpointConfig
+from main import app
+
+URL = EndpointConfig()
+
+
+def generate_payload(index: int) -> dict:
+    return {
+        "title": f"Imported testcase {index}",
+        "description": "Testcase description",
+        "author": "Importer",
+        "tags": ["imported", f"suite-{index % 20}"],
+        "expected_results": "should pass"
+    }
+
+
+def create_project(httpclient: TestClient) -> str:
+    response = httpclient.post(
+        URL.PROJECT.CREATE_PROJECT,
+        json={"title": "Import project", "owner": "Importer", "tags": ["import"]}
+    )
+    return response.json()["id"]
+
+
+def import_one_by_one(httpclient: TestClient, payloads: list) -> float:
+    project_id = create_project(httpclient)
+    started = time.perf_counter()
+    for payload in payloads:
+        httpclient.post(URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id), json=payload)
+    return time.perf_counter() - started
+
+
+def import_json_array(httpclient: TestClient, payloads: list) -> float:
+    project_id = create_project(httpclient)
+    started = time.perf_counter()
+    httpclient.post(URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id), json=payloads)
+    return time.perf_counter() - started
+
+
+def import_ndjson(httpclient: TestClient, payloads: list) -> float:
+    project_id = create_project(httpclient)
+    body = "\n".join(json.dumps(payload) for payload in payloads)
+    started = time.perf_counter()
+    httpclient.post(
+        URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id),
+        content=body,
+        headers={"content-type": "application/x-ndjson"}
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare single-create and bulk testcase import wall-clock time")
+    parser.add_argument("--records", type=int, default=5000)
+    arguments = parser.parse_args()
+
+    payloads = [generate_payload(index) for index in range(arguments.records)]
+    httpclient = TestClient(app)
+    single = import_one_by_one(httpclient, payloads)
+    print(f"{'single create':<16}{single:>10.3f}s")
+    for name, importer in (("bulk json", import_json_array), ("bulk ndjson", import_ndjson)):
+        elapsed = importer(httpclient, payloads)
+        print(f"{name:<16}{elapsed:>10.3f}s{single / elapsed:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Awaitable, Callable, List, Tuple
+from benchmarks.asgi import call
+from config.endpoints import EndpointConfig
+from storage import Storage, create_memory_storage, create_sqlite_storage
+import main as service
+
+URL = EndpointConfig()
+
+
+def create_benchmark_storage(backend: str, path: str) -> Storage:
+    if backend == "sqlite":
+        return create_sqlite_storage(path, 4)
+    return create_memory_storage()
+
+
+async def post(url: str, payload) -> dict:
+    status_code, body = await call(service.app, "POST", url, json.dumps(payload).encode())
+    if status_code >= 400:
+        raise RuntimeError(f"POST {url} failed with {status_code}: {body[:200]!r}")
+    return json.loads(body)
+
+
+async def seed(records: int) -> Tuple[str, List[str]]:
+    project = await post(URL.PROJECT.CREATE_PROJECT, {"title": "Release", "owner": "Bench", "tags": ["bench"]})
+    payloads = [
+        {
+            "title": f"Testcase {index}",
+            "description": "Testcase description",
+            "author": f"author-{index % 10}",
+            "tags": ["release-1", f"suite-{index % 20}"],
+            "expected_results": "should pass"
+        }
+        for index in range(records)
+    ]
+    created = await post(URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project["id"]), payloads)
+    return project["id"], [result["id"] for result in created["results"]]
+
+
+async def update_one_by_one(project_id: str, testcase_ids: List[str]):
+    for testcase_id in testcase_ids:
+        detail_url = URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+        _, body = await call(service.app, "GET", detail_url)
+        testcase = json.loads(body)
+        payload = {
+            "title": testcase["title"],
+            "description": testcase["description"],
+            "author": testcase["author"],
+            "tags": [tag for tag in testcase["tags"] if tag != "release-1"] + ["release-2"],
+            "expected_results": testcase["expected_results"]
+        }
+        url = URL.TESTCASE.UPDATE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+        await call(service.app, "PUT", url, json.dumps(payload).encode())
+
+
+async def update_in_bulk(project_id: str, testcase_ids: List[str]):
+    await post(URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id), {
+        "select": {"ids": testcase_ids},
+        "changes": {"add_tags": ["release-2"], "remove_tags": ["release-1"]},
+        "updated_by": "Bench"
+    })
+
+
+async def update_by_filter(project_id: str, testcase_ids: List[str]):
+    await post(URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id), {
+        "select": {"tags": ["release-1"]},
+        "changes": {"add_tags": ["release-2"], "remove_tags": ["release-1"]},
+        "updated_by": "Bench"
+    })
+
+
+async def archive_one_by_one(project_id: str, testcase_ids: List[str]):
+    for testcase_id in testcase_ids:
+        url = URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+        await call(service.app, "DELETE", url)
+
+
+async def archive_in_bulk(project_id: str, testcase_ids: List[str]):
+    await post(URL.TESTCASE.BULK_ARCHIVE_TESTCASE.format(project_id=project_id), {"select": {"ids": testcase_ids}})
+
+
+async def measure(
+        backend: str,
+        directory: str,
+        records: int,
+        operation: Callable[[str, List[str]], Awaitable[None]]) -> float:
+    path = os.path.join(directory, f"bulk-{records}-{operation.__name__}.db")
+    service.db = create_benchmark_storage(backend, path)
+    for cache in service.response_caches.values():
+        cache.clear()
+    project_id, testcase_ids = await seed(records)
+    started = time.perf_counter()
+    await operation(project_id, testcase_ids)
+    elapsed = time.perf_counter() - started
+    service.db.close()
+    return elapsed
+
+
+async def run(arguments: argparse.Namespace):
+    comparisons = (
+        ("retag", update_one_by_one, (("bulk ids", update_in_bulk), ("bulk filter", update_by_filter))),
+        ("archive", archive_one_by_one, (("bulk ids", archive_in_bulk),)),
+    )
+    print(f"{'records':>9} {'operation':<24}{'seconds':>10}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for records in arguments.records:
+            for name, per_item, bulk_operations in comparisons:
+                single = await measure(arguments.backend, directory, records, per_item)
+                print(f"{records:>9,} {name + ' per item':<24}{single:>10.3f}")
+                for label, operation in bulk_operations:
+                    elapsed = await measure(arguments.backend, directory, records, operation)
+                    print(f"{records:>9,} {name + ' ' + label:<24}{elapsed:>10.3f}{single / elapsed:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-item and bulk testcase updates and archiving")
+    parser.add_argument("--records", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from uuid import uuid4
+from benchmarks.asgi import call
+from config.endpoints import EndpointConfig
+from models.projects import ProjectResponseModel
+from models.runs import RESULT_STATUSES, TestResultResponseModel, TestRunResponseModel
+from models.testcase import TestCaseResponseModel
+from storage import Storage, create_memory_storage, create_sqlite_storage
+from storage.records import pack_result_time
+from storage.rollups import GRANULARITIES, bucket_start
+import main as service
+
+URL = EndpointConfig()
+STATUS_WEIGHTS = (90, 6, 3, 1)
+HISTORY_BUCKETS = {"hour": 168, "day": 90, "week": 13}
+
+
+def create_benchmark_storage(backend: str, directory: str) -> Storage:
+    if backend == "sqlite":
+        return create_sqlite_storage(os.path.join(directory, "history.db"), 4)
+    return create_memory_storage()
+
+
+def seed(storage: Storage, arguments: argparse.Namespace) -> Dict[str, List[str]]:
+    created_at = datetime.utcnow()
+    testcase_ids: Dict[str, List[str]] = {}
+    for index in range(arguments.projects):
+        project = ProjectResponseModel.construct(
+            id=uuid4(), title=f"History project {index}", description="Seeded", owner="Bench", tags=["bench"],
+            created_at=created_at, updated_at=created_at, active=True
+        )
+        storage.projects.add(project)
+        testcases = [
+            TestCaseResponseModel.construct(
+                project_id=project.id, id=uuid4(), title=f"Testcase {item}", description="Seeded", author="Bench",
+                tags=["bench"], expected_results="should pass", created_at=created_at, updated_at=created_at,
+                updated_by="Bench", archived=False
+            )
+            for item in range(arguments.testcases // arguments.projects)
+        ]
+        storage.testcases.add_many(testcases)
+        testcase_ids[str(project.id)] = [str(testcase.id) for testcase in testcases]
+
+    randomizer = random.Random(0)
+    first_day = created_at.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=arguments.days)
+    batches = arguments.results // arguments.batch_size
+    project_ids = list(testcase_ids)
+    runs: Dict[Tuple[str, int], str] = {}
+    started = time.perf_counter()
+    for batch_index in range(batches):
+        project_id = project_ids[batch_index % len(project_ids)]
+        day = batch_index * arguments.days // batches
+        run_id = runs.get((project_id, day))
+        if run_id is None:
+            run = TestRunResponseModel.construct(
+                project_id=project_id, id=uuid4(), name=f"Day {day}", environment="bench",
+                created_at=first_day + timedelta(days=day)
+            )
+            storage.runs.add(run)
+            run_id = runs[(project_id, day)] = str(run.id)
+        candidates = testcase_ids[project_id]
+        run_started = first_day + timedelta(days=day, seconds=randomizer.randrange(86400))
+        statuses = randomizer.choices(RESULT_STATUSES, STATUS_WEIGHTS, k=arguments.batch_size)
+        storage.runs.append_results(run_id, [
+            TestResultResponseModel.construct(
+                run_id=run_id,
+                testcase_id=candidates[(batch_index * arguments.batch_size + item) % len(candidates)],
+                status=statuses[item],
+                duration_ms=item,
+                output=None,
+                finished_at=run_started + timedelta(milliseconds=item * 10)
+            )
+            for item in range(arguments.batch_size)
+        ])
+        if (batch_index + 1) % max(1, batches // 10) == 0:
+            print(f"  seeded {(batch_index + 1) * arguments.batch_size:,} results "
+                  f"({time.perf_counter() - started:.0f} s)")
+    return testcase_ids
+
+
+def percentiles(latencies: List[float]) -> Tuple[float, float]:
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000, latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+
+async def measure_queries(testcase_ids: Dict[str, List[str]], queries: int) -> Dict[str, Tuple[float, float]]:
+    randomizer = random.Random(1)
+    timings = {}
+    for granularity, buckets in HISTORY_BUCKETS.items():
+        for scope in ("testcase", "project"):
+            latencies = []
+            for _ in range(queries):
+                project_id = randomizer.choice(list(testcase_ids))
+                if scope == "project":
+                    url = URL.RUN.GET_PROJECT_HISTORY.format(project_id=project_id)
+                else:
+                    url = URL.RUN.GET_TESTCASE_HISTORY.format(
+                        project_id=project_id, testcase_id=randomizer.choice(testcase_ids[project_id])
+                    )
+                started = time.perf_counter()
+                status_code, _ = await call(service.app, "GET", f"{url}?granularity={granularity}&limit={buckets}")
+                latencies.append(time.perf_counter() - started)
+                if status_code >= 400:
+                    raise RuntimeError(f"History query {url} failed with {status_code}")
+            timings[f"{scope}/{granularity}"] = percentiles(latencies)
+    return timings
+
+
+def scan_project_history(project_id: str, granularity: str) -> Tuple[int, float]:
+    started = time.perf_counter()
+    buckets: Dict[int, Counter] = {}
+    run_cursor = None
+    while True:
+        runs, run_cursor = service.db.runs.find_by_project(project_id, run_cursor, 500)
+        for run in runs:
+            cursor = None
+            while True:
+                results, cursor = service.db.runs.results(str(run.id), cursor, 5000)
+                for result in results:
+                    start = bucket_start(pack_result_time(result.finished_at), granularity)
+                    buckets.setdefault(start, Counter())[result.status] += 1
+                if cursor is None:
+                    break
+        if run_cursor is None:
+            break
+    return len(buckets), (time.perf_counter() - started) * 1000
+
+
+async def run(arguments: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as directory:
+        service.db = create_benchmark_storage(arguments.backend, directory)
+        print(f"{arguments.backend}: seeding {arguments.results:,} results over {arguments.days} days")
+        testcase_ids = seed(service.db, arguments)
+        print(f"{'query':<20}{'p50 ms':>10}{'p99 ms':>10}")
+        for name, (p50, p99) in (await measure_queries(testcase_ids, arguments.queries)).items():
+            print(f"{name:<20}{p50:>10.3f}{p99:>10.3f}")
+        if arguments.scan:
+            project_id = next(iter(testcase_ids))
+            for granularity in GRANULARITIES:
+                buckets, elapsed = scan_project_history(project_id, granularity)
+                print(f"raw scan {granularity:<11}{elapsed:>10.0f} ms for {buckets} buckets of one project")
+        service.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure pass-rate history queries over a large result history")
+    parser.add_argument("--results", type=int, default=10000000)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--testcases", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument(
+        "--scan", action="store_true", help="also time rebuilding one project's history from raw results"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+from benchmarks.asgi import call
+from config.endpoints import EndpointConfig
+from storage import Storage, create_memory_storage, create_sqlite_storage
+import main as service
+
+URL = EndpointConfig()
+
+
+def create_benchmark_storage(backend: str, path: str) -> Storage:
+    if backend == "sqlite":
+        return create_sqlite_storage(path, 4)
+    return create_memory_storage()
+
+
+async def post(url: str, payload) -> dict:
+    status_code, body = await call(service.app, "POST", url, json.dumps(payload).encode())
+    if status_code >= 400:
+        raise RuntimeError(f"POST {url} failed with {status_code}: {body[:200]!r}")
+    return json.loads(body)
+
+
+async def seed(records: int) -> Tuple[str, List[str]]:
+    project = await post(URL.PROJECT.CREATE_PROJECT, {"title": "Hot", "owner": "Bench", "tags": ["bench"]})
+    payloads = [
+        {
+            "title": f"Testcase {index}",
+            "description": "Testcase description",
+            "author": "Bench",
+            "tags": ["bench"],
+            "expected_results": "should pass"
+        }
+        for index in range(records)
+    ]
+    created = await post(URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project["id"]), payloads)
+    return project["id"], [result["id"] for result in created["results"]]
+
+
+def update_request(project_id: str, testcase_id: str, index: int) -> Tuple[str, str, bytes]:
+    if index % 2:
+        url = URL.TESTCASE.UPDATE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+        return "PUT", url, json.dumps({
+            "title": f"Update {index}",
+            "description": f"Description {index}",
+            "author": "Bench",
+            "tags": [f"tag-{index}"],
+            "expected_results": "should pass"
+        }).encode()
+    url = URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+    return "PATCH", url, json.dumps({"title": f"Update {index}", "tags": [f"tag-{index}"]}).encode()
+
+
+async def run_updates(requests: int, concurrency: int, target: Callable[[int], str], project_id: str) -> dict:
+    queue = iter(range(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for index in queue:
+            method, url, body = update_request(project_id, target(index), index)
+            started = time.perf_counter()
+            status_code, _ = await call(service.app, method, url, body)
+            latencies.append(time.perf_counter() - started)
+            errors += status_code >= 400
+
+    waits = service.testcase_locks.waits
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "errors": errors,
+        "lock_waits": service.testcase_locks.waits - waits,
+    }
+
+
+async def check_consistency(project_id: str, testcase_ids: List[str]) -> bool:
+    for testcase_id in testcase_ids:
+        url = URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+        _, body = await call(service.app, "GET", url)
+        testcase = json.loads(body)
+        if testcase["title"].startswith("Update ") and testcase["tags"] != [f"tag-{testcase['title'][7:]}"]:
+            return False
+    _, body = await call(service.app, "GET", URL.TESTCASE.GET_TESTCASE_TAGS.format(project_id=project_id))
+    return sum(json.loads(body)["tags"].values()) == len(testcase_ids)
+
+
+async def run(arguments: argparse.Namespace):
+    print(
+        f"{'target':<10}{'concurrency':>12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'waits':>8}{'errors':>8}"
+        "  consistent"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for concurrency in arguments.concurrency:
+            for name in ("hot", "spread"):
+                service.db = create_benchmark_storage(
+                    arguments.backend, os.path.join(directory, f"hot-{concurrency}-{name}.db")
+                )
+                for cache in service.response_caches.values():
+                    cache.clear()
+                project_id, testcase_ids = await seed(arguments.records)
+                targets = testcase_ids[:1] if name == "hot" else testcase_ids
+                result = await run_updates(
+                    arguments.requests, concurrency, lambda index: targets[index % len(targets)], project_id
+                )
+                consistent = await check_consistency(project_id, testcase_ids)
+                print(
+                    f"{name:<10}{concurrency:>12}{result['throughput']:>10,.0f}{result['p50_ms']:>10.2f}"
+                    f"{result['p99_ms']:>10.2f}{result['lock_waits']:>8}{result['errors']:>8}  {consistent}"
+                )
+                service.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure concurrent updates aimed at one hot testcase")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List
+from benchmarks.asgi import call
+from benchmarks.storage_benchmark import generate_testcases
+from config.endpoints import EndpointConfig
+from models.testcase import TestCaseResponseModel
+from storage import create_journaled_storage
+import main as service
+
+URL = EndpointConfig()
+
+
+async def write_concurrently(directory: str, requests: int, writers: int, commit_delay: float) -> float:
+    service.db = create_journaled_storage(directory, commit_delay=commit_delay)
+    slots = asyncio.Semaphore(writers)
+
+    async def create_project(index: int):
+        body = json.dumps({"title": f"Project {index}", "owner": "Bench", "tags": ["bench"]}).encode()
+        async with slots:
+            status_code, response = await call(service.app, "POST", URL.PROJECT.CREATE_PROJECT, body)
+        if status_code >= 400:
+            raise RuntimeError(f"Create failed with {status_code}: {response[:200]!r}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(create_project(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+    service.db.close()
+    return requests / elapsed
+
+
+def write_in_batches(directory: str, records: List[TestCaseResponseModel], batch_size: int) -> float:
+    storage = create_journaled_storage(directory, snapshot_every=len(records) * 2)
+    started = time.perf_counter()
+    for start in range(0, len(records), batch_size):
+        storage.testcases.add_many(records[start:start + batch_size])
+    elapsed = time.perf_counter() - started
+    storage.close()
+    return len(records) / elapsed
+
+
+def measure_restart(directory: str) -> float:
+    started = time.perf_counter()
+    storage = create_journaled_storage(directory)
+    elapsed = time.perf_counter() - started
+    storage.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure journal write throughput and restart time")
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--writers", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    arguments = parser.parse_args()
+
+    records = generate_testcases(arguments.records, arguments.projects)
+    with tempfile.TemporaryDirectory() as root:
+        for commit_delay in (0, 0.002, 0.005):
+            directory = os.path.join(root, f"concurrent-{commit_delay}")
+            throughput = asyncio.run(write_concurrently(directory, arguments.requests, arguments.writers, commit_delay))
+            print(
+                f"{arguments.writers} concurrent HTTP writers, commit delay {commit_delay * 1000:.0f} ms: "
+                f"{throughput:,.0f} requests/s"
+            )
+
+        directory = os.path.join(root, "replay")
+        throughput = write_in_batches(directory, records, arguments.batch_size)
+        print(f"batched writes of {arguments.batch_size}: {throughput:,.0f} records/s")
+        print(f"restart from log of {len(records):,} records: {measure_restart(directory):.2f} s")
+        storage = create_journaled_storage(directory)
+        storage.snapshot()
+        storage.close()
+        print(f"restart from snapshot of {len(records):,} records: {measure_restart(directory):.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+from benchmarks.asgi import call
+from config.endpoints import EndpointConfig
+from models.projects import ProjectResponseModel
+from models.runs import RESULT_STATUSES, TestResultResponseModel, TestRunResponseModel
+from models.testcase import TestCaseResponseModel
+from storage import Storage, create_memory_storage, create_sqlite_storage
+from web.metrics import instrument_storage
+import main as service
+
+URL = EndpointConfig()
+Request = Tuple[str, str, bytes, List[Tuple[str, str]]]
+REGRESSION_THRESHOLD = 0.1
+
+
+@dataclass
+class Dataset:
+    project_ids: List[str]
+    scratch_project_ids: List[str]
+    testcase_ids: Dict[str, List[str]]
+    run_ids: Dict[str, str]
+    randomizer: random.Random = field(default_factory=lambda: random.Random(0))
+
+    def project(self) -> str:
+        return self.randomizer.choice(self.project_ids)
+
+    def testcase(self) -> Tuple[str, str]:
+        project_id = self.project()
+        return project_id, self.randomizer.choice(self.testcase_ids[project_id])
+
+    def run(self) -> Tuple[str, str]:
+        project_id = self.project()
+        return project_id, self.run_ids[project_id]
+
+
+def project_body(index: int) -> bytes:
+    return json.dumps({
+        "title": f"Load project {index}",
+        "owner": "Load",
+        "tags": ["load", f"group-{index % 10}"]
+    }).encode()
+
+
+def testcase_payload(index: int) -> dict:
+    return {
+        "title": f"Load testcase {index}",
+        "description": f"Steps for load testcase {index}",
+        "author": f"author-{index % 20}",
+        "tags": ["load", f"suite-{index % 20}"],
+        "expected_results": "should pass"
+    }
+
+
+def result_payload(testcase_id: str, index: int) -> dict:
+    return {
+        "testcase_id": testcase_id,
+        "status": RESULT_STATUSES[index % len(RESULT_STATUSES)],
+        "duration_ms": index % 1000,
+        "output": f"Load output {index}"
+    }
+
+
+def seed(storage: Storage, records: int, per_project: int, scratch_projects: int) -> Dataset:
+    created_at = datetime.utcnow()
+
+    def add_project(index: int) -> str:
+        project = ProjectResponseModel.construct(
+            id=uuid4(), title=f"Seeded project {index}", description="Seeded", owner=f"owner-{index % 10}",
+            tags=["seeded", f"group-{index % 10}"], created_at=created_at, updated_at=created_at, active=True
+        )
+        storage.projects.add(project)
+        return str(project.id)
+
+    project_ids = [add_project(index) for index in range(max(1, records // per_project))]
+    testcase_ids: Dict[str, List[str]] = {project_id: [] for project_id in project_ids}
+    for start in range(0, records, per_project):
+        project_id = project_ids[start // per_project % len(project_ids)]
+        batch = [
+            TestCaseResponseModel.construct(
+                project_id=project_id, id=uuid4(), created_at=created_at, updated_at=created_at,
+                updated_by=f"author-{index % 20}", archived=False, **testcase_payload(index)
+            )
+            for index in range(start, min(start + per_project, records))
+        ]
+        storage.testcases.add_many(batch)
+        testcase_ids[project_id].extend(str(testcase.id) for testcase in batch)
+    run_ids = {}
+    for project_id in project_ids:
+        run = TestRunResponseModel.construct(
+            project_id=project_id, id=uuid4(), name="Seeded run", environment="load", created_at=created_at
+        )
+        storage.runs.add(run)
+        storage.runs.append_results(str(run.id), [
+            TestResultResponseModel.construct(
+                run_id=run.id, finished_at=created_at, **result_payload(testcase_id, index)
+            )
+            for index, testcase_id in enumerate(testcase_ids[project_id])
+        ])
+        run_ids[project_id] = str(run.id)
+    scratch_project_ids = [add_project(records + index) for index in range(scratch_projects)]
+    return Dataset(project_ids, scratch_project_ids, testcase_ids, run_ids)
+
+
+def get(url: str, headers: Optional[List[Tuple[str, str]]] = None) -> Request:
+    return "GET", url, b"", headers or []
+
+
+def project_scenarios(dataset: Dataset) -> Dict[str, Callable[[int], Request]]:
+    return {
+        "GET_ALL_PROJECT": lambda index: get(f"{URL.PROJECT.GET_ALL_PROJECT}?limit=50&tags=group-{index % 10}"),
+        "GET_PROJECT_TAGS": lambda index: get(URL.PROJECT.GET_PROJECT_TAGS),
+        "GET_PROJECT_DETAILS": lambda index: get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=dataset.project())),
+        "GET_PROJECT_STATS": lambda index: get(URL.PROJECT.GET_PROJECT_STATS.format(project_id=dataset.project())),
+        "EXPORT_PROJECT": lambda index: get(
+            URL.PROJECT.EXPORT_PROJECT.format(project_id=dataset.project()), [("Accept-Encoding", "identity")]
+        ),
+        "CREATE_PROJECT": lambda index: ("POST", URL.PROJECT.CREATE_PROJECT, project_body(index), []),
+        "UPDATE_PROJECT": lambda index: (
+            "PUT", URL.PROJECT.UPDATE_PROJECT.format(project_id=dataset.project()), project_body(index), []
+        ),
+        "PATCH_PROJECT": lambda index: (
+            "PATCH",
+            URL.PROJECT.PATCH_PROJECT.format(project_id=dataset.project()),
+            json.dumps({"title": f"Patched project {index}"}).encode(),
+            []
+        ),
+        "DELETE_PROJECT": lambda index: (
+            "DELETE",
+            URL.PROJECT.DELETE_PROJECT.format(
+                project_id=dataset.scratch_project_ids[index % len(dataset.scratch_project_ids)]
+            ),
+            b"",
+            []
+        ),
+        "GET_ARCHIVE_JOB": lambda index: get(
+            URL.PROJECT.GET_ARCHIVE_JOB.format(
+                project_id=dataset.scratch_project_ids[index % len(dataset.scratch_project_ids)]
+            )
+        ),
+    }
+
+
+def testcase_scenarios(dataset: Dataset) -> Dict[str, Callable[[int], Request]]:
+    def testcase_url(template: str) -> str:
+        project_id, testcase_id = dataset.testcase()
+        return template.format(project_id=project_id, testcase_id=testcase_id)
+
+    def project_url(template: str) -> str:
+        return template.format(project_id=dataset.project())
+
+    def selection_request(template: str, payload: Callable[[List[str]], dict]) -> Request:
+        project_id = dataset.project()
+        candidates = dataset.testcase_ids[project_id]
+        testcase_ids = dataset.randomizer.sample(candidates, min(100, len(candidates)))
+        return "POST", template.format(project_id=project_id), json.dumps(payload(testcase_ids)).encode(), []
+
+    return {
+        "GET_ALL_TESTCASE": lambda index: get(f"{project_url(URL.TESTCASE.GET_ALL_TESTCASE)}?limit=50"),
+        "SEARCH_TESTCASE": lambda index: get(f"{project_url(URL.TESTCASE.SEARCH_TESTCASE)}?q=load+{index % 100}"),
+        "GET_TESTCASE_TAGS": lambda index: get(project_url(URL.TESTCASE.GET_TESTCASE_TAGS)),
+        "GET_TESTCASE_DETAIL": lambda index: get(testcase_url(URL.TESTCASE.GET_TESTCASE_DETAIL)),
+        "BATCH_GET_TESTCASE": lambda index: selection_request(
+            URL.TESTCASE.BATCH_GET_TESTCASE, lambda ids: {"ids": ids}
+        ),
+        "CREATE_TESTCASE": lambda index: (
+            "POST", project_url(URL.TESTCASE.CREATE_TESTCASE), json.dumps(testcase_payload(index)).encode(), []
+        ),
+        "BULK_CREATE_TESTCASE": lambda index: (
+            "POST",
+            project_url(URL.TESTCASE.BULK_CREATE_TESTCASE),
+            json.dumps([testcase_payload(index * 100 + item) for item in range(100)]).encode(),
+            []
+        ),
+        "UPDATE_TESTCASE": lambda index: (
+            "PUT", testcase_url(URL.TESTCASE.UPDATE_TESTCASE), json.dumps(testcase_payload(index)).encode(), []
+        ),
+        "PATCH_TESTCASE": lambda index: (
+            "PATCH", testcase_url(URL.TESTCASE.PATCH_TESTCASE), json.dumps({"title": f"Patched {index}"}).encode(), []
+        ),
+        "BULK_UPDATE_TESTCASE": lambda index: selection_request(
+            URL.TESTCASE.BULK_UPDATE_TESTCASE,
+            lambda ids: {
+                "select": {"ids": ids}, "changes": {"add_tags": [f"release-{index % 10}"]}, "updated_by": "Load"
+            }
+        ),
+        "DELETE_TESTCASE": lambda index: ("DELETE", testcase_url(URL.TESTCASE.DELETE_TESTCASE), b"", []),
+        "BULK_ARCHIVE_TESTCASE": lambda index: selection_request(
+            URL.TESTCASE.BULK_ARCHIVE_TESTCASE, lambda ids: {"select": {"ids": ids}}
+        ),
+    }
+
+
+def run_scenarios(dataset: Dataset) -> Dict[str, Callable[[int], Request]]:
+    def run_url(template: str) -> str:
+        project_id, run_id = dataset.run()
+        return template.format(project_id=project_id, run_id=run_id)
+
+    def results_request(index: int) -> Request:
+        project_id, run_id = dataset.run()
+        testcase_ids = dataset.testcase_ids[project_id]
+        results = [
+            result_payload(testcase_ids[(index * 100 + item) % len(testcase_ids)], index * 100 + item)
+            for item in range(100)
+        ]
+        url = URL.RUN.INGEST_RESULTS.format(project_id=project_id, run_id=run_id)
+        return "POST", url, "\n".join(map(json.dumps, results)).encode(), [("Content-Type", "application/x-ndjson")]
+
+    def testcase_url(template: str) -> str:
+        project_id, testcase_id = dataset.testcase()
+        return template.format(project_id=project_id, testcase_id=testcase_id)
+
+    return {
+        "GET_ALL_TESTRUN": lambda index: get(URL.RUN.GET_ALL_TESTRUN.format(project_id=dataset.project())),
+        "CREATE_TESTRUN": lambda index: (
+            "POST",
+            URL.RUN.CREATE_TESTRUN.format(project_id=dataset.project()),
+            json.dumps({"name": f"Load run {index}", "environment": "load"}).encode(),
+            []
+        ),
+        "GET_LATEST_RESULTS": lambda index: get(
+            f"{URL.RUN.GET_LATEST_RESULTS.format(project_id=dataset.project())}?status=failed&limit=50"
+        ),
+        "GET_TESTRUN_DETAIL": lambda index: get(run_url(URL.RUN.GET_TESTRUN_DETAIL)),
+        "INGEST_RESULTS": results_request,
+        "GET_TESTRUN_RESULTS": lambda index: get(f"{run_url(URL.RUN.GET_TESTRUN_RESULTS)}?limit=50"),
+        "GET_TESTCASE_LATEST_RESULT": lambda index: get(testcase_url(URL.RUN.GET_TESTCASE_LATEST_RESULT)),
+        "GET_PROJECT_HISTORY": lambda index: get(
+            f"{URL.RUN.GET_PROJECT_HISTORY.format(project_id=dataset.project())}?granularity=hour&limit=168"
+        ),
+        "GET_TESTCASE_HISTORY": lambda index: get(f"{testcase_url(URL.RUN.GET_TESTCASE_HISTORY)}?granularity=day"),
+    }
+
+
+def changes_scenarios(dataset: Dataset) -> Dict[str, Callable[[int], Request]]:
+    def recent_cursor() -> int:
+        return max(0, service.db.feed.last_seq() - 100)
+
+    return {
+        "GET_CHANGES": lambda index: get(f"{URL.CHANGES.GET_CHANGES}?cursor={recent_cursor()}"),
+        "STREAM_CHANGES": lambda index: get(
+            URL.CHANGES.STREAM_CHANGES, [("Last-Event-ID", f"{service.db.feed.epoch()}:{recent_cursor()}")]
+        ),
+    }
+
+
+def metrics_scenarios(dataset: Dataset) -> Dict[str, Callable[[int], Request]]:
+    return {"GET_METRICS": lambda index: get(URL.METRICS.GET_METRICS)}
+
+
+def build_scenarios(dataset: Dataset) -> Dict[str, Callable[[int], Request]]:
+    scenarios = {}
+    for group, factory in (("PROJECT", project_scenarios), ("TESTCASE", testcase_scenarios), ("RUN", run_scenarios),
+                           ("CHANGES", changes_scenarios), ("METRICS", metrics_scenarios)):
+        routes = factory(dataset)
+        endpoints = {name for name in type(getattr(URL, group)).__dict__ if name.isupper()}
+        missing = endpoints - set(routes)
+        if missing:
+            raise ValueError(f"No load scenario for {group} endpoints: {', '.join(sorted(missing))}")
+        scenarios.update({f"{group}.{name}": routes[name] for name in routes})
+    return scenarios
+
+
+def percentile(latencies: List[float], fraction: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+async def run_scenario(scenario: Callable[[int], Request], requests: int, concurrency: int) -> dict:
+    queue = iter(range(requests))
+    latencies: List[float] = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for index in queue:
+            method, url, body, headers = scenario(index)
+            started = time.perf_counter()
+            status_code, _ = await call(service.app, method, url, body, headers)
+            latencies.append(time.perf_counter() - started)
+            errors += status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput": requests / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_benchmark_storage(backend: str, directory: str, records: int) -> Storage:
+    if backend == "sqlite":
+        return create_sqlite_storage(os.path.join(directory, f"load-{records}.db"), 4)
+    return create_memory_storage()
+
+
+async def run_dataset(arguments: argparse.Namespace, directory: str, records: int) -> dict:
+    service.db = create_benchmark_storage(arguments.backend, directory, records)
+    if service.SETTINGS_CONF.METRICS.ENABLED:
+        instrument_storage(service.db)
+    for cache in service.response_caches.values():
+        cache.clear()
+    started = time.perf_counter()
+    dataset = seed(service.db, records, arguments.testcases_per_project, arguments.requests)
+    seed_seconds = time.perf_counter() - started
+    routes = {}
+    for name, scenario in build_scenarios(dataset).items():
+        routes[name] = await run_scenario(scenario, arguments.requests, arguments.concurrency)
+        print(
+            f"{records:>9,} {name:<32}{routes[name]['throughput']:>10,.0f} req/s"
+            f"{routes[name]['p50_ms']:>9.2f} ms p50{routes[name]['p99_ms']:>9.2f} ms p99"
+            f"{routes[name]['errors']:>6} errors"
+        )
+    result = {"records": records, "seed_seconds": seed_seconds, "rss_bytes": rss_bytes(), "routes": routes}
+    service.db.close()
+    return result
+
+
+def compare(results: dict, baseline: dict) -> List[str]:
+    if results["backend"] != baseline["backend"]:
+        raise SystemExit(f"Baseline was run against {baseline['backend']}, not {results['backend']}")
+    baseline_routes = {
+        (dataset["records"], name): route
+        for dataset in baseline["datasets"]
+        for name, route in dataset["routes"].items()
+    }
+    regressions = []
+    for dataset in results["datasets"]:
+        for name, route in dataset["routes"].items():
+            previous = baseline_routes.get((dataset["records"], name))
+            if previous is None:
+                continue
+            if route["p99_ms"] > previous["p99_ms"] * (1 + REGRESSION_THRESHOLD):
+                regressions.append(
+                    f"{dataset['records']:,} {name}: p99 {previous['p99_ms']:.2f} -> {route['p99_ms']:.2f} ms"
+                )
+            if route["throughput"] < previous["throughput"] * (1 - REGRESSION_THRESHOLD):
+                regressions.append(
+                    f"{dataset['records']:,} {name}: throughput "
+                    f"{previous['throughput']:,.0f} -> {route['throughput']:,.0f} req/s"
+                )
+    return regressions
+
+
+async def run(arguments: argparse.Namespace) -> dict:
+    service.SETTINGS_CONF.FEED.STREAM_SECONDS = 0
+    with tempfile.TemporaryDirectory() as directory:
+        datasets = [await run_dataset(arguments, directory, records) for records in arguments.records]
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "backend": arguments.backend,
+        "concurrency": arguments.concurrency,
+        "requests_per_route": arguments.requests,
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        "datasets": datasets,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test every endpoint of the in-process ASGI app")
+    parser.add_argument("--records", type=int, nargs="+", default=[1000])
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--testcases-per-project", type=int, default=1000)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    arguments = parser.parse_args()
+
+    results = asyncio.run(run(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(results, output, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline:
+            regressions = compare(results, json.load(baseline))
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+from uuid import uuid4
+from models.testcase import TestCaseResponseModel
+from storage.memory import MemoryTestCaseRepository
+
+
+def generate_payloads(count: int, projects: int) -> List[str]:
+    project_ids = [str(uuid4()) for _ in range(projects)]
+    return [
+        json.dumps({
+            "project_id": project_ids[index % projects],
+            "id": str(uuid4()),
+            "title": f"Testcase {index}",
+            "description": f"Steps for testcase {index}",
+            "author": f"author-{index % 50}",
+            "tags": ["regression", f"suite-{index % 20}"],
+            "expected_results": f"Result {index} should pass",
+            "created_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat(),
+            "updated_by": f"author-{index % 50}",
+            "archived": False
+        })
+        for index in range(count)
+    ]
+
+
+def retained_bytes(store: Callable[[List[TestCaseResponseModel]], object], payloads: List[str]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    testcases = [TestCaseResponseModel(**json.loads(payload)) for payload in payloads]
+    container = store(testcases)
+    del testcases
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del container
+    return retained
+
+
+def store_models(testcases: List[TestCaseResponseModel]) -> dict:
+    return {str(testcase.id): testcase for testcase in testcases}
+
+
+def store_repository(testcases: List[TestCaseResponseModel]) -> MemoryTestCaseRepository:
+    repository = MemoryTestCaseRepository()
+    repository.add_many(testcases)
+    return repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure retained memory per stored testcase")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=100)
+    arguments = parser.parse_args()
+
+    payloads = generate_payloads(arguments.records, arguments.projects)
+    print(f"{'store':<32}{'bytes/record':>14}")
+    for name, store in (("dict of pydantic models", store_models), ("memory repository", store_repository)):
+        print(f"{name:<32}{retained_bytes(store, payloads) / arguments.records:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+from config.endpoints import EndpointConfig
+from models.projects import ProjectResponseModel
+from storage import create_sqlite_storage
+
+URL = EndpointConfig()
+
+
+def seed(path: str, records: int) -> list:
+    storage = create_sqlite_storage(path, pool_size=1)
+    project_ids = []
+    for index in range(records):
+        project = ProjectResponseModel(
+            id=uuid4(),
+            title=f"Project {index}",
+            description=None,
+            owner="Benchmark",
+            tags=["bench"],
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            active=True
+        )
+        storage.projects.add(project)
+        project_ids.append(str(project.id))
+    storage.close()
+    return project_ids
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(path: str, port: int, workers: int) -> subprocess.Popen:
+    environment = dict(os.environ, TESTSHACHOU_STORAGE="sqlite", TESTSHACHOU_SQLITE_PATH=path)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        env=environment
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", URL.PROJECT.GET_ALL_PROJECT + "?limit=1")
+            connection.getresponse().read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("server did not start")
+
+
+# A fresh connection per request: uvicorn's multi-worker sockets do not disable Nagle, so keep-alive
+# requests stall on delayed ACKs and would hide the scaling being measured.
+def client(port: int, project_ids: list, duration: float, seed_value: int, results):
+    randomizer = random.Random(seed_value)
+    completed = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=randomizer.choice(project_ids)))
+        connection.getresponse().read()
+        connection.close()
+        completed += 1
+    results.put(completed)
+
+
+def measure(port: int, project_ids: list, clients: int, duration: float) -> float:
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client, args=(port, project_ids, duration, index, results))
+        for index in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    completed = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return completed / duration
+
+
+def check_invalidation(port: int, project_id: str, connections: int) -> bool:
+    for connection_index in range(connections):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id))
+        connection.getresponse().read()
+    title = f"Renamed {uuid4()}"
+    body = json.dumps({"title": title, "owner": "Benchmark", "tags": ["bench"]})
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("PUT", URL.PROJECT.UPDATE_PROJECT.format(project_id=project_id), body,
+                       {"content-type": "application/json"})
+    connection.getresponse().read()
+    titles = set()
+    for connection_index in range(connections):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id))
+        titles.add(json.loads(connection.getresponse().read())["title"])
+    return titles == {title}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure read throughput of the sqlite backend across uvicorn workers")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients-per-worker", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    arguments = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "multiworker.db")
+        project_ids = seed(path, arguments.records)
+        for workers in arguments.workers:
+            port = free_port()
+            server = start_server(path, port, workers)
+            try:
+                clients = workers * arguments.clients_per_worker
+                throughput = measure(port, project_ids, clients, arguments.duration)
+                consistent = check_invalidation(port, project_ids[0], clients)
+            finally:
+                server.terminate()
+                server.wait()
+            results.append({"workers": workers, "clients": clients, "requests_per_second": throughput,
+                            "consistent_after_update": consistent})
+
+    baseline = results[0]["requests_per_second"] / results[0]["workers"]
+    print(f"cpu_count={os.cpu_count()}")
+    print(f"{'workers':>8}{'clients':>9}{'req/s':>12}{'efficiency':>12}{'consistent':>12}")
+    for result in results:
+        efficiency = result["requests_per_second"] / (baseline * result["workers"])
+        print(f"{result['workers']:>8}{result['clients']:>9}{result['requests_per_second']:>12,.0f}"
+              f"{efficiency:>12.0%}{str(result['consistent_after_update']):>12}")
+
+
+if __name__ == "__main__":
+    main()
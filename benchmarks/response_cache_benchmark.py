@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from benchmarks.asgi import call
+from config.endpoints import EndpointConfig
+import main as service
+
+URL = EndpointConfig()
+
+
+async def seed(records: int) -> list:
+    project_ids = []
+    for index in range(records):
+        body = json.dumps({"title": f"Project {index}", "owner": "Benchmark", "tags": ["bench", f"group-{index % 10}"]})
+        _, response = await call(service.app, "POST", URL.PROJECT.CREATE_PROJECT, body.encode())
+        project_ids.append(json.loads(response)["id"])
+    return project_ids
+
+
+async def measure(project_ids: list, requests: int) -> float:
+    randomizer = random.Random(0)
+    urls = [URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=randomizer.choice(project_ids)) for _ in range(requests)]
+    started = time.perf_counter()
+    for url in urls:
+        await call(service.app, "GET", url)
+    return requests / (time.perf_counter() - started)
+
+
+async def run(records: int, requests: int):
+    project_ids = await seed(records)
+    service.project_cache.resize(0)
+    uncached = await measure(project_ids, requests)
+    service.project_cache.resize(records)
+    await measure(project_ids, requests)
+    cached = await measure(project_ids, requests)
+    print(f"{'cache off':<12}{uncached:>12,.0f} req/s")
+    print(f"{'cache on':<12}{cached:>12,.0f} req/s{cached / uncached:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare GET project detail throughput with and without the cache")
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20000)
+    arguments = parser.parse_args()
+    asyncio.run(run(arguments.records, arguments.requests))
+
+
+if __name__ == "__main__":
+    main()
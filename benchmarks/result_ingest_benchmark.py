@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from typing import List, Tuple
+from benchmarks.asgi import call
+from config.endpoints import EndpointConfig
+from models.runs import RESULT_STATUSES
+from storage import Storage, create_journaled_storage, create_memory_storage, create_sqlite_storage
+import main as service
+
+URL = EndpointConfig()
+NDJSON_HEADERS = [("Content-Type", "application/x-ndjson")]
+
+
+def create_benchmark_storage(backend: str, directory: str) -> Storage:
+    if backend == "sqlite":
+        return create_sqlite_storage(os.path.join(directory, "results.db"), 4)
+    if backend == "journal":
+        return create_journaled_storage(os.path.join(directory, "journal"), snapshot_every=10 ** 9)
+    return create_memory_storage()
+
+
+async def post(url: str, payload) -> dict:
+    status_code, body = await call(service.app, "POST", url, json.dumps(payload).encode())
+    if status_code >= 400:
+        raise RuntimeError(f"POST {url} failed with {status_code}: {body[:200]!r}")
+    return json.loads(body)
+
+
+async def seed(testcases: int) -> Tuple[str, List[str]]:
+    project = await post(URL.PROJECT.CREATE_PROJECT, {"title": "Results", "owner": "Bench", "tags": ["bench"]})
+    testcase_ids: List[str] = []
+    for start in range(0, testcases, 1000):
+        payloads = [
+            {
+                "title": f"Testcase {index}",
+                "description": "Testcase description",
+                "author": "Bench",
+                "tags": ["bench"],
+                "expected_results": "should pass"
+            }
+            for index in range(start, min(start + 1000, testcases))
+        ]
+        created = await post(URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project["id"]), payloads)
+        testcase_ids.extend(result["id"] for result in created["results"])
+    return project["id"], testcase_ids
+
+
+def result_stream(testcase_ids: List[str], start: int, size: int, randomizer: random.Random) -> bytes:
+    lines = []
+    for index in range(start, start + size):
+        lines.append(json.dumps({
+            "testcase_id": testcase_ids[index % len(testcase_ids)],
+            "status": randomizer.choice(RESULT_STATUSES),
+            "duration_ms": randomizer.randrange(5000),
+            "output": f"Result {index}"
+        }))
+    return "\n".join(lines).encode()
+
+
+def summarize(latencies: List[float]) -> Tuple[float, float]:
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000, latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+
+
+async def ingest(project_id: str, testcase_ids: List[str], arguments: argparse.Namespace) -> dict:
+    randomizer = random.Random(0)
+    bodies = []
+    for run_index in range(arguments.runs):
+        run = await post(URL.RUN.CREATE_TESTRUN.format(project_id=project_id), {"name": f"Run {run_index}"})
+        url = URL.RUN.INGEST_RESULTS.format(project_id=project_id, run_id=run["id"])
+        for start in range(0, arguments.results_per_run, arguments.request_size):
+            size = min(arguments.request_size, arguments.results_per_run - start)
+            bodies.append((url, result_stream(testcase_ids, start, size, randomizer), size))
+    latencies: List[float] = []
+    accepted = 0
+    started = time.perf_counter()
+    for url, body, _ in bodies:
+        request_started = time.perf_counter()
+        status_code, response = await call(service.app, "POST", url, body, NDJSON_HEADERS)
+        latencies.append(time.perf_counter() - request_started)
+        if status_code >= 400:
+            raise RuntimeError(f"Ingest failed with {status_code}: {response[:200]!r}")
+        accepted += json.loads(response)["accepted"]
+    elapsed = time.perf_counter() - started
+    p50, p99 = summarize(latencies)
+    return {"results": accepted, "results_per_second": accepted / elapsed, "p50_ms": p50, "p99_ms": p99}
+
+
+async def measure_lookups(project_id: str, testcase_ids: List[str], lookups: int) -> dict:
+    randomizer = random.Random(1)
+    timings = {}
+    urls = {
+        "latest-result": lambda: URL.RUN.GET_TESTCASE_LATEST_RESULT.format(
+            project_id=project_id, testcase_id=randomizer.choice(testcase_ids)
+        ),
+        "latest-failed": lambda: f"{URL.RUN.GET_LATEST_RESULTS.format(project_id=project_id)}?status=failed&limit=50",
+    }
+    for name, url in urls.items():
+        latencies = []
+        for _ in range(lookups):
+            started = time.perf_counter()
+            status_code, _ = await call(service.app, "GET", url())
+            latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                raise RuntimeError(f"{name} lookup failed with {status_code}")
+        timings[name] = summarize(latencies)
+    return timings
+
+
+async def run(arguments: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as directory:
+        service.db = create_benchmark_storage(arguments.backend, directory)
+        project_id, testcase_ids = await seed(arguments.testcases)
+        result = await ingest(project_id, testcase_ids, arguments)
+        print(
+            f"{arguments.backend}: ingested {result['results']:,} results in {arguments.request_size}-result "
+            f"requests at {result['results_per_second']:,.0f} results/s "
+            f"(p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms per request)"
+        )
+        for name, (p50, p99) in (await measure_lookups(project_id, testcase_ids, arguments.lookups)).items():
+            print(f"{name:<16}p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+        service.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure streaming test result ingestion and latest-status lookups")
+    parser.add_argument("--testcases", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--results-per-run", type=int, default=10000)
+    parser.add_argument("--request-size", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--backend", choices=["memory", "journal", "sqlite"], default="memory")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from benchmarks.storage_benchmark import generate_testcases
+from storage import Storage, create_memory_storage, create_sqlite_storage
+
+WORDS = [
+    "login", "logout", "password", "checkout", "cart", "payment", "invoice", "profile", "search", "filter",
+    "upload", "download", "export", "import", "email", "notification", "session", "token", "refund", "report",
+]
+
+
+def populate(storage: Storage, records: int, projects: int):
+    testcases = generate_testcases(records, projects)
+    randomizer = random.Random(0)
+    for testcase in testcases:
+        testcase.title = " ".join(randomizer.sample(WORDS, 3))
+        testcase.description = " ".join(randomizer.sample(WORDS, 6))
+        testcase.expected_results = " ".join(randomizer.sample(WORDS, 2))
+    storage.testcases.add_many(testcases)
+    return sorted({str(testcase.project_id) for testcase in testcases})
+
+
+def measure(storage: Storage, project_ids: list, queries: int) -> list:
+    randomizer = random.Random(1)
+    latencies = []
+    for _ in range(queries):
+        query = f"{randomizer.choice(WORDS)} {randomizer.choice(WORDS)[:3]}"
+        started = time.perf_counter()
+        storage.testcases.search(randomizer.choice(project_ids), query, 20)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-project testcase search latency")
+    parser.add_argument("--records", type=int, default=500000)
+    parser.add_argument("--projects", type=int, default=3000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if arguments.backend == "memory":
+            storage = create_memory_storage()
+        else:
+            storage = create_sqlite_storage(os.path.join(directory, "search.db"), 1)
+        project_ids = populate(storage, arguments.records, arguments.projects)
+        latencies = sorted(measure(storage, project_ids, arguments.queries))
+        storage.close()
+    print(f"backend={arguments.backend} records={arguments.records} projects={arguments.projects}")
+    print(f"p50={statistics.median(latencies):.3f}ms p99={latencies[int(len(latencies) * 0.99) - 1]:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
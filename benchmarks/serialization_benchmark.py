@@ -0,0 +1,88 @@
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict
+from uuid import uuid4
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from models.projects import ProjectListResponseModel, ProjectResponseModel
+from models.testcase import TestCaseListResponseModel, TestCaseResponseModel
+from web.responses import ENCODERS
+
+
+def build_projects(count: int) -> ProjectListResponseModel:
+    return ProjectListResponseModel(items=[
+        ProjectResponseModel.construct(
+            id=uuid4(),
+            title=f"Project {index}",
+            description=f"Description for project {index}",
+            owner=f"owner-{index % 50}",
+            tags=["regression", f"team-{index % 20}"],
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            active=True
+        )
+        for index in range(count)
+    ], next_cursor=count)
+
+
+def build_testcases(count: int) -> TestCaseListResponseModel:
+    project_id = uuid4()
+    return TestCaseListResponseModel(items=[
+        TestCaseResponseModel.construct(
+            project_id=project_id,
+            id=uuid4(),
+            title=f"Testcase {index}",
+            description=f"Steps for testcase {index}",
+            author=f"author-{index % 50}",
+            tags=["regression", f"suite-{index % 20}"],
+            expected_results=f"Result {index} should pass",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            updated_by=f"author-{index % 50}",
+            archived=False
+        )
+        for index in range(count)
+    ], next_cursor=count)
+
+
+def dumps_standard(content: BaseModel) -> bytes:
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def measure(encode: Callable[[BaseModel], bytes], content: BaseModel, seconds: float) -> float:
+    runs = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        encode(content)
+        runs += 1
+    return (time.perf_counter() - started) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure JSON serialization of large list responses")
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    arguments = parser.parse_args()
+
+    encoders: Dict[str, Callable[[BaseModel], bytes]] = {"standard": dumps_standard}
+    encoders.update(ENCODERS)
+    print(f"{'response':<12}{'items':>8}" + "".join(f"{name:>12}" for name in encoders) + f"{'speedup':>10}")
+    for items in arguments.items:
+        for name, content in (("projects", build_projects(items)), ("testcases", build_testcases(items))):
+            reference = json.loads(dumps_standard(content))
+            for encode in encoders.values():
+                assert json.loads(encode(content)) == reference
+            timings = {encoder: measure(encode, content, arguments.seconds) for encoder, encode in encoders.items()}
+            best = min(timings[encoder] for encoder in ENCODERS)
+            print(
+                f"{name:<12}{items:>8}"
+                + "".join(f"{timings[encoder] * 1000:>9.2f} ms" for encoder in encoders)
+                + f"{timings['standard'] / best:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+from uuid import uuid4
+from models.testcase import TestCaseResponseModel
+from storage import Storage, create_memory_storage, create_sqlite_storage
+
+
+def generate_testcases(count: int, projects: int) -> List[TestCaseResponseModel]:
+    project_ids = [uuid4() for _ in range(projects)]
+    return [
+        TestCaseResponseModel(
+            project_id=project_ids[index % projects],
+            id=uuid4(),
+            title=f"Testcase {index}",
+            description="Testcase description",
+            author="Testcase owner",
+            tags=["regression", f"suite-{index % 20}"],
+            expected_results="should pass",
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+            updated_by="Testcase owner",
+            archived=False
+        )
+        for index in range(count)
+    ]
+
+
+def measure(operation: Callable, records: List[TestCaseResponseModel]) -> float:
+    started = time.perf_counter()
+    for record in records:
+        operation(record)
+    return len(records) / (time.perf_counter() - started)
+
+
+def run(storage: Storage, records: List[TestCaseResponseModel]) -> Dict[str, float]:
+    def update(testcase: TestCaseResponseModel):
+        testcase.title = testcase.title + " updated"
+        storage.testcases.save(testcase)
+
+    return {
+        "create": measure(storage.testcases.add, records),
+        "get": measure(lambda testcase: storage.testcases.get(str(testcase.id)), records),
+        "update": measure(update, records),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare create/get/update throughput of the storage backends")
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=4)
+    arguments = parser.parse_args()
+
+    records = generate_testcases(arguments.records, arguments.projects)
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "memory": create_memory_storage(),
+            "sqlite": create_sqlite_storage(os.path.join(directory, "benchmark.db"), arguments.pool_size),
+        }
+        print(f"{'backend':<10}{'create/s':>14}{'get/s':>14}{'update/s':>14}")
+        for name, storage in backends.items():
+            results = run(storage, records)
+            print(f"{name:<10}{results['create']:>14,.0f}{results['get']:>14,.0f}{results['update']:>14,.0f}")
+            storage.close()
+
+
+if __name__ == "__main__":
+    main()
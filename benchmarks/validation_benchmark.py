@@ -0,0 +1,90 @@
+import argparse
+import timeit
+from typing import List, Optional
+from pydantic import BaseModel, validator
+from models.projects import ProjectRequestModel
+from models.testcase import TestCaseRequestModel
+
+
+class LegacyTestCaseRequestModel(BaseModel):
+    title: str
+    description: str
+    author: str
+    tags: Optional[List[str]] = None
+    expected_results: str
+
+    @validator('title', 'description', 'author', 'expected_results')
+    def fields_should_not_be_space_only(cls, value: str):
+        if value.isspace():
+            raise ValueError('spaces')
+        return value
+
+    @validator('title', 'description', 'author', 'expected_results')
+    def fields_should_not_be_empty_string(cls, value: str):
+        if value == "":
+            raise ValueError('empty')
+        return value
+
+    @validator('tags')
+    def tag_values_should_not_be_empty_string(cls, tag_list: list):
+        for tags in tag_list:
+            if tags == "":
+                raise ValueError('empty')
+        return tag_list
+
+    @validator('tags')
+    def tag_values_should_not_be_space_only(cls, tag_list: list):
+        for tags in tag_list:
+            if tags.isspace():
+                raise ValueError('spaces')
+        return tag_list
+
+
+PAYLOAD_SIZES = {
+    "small": (2, 40),
+    "medium": (10, 400),
+    "large": (50, 4000),
+}
+
+
+def testcase_payload(tags: int, text_length: int) -> dict:
+    return {
+        "title": "Checkout with saved card",
+        "description": "d" * text_length,
+        "author": "QA Lead",
+        "tags": [f"tag-{index}" for index in range(tags)],
+        "expected_results": "e" * text_length,
+    }
+
+
+def project_payload(tags: int, text_length: int) -> dict:
+    return {
+        "title": "Storefront",
+        "description": "d" * text_length,
+        "owner": "QA Lead",
+        "tags": [f"tag-{index}" for index in range(tags)],
+    }
+
+
+def measure(model, payload: dict, repeat: int) -> float:
+    return min(timeit.repeat(lambda: model(**payload), number=repeat, repeat=5)) / repeat * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure request model construction cost per payload size")
+    parser.add_argument("--repeat", type=int, default=20000)
+    arguments = parser.parse_args()
+
+    print(f"{'payload':<10}{'model':<24}{'us/object':>12}")
+    for size, (tags, text_length) in PAYLOAD_SIZES.items():
+        testcase = testcase_payload(tags, text_length)
+        project = project_payload(tags, text_length)
+        for name, model, payload in (
+                ("TestCaseRequestModel", TestCaseRequestModel, testcase),
+                ("legacy TestCase", LegacyTestCaseRequestModel, testcase),
+                ("ProjectRequestModel", ProjectRequestModel, project)):
+            print(f"{size:<10}{name:<24}{measure(model, payload, arguments.repeat):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,57 @@ from dataclasses import dataclass
 
 class Project(BaseConfig):
     GET_ALL_PROJECT: str = "/projects"
+    GET_PROJECT_TAGS: str = "/projects/tags"
     CREATE_PROJECT: str = "/projects/create"
     GET_PROJECT_DETAILS: str = "/projects/{project_id}"
     DELETE_PROJECT: str = "/projects/{project_id}"
     UPDATE_PROJECT: str = "/projects/{project_id}/update"
+    PATCH_PROJECT: str = "/projects/{project_id}"
+    EXPORT_PROJECT: str = "/projects/{project_id}/export"
+    GET_ARCHIVE_JOB: str = "/projects/{project_id}/archive-job"
+    GET_PROJECT_STATS: str = "/projects/{project_id}/stats"
 
 
 class TestCase(BaseConfig):
     GET_ALL_TESTCASE: str = "/projects/{project_id}/testcase"
+    SEARCH_TESTCASE: str = "/projects/{project_id}/testcase/search"
+    GET_TESTCASE_TAGS: str = "/projects/{project_id}/testcase/tags"
     GET_TESTCASE_DETAIL: str = "/projects/{project_id}/testcase/{testcase_id}"
     CREATE_TESTCASE: str = "/projects/{project_id}/testcase/create"
+    BULK_CREATE_TESTCASE: str = "/projects/{project_id}/testcase/bulk"
+    BATCH_GET_TESTCASE: str = "/projects/{project_id}/testcase/batch"
+    BULK_UPDATE_TESTCASE: str = "/projects/{project_id}/testcase/bulk-update"
+    BULK_ARCHIVE_TESTCASE: str = "/projects/{project_id}/testcase/bulk-archive"
     DELETE_TESTCASE: str = "/projects/{project_id}/testcase/{testcase_id}/delete"
     UPDATE_TESTCASE: str = "/projects/{project_id}/testcase/{testcase_id}/update"
+    PATCH_TESTCASE: str = "/projects/{project_id}/testcase/{testcase_id}"
+
+
+class TestRun(BaseConfig):
+    GET_ALL_TESTRUN: str = "/projects/{project_id}/runs"
+    CREATE_TESTRUN: str = "/projects/{project_id}/runs/create"
+    GET_LATEST_RESULTS: str = "/projects/{project_id}/runs/latest"
+    GET_PROJECT_HISTORY: str = "/projects/{project_id}/runs/history"
+    GET_TESTRUN_DETAIL: str = "/projects/{project_id}/runs/{run_id}"
+    INGEST_RESULTS: str = "/projects/{project_id}/runs/{run_id}/results"
+    GET_TESTRUN_RESULTS: str = "/projects/{project_id}/runs/{run_id}/results"
+    GET_TESTCASE_LATEST_RESULT: str = "/projects/{project_id}/testcase/{testcase_id}/latest-result"
+    GET_TESTCASE_HISTORY: str = "/projects/{project_id}/testcase/{testcase_id}/history"
+
+
+class Changes(BaseConfig):
+    GET_CHANGES: str = "/changes"
+    STREAM_CHANGES: str = "/changes/stream"
+
+
+class Metrics(BaseConfig):
+    GET_METRICS: str = "/metrics"
 
 
 @dataclass
 class EndpointConfig:
     PROJECT: Project = Project()
-    TESTCASE: TestCase = TestCase()
\ No newline at end of file
+    TESTCASE: TestCase = TestCase()
+    RUN: TestRun = TestRun()
+    CHANGES: Changes = Changes()
+    METRICS: Metrics = Metrics()
\ No newline at end of file
@@ -10,6 +10,17 @@ class FieldValueErrors(BaseConfig):
 class GeneralErrors(BaseConfig):
     PROJECT_DOES_NOT_EXIST: str = "Project ID does not exist"
     TESTCASE_DOES_NOT_EXIST: str = "Testcase ID not exist under this project"
+    INVALID_BULK_BODY: str = "Request body must be a JSON array or an NDJSON stream"
+    TOO_MANY_BULK_ITEMS: str = "Bulk request exceeds the maximum number of items"
+    TOO_MANY_LOOKUP_IDS: str = "Batch lookup exceeds the maximum number of ids"
+    INVALID_BULK_SELECTION: str = "Select testcases either by ids or by a tags/author filter"
+    EMPTY_BULK_CHANGES: str = "Bulk update must change at least one field"
+    NULL_NOT_ALLOWED: str = "Only optional fields can be set to null"
+    INVALID_JSON_LINE: str = "Line is not valid JSON"
+    ARCHIVE_JOB_DOES_NOT_EXIST: str = "No archive job has been started for this project"
+    TESTRUN_DOES_NOT_EXIST: str = "Test run ID does not exist under this project"
+    NO_TESTCASE_RESULTS: str = "No results have been recorded for this testcase"
+    PRECONDITION_FAILED: str = "Record has been modified since it was last retrieved"
 
 
 @dataclass
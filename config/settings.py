@@ -0,0 +1,82 @@
+import os
+from pydantic import BaseConfig
+from dataclasses import dataclass
+
+
+class PaginationSettings(BaseConfig):
+    DEFAULT_LIMIT: int = 50
+    MAX_LIMIT: int = 500
+
+
+class SearchSettings(BaseConfig):
+    DEFAULT_LIMIT: int = 20
+    MAX_LIMIT: int = 100
+
+
+class StorageSettings(BaseConfig):
+    BACKEND: str = os.environ.get("TESTSHACHOU_STORAGE", "memory")
+    SQLITE_PATH: str = os.environ.get("TESTSHACHOU_SQLITE_PATH", "testshachou.db")
+    SQLITE_POOL_SIZE: int = int(os.environ.get("TESTSHACHOU_SQLITE_POOL_SIZE", "4"))
+    JOURNAL_DIR: str = os.environ.get("TESTSHACHOU_JOURNAL_DIR", "")
+    JOURNAL_COMMIT_DELAY_MS: float = float(os.environ.get("TESTSHACHOU_JOURNAL_COMMIT_DELAY_MS", "0"))
+    JOURNAL_SNAPSHOT_EVERY: int = int(os.environ.get("TESTSHACHOU_JOURNAL_SNAPSHOT_EVERY", "100000"))
+    JOURNAL_FREEZE_HEAP: bool = os.environ.get("TESTSHACHOU_JOURNAL_FREEZE_HEAP", "0") != "0"
+
+
+class BulkSettings(BaseConfig):
+    MAX_ITEMS: int = 10000
+    BATCH_SIZE: int = 500
+    MAX_LOOKUP_IDS: int = 500
+
+
+class RunSettings(BaseConfig):
+    INGEST_BATCH_SIZE: int = 1000
+    DEFAULT_HISTORY_BUCKETS: int = 30
+    MAX_HISTORY_BUCKETS: int = 1000
+
+
+class ExportSettings(BaseConfig):
+    PAGE_SIZE: int = 500
+    GZIP_LEVEL: int = 6
+
+
+class CascadeSettings(BaseConfig):
+    BATCH_SIZE: int = 1000
+
+
+class CacheSettings(BaseConfig):
+    MAX_ENTRIES: int = int(os.environ.get("TESTSHACHOU_RESPONSE_CACHE_SIZE", "10000"))
+
+
+class FeedSettings(BaseConfig):
+    DEFAULT_LIMIT: int = 100
+    MAX_LIMIT: int = 1000
+    MAX_WAIT_SECONDS: float = 30
+    POLL_INTERVAL_SECONDS: float = 0.2
+    STREAM_SECONDS: float = 300
+    KEEPALIVE_SECONDS: float = 15
+
+
+class ResponseSettings(BaseConfig):
+    JSON_ENCODER: str = os.environ.get("TESTSHACHOU_JSON_ENCODER", "auto")
+    FAST_MODELS: bool = os.environ.get("TESTSHACHOU_FAST_MODELS", "1") != "0"
+
+
+class MetricsSettings(BaseConfig):
+    ENABLED: bool = os.environ.get("TESTSHACHOU_METRICS", "1") != "0"
+    NAMESPACE: str = "testshachou"
+
+
+@dataclass
+class SettingsConfig:
+    PAGINATION: PaginationSettings = PaginationSettings()
+    SEARCH: SearchSettings = SearchSettings()
+    STORAGE: StorageSettings = StorageSettings()
+    BULK: BulkSettings = BulkSettings()
+    RUN: RunSettings = RunSettings()
+    EXPORT: ExportSettings = ExportSettings()
+    CACHE: CacheSettings = CacheSettings()
+    CASCADE: CascadeSettings = CascadeSettings()
+    FEED: FeedSettings = FeedSettings()
+    METRICS: MetricsSettings = MetricsSettings()
+    RESPONSE: ResponseSettings = ResponseSettings()
@@ -1,22 +1,90 @@
-from fastapi import FastAPI, Response, status
+from fastapi import BackgroundTasks, FastAPI, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from config.endpoints import EndpointConfig
-from typing import Dict
+from config.errormessage import ErrorsConfig
+from config.settings import SettingsConfig
+from storage import create_storage
+from storage.base import FeedEntry
+from web.cache import CachedRecord, ResponseCache
+from web.durability import DurableResponseMiddleware
+from web.etag import etag_matches, project_etag, testcase_etag
+from web.locks import RecordLocks
+from web.metrics import Metrics, MetricsMiddleware, PROMETHEUS_MEDIA_TYPE, instrument_storage
+from web.responses import ENCODERS, RESPONSE_CLASSES, resolve_encoder
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from uuid import uuid4
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from models.projects import *
 from models.testcase import *
+from models.bulk import *
+from models.tags import *
+from models.jobs import *
+from models.stats import *
+from models.changes import *
+from models.runs import *
 from models.commonerrors import *
+from models.validation import supplied_fields
+import asyncio
+import json
 import uuid
+import zlib
 
-app = FastAPI()
-projects_db: Dict = {}
-testcase_db: Dict = {}
 URL_CONF = EndpointConfig()
 ERRORS_CONF = ErrorsConfig()
+SETTINGS_CONF = SettingsConfig()
+JSON_ENCODER = resolve_encoder(SETTINGS_CONF.RESPONSE.JSON_ENCODER)
+encode_json = ENCODERS[JSON_ENCODER]
+json_response_class = RESPONSE_CLASSES[JSON_ENCODER]
+app = FastAPI(default_response_class=json_response_class)
+db = create_storage(SETTINGS_CONF.STORAGE)
+metrics = Metrics(SETTINGS_CONF.METRICS.NAMESPACE)
+metrics.store_records.track(("projects",), lambda: len(db.projects))
+metrics.store_records.track(("testcases",), lambda: len(db.testcases))
+metrics.store_records.track(("runs",), lambda: len(db.runs))
+metrics.store_records.track(("results",), lambda: db.runs.count_results())
+if SETTINGS_CONF.METRICS.ENABLED:
+    instrument_storage(db)
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+app.add_middleware(DurableResponseMiddleware)
+project_cache = ResponseCache(SETTINGS_CONF.CACHE.MAX_ENTRIES, encode_json)
+testcase_cache = ResponseCache(SETTINGS_CONF.CACHE.MAX_ENTRIES, encode_json)
+response_caches = {"project": project_cache, "testcase": testcase_cache}
+project_locks = RecordLocks()
+testcase_locks = RecordLocks()
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+INVALID_JSON_LINE = object()
+TESTCASE_PATCH_FIELDS = ("title", "description", "author", "expected_results", "tags")
+
+
+def model_response(content: BaseModel) -> Any:
+    if not SETTINGS_CONF.RESPONSE.FAST_MODELS:
+        return content
+    return json_response_class(content)
+
+
+@app.on_event("shutdown")
+def close_storage():
+    db.close()
 
 
 @app.get(URL_CONF.PROJECT.GET_ALL_PROJECT)
-async def get_all_projects():
-    return list(projects_db.values())
+async def get_all_projects(
+        cursor: Optional[int] = None,
+        limit: int = Query(SETTINGS_CONF.PAGINATION.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.PAGINATION.MAX_LIMIT),
+        active: Optional[bool] = True,
+        owner: Optional[str] = None,
+        tags: Optional[List[str]] = Query(None),
+        any_tags: Optional[List[str]] = Query(None)):
+    projects, next_cursor = db.projects.find(cursor, limit, active=active, owner=owner, tags=tags, any_tags=any_tags)
+    return model_response(ProjectListResponseModel(items=projects, next_cursor=next_cursor))
+
+
+@app.get(URL_CONF.PROJECT.GET_PROJECT_TAGS)
+async def get_project_tags():
+    return model_response(TagCountResponseModel(tags=db.projects.tag_counts()))
 
 
 @app.post(URL_CONF.PROJECT.CREATE_PROJECT, status_code=status.HTTP_201_CREATED)
@@ -31,52 +99,266 @@ async def create_project(request: ProjectRequestModel):
         tags=request.tags,
         active=True
     )
-    projects_db[str(project.id)] = project
+    db.projects.add(project)
     return project
 
 
+def sync_response_caches():
+    change_set = db.poll_changes()
+    if change_set.reset:
+        for cache in response_caches.values():
+            cache.clear()
+    for change in change_set.changes:
+        response_caches[change.kind].invalidate(change.record_id)
+
+
+def cached_record_response(cached: CachedRecord, if_none_match: Optional[str]) -> Response:
+    if etag_matches(if_none_match, cached.etag, weak=True):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": cached.etag})
+    return Response(content=cached.body, media_type="application/json", headers={"ETag": cached.etag})
+
+
 @app.get(URL_CONF.PROJECT.GET_PROJECT_DETAILS)
-async def get_project_details(project_id, response: Response):
-    project = projects_db.get(project_id)
-    if not project:
-        response.status_code = status.HTTP_404_NOT_FOUND
-        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
-    else:
-        return project
+async def get_project_details(project_id, response: Response, if_none_match: Optional[str] = Header(None)):
+    sync_response_caches()
+    cached = project_cache.get(project_id)
+    if cached is None:
+        project = db.projects.get(project_id)
+        if not project:
+            response.status_code = status.HTTP_404_NOT_FOUND
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+        cached = project_cache.put(project_id, project, project_etag(project), project_id)
+    return cached_record_response(cached, if_none_match)
+
+
+def next_updated_at(previous: datetime) -> datetime:
+    return max(datetime.utcnow(), previous + timedelta(microseconds=1))
+
+
+def archive_live_testcases(testcases: List[TestCaseResponseModel]) -> Optional[List[TestCaseResponseModel]]:
+    live_testcases = [testcase for testcase in testcases if not testcase.archived]
+    previous_updated_at = [testcase.updated_at for testcase in live_testcases]
+    for testcase in live_testcases:
+        testcase.archived = True
+        testcase.updated_at = next_updated_at(testcase.updated_at)
+    if not db.testcases.save_many(live_testcases, {"archived", "updated_at"}, previous_updated_at):
+        return None
+    return live_testcases
+
+
+async def archive_project_testcases(project_id: str, job: ArchiveJobModel):
+    try:
+        cursor = None
+        while True:
+            testcases, cursor = db.testcases.find_by_project(project_id, cursor, SETTINGS_CONF.CASCADE.BATCH_SIZE)
+            testcase_ids = [str(testcase.id) for testcase in testcases]
+            async with testcase_locks.hold(*testcase_ids) as waited:
+                if waited:
+                    testcases = db.testcases.get_many(testcase_ids)
+                live_testcases = archive_live_testcases(testcases)
+                while live_testcases is None:
+                    live_testcases = archive_live_testcases(db.testcases.get_many(testcase_ids))
+            for testcase in live_testcases:
+                testcase_cache.invalidate(str(testcase.id))
+            job.processed += len(testcases)
+            job.archived += len(live_testcases)
+            db.jobs.save(job)
+            if cursor is None:
+                break
+            await asyncio.sleep(0)
+        job.status = "completed"
+    except Exception:
+        job.status = "failed"
+        raise
+    finally:
+        job.finished_at = datetime.utcnow()
+        db.jobs.save(job)
 
 
 @app.delete(URL_CONF.PROJECT.DELETE_PROJECT)
-async def delete_project(project_id, response: Response):
-    project: ProjectResponseModel = projects_db.get(project_id)
-    if not project:
+async def delete_project(project_id, response: Response, background_tasks: BackgroundTasks):
+    async with project_locks.hold(project_id):
+        saved = False
+        while not saved:
+            project: ProjectResponseModel = db.projects.get(project_id)
+            if not project:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+            elif not project.active:
+                break
+            previous_updated_at = project.updated_at
+            project = project.copy()
+            project.active = False
+            project.updated_at = next_updated_at(previous_updated_at)
+            saved = db.projects.save(project, {"active", "updated_at"}, previous_updated_at)
+        project_cache.invalidate(project_id)
+        job = db.jobs.get(project_id)
+        if job is None or job.status != "running":
+            job = ArchiveJobModel(
+                project_id=project.id,
+                status="running",
+                total=db.testcases.count_by_project(project_id),
+                started_at=datetime.utcnow()
+            )
+            db.jobs.save(job)
+            background_tasks.add_task(archive_project_testcases, project_id, job)
+        return project
+
+
+@app.get(URL_CONF.PROJECT.GET_ARCHIVE_JOB)
+async def get_archive_job(project_id, response: Response):
+    job = db.jobs.get(project_id)
+    if not job:
         response.status_code = status.HTTP_404_NOT_FOUND
-        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.ARCHIVE_JOB_DOES_NOT_EXIST)
     else:
-        project: ProjectResponseModel = projects_db[project_id]
-        project.active = False
-        return project
+        return job
 
 
-@app.put(URL_CONF.PROJECT.UPDATE_PROJECT)
-async def update_project(project_id, request: ProjectRequestModel, response: Response):
-    project: ProjectResponseModel = projects_db.get(project_id)
-    if not project or not project.active:
+@app.get(URL_CONF.PROJECT.GET_PROJECT_STATS)
+async def get_project_stats(project_id, response: Response):
+    if not db.projects.get(project_id):
         response.status_code = status.HTTP_404_NOT_FOUND
         return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
-    else:
-        project: ProjectResponseModel = projects_db[project_id]
-        project.title = request.title
-        project.description = request.description
-        project.owner = request.owner
-        project.tags = request.tags
-        project.updated_at = datetime.utcnow()
+    return model_response(db.testcases.stats(project_id))
+
+
+@app.put(URL_CONF.PROJECT.UPDATE_PROJECT)
+async def update_project(
+        project_id,
+        request: ProjectRequestModel,
+        response: Response,
+        if_match: Optional[str] = Header(None)):
+    async with project_locks.hold(project_id):
+        saved = False
+        while not saved:
+            project: ProjectResponseModel = db.projects.get(project_id)
+            if not project or not project.active:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+            elif if_match is not None and not etag_matches(if_match, project_etag(project), weak=False):
+                response.status_code = status.HTTP_412_PRECONDITION_FAILED
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PRECONDITION_FAILED)
+            previous_updated_at = project.updated_at
+            project = project.copy()
+            project.title = request.title
+            project.description = request.description
+            project.owner = request.owner
+            project.tags = request.tags
+            project.updated_at = next_updated_at(previous_updated_at)
+            saved = db.projects.save(project, expected_updated_at=previous_updated_at)
+        project_cache.invalidate(project_id)
 
+        response.headers["ETag"] = project_etag(project)
         return project
 
 
+def requested_changes(request: BaseModel, nullable: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    changes = {field: getattr(request, field) for field in supplied_fields(request)}
+    if any(value is None and field not in nullable for field, value in changes.items()):
+        return None
+    return changes
+
+
+def apply_changes(record: BaseModel, changes: Dict[str, Any]) -> Set[str]:
+    changed = {field for field, value in changes.items() if getattr(record, field) != value}
+    for field in changed:
+        setattr(record, field, changes[field])
+    return changed
+
+
+@app.patch(URL_CONF.PROJECT.PATCH_PROJECT)
+async def patch_project(
+        project_id,
+        request: ProjectPatchModel,
+        response: Response,
+        if_match: Optional[str] = Header(None)):
+    changes = requested_changes(request, ("description",))
+    if changes is None:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.NULL_NOT_ALLOWED)
+    async with project_locks.hold(project_id):
+        saved = False
+        while not saved:
+            project: ProjectResponseModel = db.projects.get(project_id)
+            if not project or not project.active:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+            elif if_match is not None and not etag_matches(if_match, project_etag(project), weak=False):
+                response.status_code = status.HTTP_412_PRECONDITION_FAILED
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PRECONDITION_FAILED)
+            previous_updated_at = project.updated_at
+            project = project.copy()
+            changed = apply_changes(project, changes)
+            if not changed:
+                break
+            project.updated_at = next_updated_at(previous_updated_at)
+            saved = db.projects.save(project, changed | {"updated_at"}, previous_updated_at)
+        if changed:
+            project_cache.invalidate(project_id)
+        response.headers["ETag"] = project_etag(project)
+        return project
+
+
+def export_line(record_type: str, record: BaseModel) -> str:
+    return f'{{"type":"{record_type}","data":{encode_json(record).decode()}}}\n'
+
+
+def export_project_chunks(project: ProjectResponseModel) -> Iterator[bytes]:
+    yield export_line("project", project).encode()
+    cursor = None
+    while True:
+        testcases, cursor = db.testcases.find_by_project(str(project.id), cursor, SETTINGS_CONF.EXPORT.PAGE_SIZE)
+        if testcases:
+            yield "".join(export_line("testcase", testcase) for testcase in testcases).encode()
+        if cursor is None:
+            break
+
+
+def gzip_chunks(chunks: Iterator[bytes], level: int) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *parameters = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0))) > 0
+
+
+@app.get(URL_CONF.PROJECT.EXPORT_PROJECT)
+async def export_project(project_id, request: Request, response: Response):
+    project = db.projects.get(project_id)
+    if not project:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    chunks = export_project_chunks(project)
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        chunks = gzip_chunks(chunks, SETTINGS_CONF.EXPORT.GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
 @app.post(URL_CONF.TESTCASE.CREATE_TESTCASE, status_code=status.HTTP_201_CREATED)
 async def create_testcase(project_id, request: TestCaseRequestModel, response: Response):
-    if project_id in projects_db:
+    project: ProjectResponseModel = db.projects.get(project_id)
+    if project and project.active:
         testcase = TestCaseResponseModel(
             project_id=uuid.UUID(project_id),
             id=uuid4(),
@@ -90,56 +372,690 @@ async def create_testcase(project_id, request: TestCaseRequestModel, response: R
             expected_results=request.expected_results,
             archived=False
         )
-        testcase_db[str(testcase.id)] = testcase
+        db.testcases.add(testcase)
         return testcase
     else:
         response.status_code = status.HTTP_404_NOT_FOUND
         return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
 
 
-@app.get(URL_CONF.TESTCASE.GET_TESTCASE_DETAIL)
-async def get_testcase_details(project_id, testcase_id, response: Response):
-    testcase_record: TestCaseResponseModel = testcase_db.get(testcase_id)
-    if not testcase_record:
-        response.status_code = status.HTTP_404_NOT_FOUND
-        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
-    elif str(testcase_record.project_id) != project_id:
+def parse_json_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return INVALID_JSON_LINE
+
+
+async def read_ndjson_items(request: Request) -> AsyncIterator[Any]:
+    pending = b""
+    async for chunk in request.stream():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield parse_json_line(line)
+    if pending.strip():
+        yield parse_json_line(pending)
+
+
+async def iterate_items(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def batched(items: AsyncIterator[Any], size: int) -> AsyncIterator[List[Any]]:
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_testcase_batch(
+        project_id: uuid.UUID,
+        offset: int,
+        batch: List[Any]) -> Tuple[List[TestCaseResponseModel], List[BulkItemResultModel]]:
+    created_at = datetime.utcnow()
+    testcases = []
+    results = []
+    for index, item in enumerate(batch, start=offset):
+        if item is INVALID_JSON_LINE:
+            results.append(BulkItemResultModel(
+                index=index,
+                detail=[{"loc": ["body", index], "msg": ERRORS_CONF.GENERAL_ERRORS.INVALID_JSON_LINE,
+                         "type": "value_error.jsondecode"}]
+            ))
+            continue
+        try:
+            request = TestCaseRequestModel.parse_obj(item)
+        except ValidationError as error:
+            results.append(BulkItemResultModel(index=index, detail=error.errors()))
+            continue
+        testcase = TestCaseResponseModel.construct(
+            project_id=project_id,
+            id=uuid4(),
+            created_at=created_at,
+            updated_at=created_at,
+            updated_by=request.author,
+            title=request.title,
+            description=request.description,
+            author=request.author,
+            tags=request.tags,
+            expected_results=request.expected_results,
+            archived=False
+        )
+        testcases.append(testcase)
+        results.append(BulkItemResultModel(index=index, id=testcase.id))
+    return testcases, results
+
+
+@app.post(URL_CONF.TESTCASE.BULK_CREATE_TESTCASE, status_code=status.HTTP_201_CREATED)
+async def bulk_create_testcases(project_id, request: Request, response: Response):
+    project: ProjectResponseModel = db.projects.get(project_id)
+    if not project or not project.active:
         response.status_code = status.HTTP_404_NOT_FOUND
         return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        items = read_ndjson_items(request)
     else:
-        return testcase_record
+        try:
+            body = json.loads(await request.body())
+        except ValueError:
+            body = None
+        if not isinstance(body, list):
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_BODY)
+        items = iterate_items(body)
 
+    testcases = []
+    results = []
+    async for batch in batched(items, SETTINGS_CONF.BULK.BATCH_SIZE):
+        if len(results) + len(batch) > SETTINGS_CONF.BULK.MAX_ITEMS:
+            response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TOO_MANY_BULK_ITEMS)
+        batch_testcases, batch_results = build_testcase_batch(uuid.UUID(project_id), len(results), batch)
+        testcases.extend(batch_testcases)
+        results.extend(batch_results)
+    async with project_locks.hold(project_id):
+        project = db.projects.get(project_id)
+        if not project or not project.active:
+            response.status_code = status.HTTP_404_NOT_FOUND
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+        db.testcases.add_many(testcases)
+    return BulkResponseModel(succeeded=len(testcases), failed=len(results) - len(testcases), results=results)
 
-@app.delete(URL_CONF.TESTCASE.DELETE_TESTCASE)
-async def delete_testcase(project_id, testcase_id, response: Response):
-    testcase_record: TestCaseResponseModel = testcase_db.get(testcase_id)
-    if not testcase_record:
+
+@app.post(URL_CONF.TESTCASE.BATCH_GET_TESTCASE)
+async def batch_get_testcases(project_id, request: TestCaseBatchRequestModel, response: Response):
+    testcase_ids = list(dict.fromkeys(request.ids))
+    if len(testcase_ids) > SETTINGS_CONF.BULK.MAX_LOOKUP_IDS:
+        response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TOO_MANY_LOOKUP_IDS)
+    found = {
+        str(testcase.id): testcase
+        for testcase in db.testcases.get_many(testcase_ids)
+        if str(testcase.project_id) == project_id
+    }
+    if not found and not db.projects.get(project_id):
         response.status_code = status.HTTP_404_NOT_FOUND
-        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
-    elif str(testcase_record.project_id) != project_id:
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    return model_response(TestCaseBatchResponseModel(
+        items=[found[testcase_id] for testcase_id in testcase_ids if testcase_id in found],
+        missing=[testcase_id for testcase_id in testcase_ids if testcase_id not in found]
+    ))
+
+
+def select_testcases(
+        project_id: str,
+        selection: TestCaseSelectionModel,
+        include_archived: bool,
+        response: Response) -> Union[List[TestCaseResponseModel], BaseModel]:
+    filtered = selection.tags is not None or selection.author is not None
+    if (selection.ids is None) != filtered or selection.tags == [] or selection.author == "":
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_SELECTION)
+    if selection.ids is not None:
+        testcase_ids = list(dict.fromkeys(selection.ids))
+        if len(testcase_ids) > SETTINGS_CONF.BULK.MAX_ITEMS:
+            response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TOO_MANY_BULK_ITEMS)
+        found = {
+            str(testcase.id): testcase
+            for testcase in db.testcases.get_many(testcase_ids)
+            if str(testcase.project_id) == project_id and (include_archived or not testcase.archived)
+        }
+        missing = [testcase_id for testcase_id in testcase_ids if testcase_id not in found]
+        if missing:
+            response.status_code = status.HTTP_404_NOT_FOUND
+            return BulkSelectionErrorModel(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST, missing=missing)
+        return [found[testcase_id] for testcase_id in testcase_ids]
+    if not db.projects.get(project_id):
         response.status_code = status.HTTP_404_NOT_FOUND
         return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
-    else:
-        testcase_record.archived = True
+    selected = []
+    cursor = None
+    while True:
+        testcases, cursor = db.testcases.find_by_project(
+            project_id, cursor, SETTINGS_CONF.CASCADE.BATCH_SIZE, tags=selection.tags
+        )
+        selected.extend(
+            testcase for testcase in testcases
+            if not testcase.archived and selection.author in (None, testcase.author)
+        )
+        if len(selected) > SETTINGS_CONF.BULK.MAX_ITEMS:
+            response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TOO_MANY_BULK_ITEMS)
+        if cursor is None:
+            return selected
+
+
+@asynccontextmanager
+async def hold_selection(
+        project_id: str,
+        selection: TestCaseSelectionModel,
+        include_archived: bool,
+        response: Response) -> AsyncIterator[Union[List[TestCaseResponseModel], BaseModel]]:
+    testcases = select_testcases(project_id, selection, include_archived, response)
+    while isinstance(testcases, list):
+        testcase_ids = {str(testcase.id) for testcase in testcases}
+        async with testcase_locks.hold(*testcase_ids) as waited:
+            if waited:
+                testcases = select_testcases(project_id, selection, include_archived, response)
+                if isinstance(testcases, list) and {str(testcase.id) for testcase in testcases} != testcase_ids:
+                    continue
+            yield testcases
+            return
+    yield testcases
+
+
+def bulk_changed_fields(changes: TestCaseChangesModel) -> Set[str]:
+    fields = {field for field in TESTCASE_PATCH_FIELDS if getattr(changes, field) is not None}
+    if changes.add_tags is not None or changes.remove_tags is not None:
+        fields.add("tags")
+    return fields
+
+
+def apply_testcase_changes(testcase: TestCaseResponseModel, changes: TestCaseChangesModel):
+    for field in TESTCASE_PATCH_FIELDS:
+        value = getattr(changes, field)
+        if value is not None:
+            setattr(testcase, field, value)
+    if changes.add_tags is not None or changes.remove_tags is not None:
+        removed = set(changes.remove_tags or [])
+        tags = [tag for tag in testcase.tags or [] if tag not in removed]
+        tags.extend(tag for tag in dict.fromkeys(changes.add_tags or []) if tag not in tags)
+        testcase.tags = tags
+
+
+def bulk_mutation_response(testcases: List[TestCaseResponseModel]) -> BulkMutationResponseModel:
+    for testcase in testcases:
+        testcase_cache.invalidate(str(testcase.id))
+    return BulkMutationResponseModel(updated=len(testcases), ids=[testcase.id for testcase in testcases])
+
+
+@app.post(URL_CONF.TESTCASE.BULK_UPDATE_TESTCASE)
+async def bulk_update_testcases(project_id, request: TestCaseBulkUpdateRequestModel, response: Response):
+    fields = bulk_changed_fields(request.changes)
+    if not fields:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.EMPTY_BULK_CHANGES)
+    while True:
+        async with hold_selection(project_id, request.select, False, response) as testcases:
+            if not isinstance(testcases, list):
+                return testcases
+            previous_updated_at = [testcase.updated_at for testcase in testcases]
+            for testcase in testcases:
+                apply_testcase_changes(testcase, request.changes)
+                testcase.updated_at = next_updated_at(testcase.updated_at)
+                testcase.updated_by = request.updated_by
+            if db.testcases.save_many(testcases, fields | {"updated_at", "updated_by"}, previous_updated_at):
+                return bulk_mutation_response(testcases)
+
+
+@app.post(URL_CONF.TESTCASE.BULK_ARCHIVE_TESTCASE)
+async def bulk_archive_testcases(project_id, request: TestCaseBulkArchiveRequestModel, response: Response):
+    while True:
+        async with hold_selection(project_id, request.select, True, response) as testcases:
+            if not isinstance(testcases, list):
+                return testcases
+            archived = archive_live_testcases(testcases)
+            if archived is not None:
+                return bulk_mutation_response(archived)
+
+
+@app.get(URL_CONF.TESTCASE.GET_ALL_TESTCASE)
+async def get_all_testcases(
+        project_id,
+        response: Response,
+        cursor: Optional[int] = None,
+        limit: int = Query(SETTINGS_CONF.PAGINATION.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.PAGINATION.MAX_LIMIT),
+        tags: Optional[List[str]] = Query(None),
+        any_tags: Optional[List[str]] = Query(None)):
+    if not db.projects.get(project_id):
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    testcases, next_cursor = db.testcases.find_by_project(project_id, cursor, limit, tags=tags, any_tags=any_tags)
+    return model_response(TestCaseListResponseModel(items=testcases, next_cursor=next_cursor))
+
+
+@app.get(URL_CONF.TESTCASE.GET_TESTCASE_TAGS)
+async def get_testcase_tags(project_id, response: Response):
+    if not db.projects.get(project_id):
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    return model_response(TagCountResponseModel(tags=db.testcases.tag_counts(project_id)))
+
+
+@app.get(URL_CONF.TESTCASE.SEARCH_TESTCASE)
+async def search_testcases(
+        project_id,
+        response: Response,
+        q: str = Query(..., min_length=1),
+        limit: int = Query(SETTINGS_CONF.SEARCH.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.SEARCH.MAX_LIMIT)):
+    if not db.projects.get(project_id):
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    return model_response(TestCaseSearchResponseModel(items=db.testcases.search(project_id, q, limit)))
+
+
+@app.get(URL_CONF.TESTCASE.GET_TESTCASE_DETAIL)
+async def get_testcase_details(
+        project_id,
+        testcase_id,
+        response: Response,
+        if_none_match: Optional[str] = Header(None)):
+    sync_response_caches()
+    cached = testcase_cache.get(testcase_id)
+    if cached is None:
+        testcase_record: TestCaseResponseModel = db.testcases.get(testcase_id)
+        if not testcase_record:
+            response.status_code = status.HTTP_404_NOT_FOUND
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
+        cached = testcase_cache.put(
+            testcase_id,
+            testcase_record,
+            testcase_etag(testcase_record),
+            str(testcase_record.project_id)
+        )
+    if cached.project_id != project_id:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    return cached_record_response(cached, if_none_match)
+
+
+@app.delete(URL_CONF.TESTCASE.DELETE_TESTCASE)
+async def delete_testcase(project_id, testcase_id, response: Response):
+    async with testcase_locks.hold(testcase_id):
+        archived = None
+        while archived is None:
+            testcase_record: TestCaseResponseModel = db.testcases.get(testcase_id)
+            if not testcase_record:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
+            elif str(testcase_record.project_id) != project_id:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+            archived = archive_live_testcases([testcase_record])
+        testcase_cache.invalidate(testcase_id)
         return testcase_record
 
 
 @app.put(URL_CONF.TESTCASE.UPDATE_TESTCASE)
-async def update_testcase(project_id, testcase_id, request: TestCaseRequestModel, response: Response):
-    testcase_record: TestCaseResponseModel = testcase_db.get(testcase_id)
-    if not testcase_record or testcase_record.archived:
+async def update_testcase(
+        project_id,
+        testcase_id,
+        request: TestCaseRequestModel,
+        response: Response,
+        if_match: Optional[str] = Header(None)):
+    async with testcase_locks.hold(testcase_id):
+        saved = False
+        while not saved:
+            testcase_record: TestCaseResponseModel = db.testcases.get(testcase_id)
+            if not testcase_record or testcase_record.archived:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
+            elif str(testcase_record.project_id) != project_id:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+            elif if_match is not None and not etag_matches(if_match, testcase_etag(testcase_record), weak=False):
+                response.status_code = status.HTTP_412_PRECONDITION_FAILED
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PRECONDITION_FAILED)
+            previous_updated_at = testcase_record.updated_at
+            testcase_record.title = request.title
+            testcase_record.description = request.description
+            testcase_record.author = request.author
+            testcase_record.tags = request.tags
+            testcase_record.expected_results = request.expected_results
+            testcase_record.updated_at = next_updated_at(previous_updated_at)
+            testcase_record.updated_by = request.author
+            saved = db.testcases.save(testcase_record, expected_updated_at=previous_updated_at)
+        testcase_cache.invalidate(testcase_id)
+
+        response.headers["ETag"] = testcase_etag(testcase_record)
+        return testcase_record
+
+
+@app.patch(URL_CONF.TESTCASE.PATCH_TESTCASE)
+async def patch_testcase(
+        project_id,
+        testcase_id,
+        request: TestCasePatchModel,
+        response: Response,
+        if_match: Optional[str] = Header(None)):
+    changes = requested_changes(request, ("tags",))
+    if changes is None:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.NULL_NOT_ALLOWED)
+    async with testcase_locks.hold(testcase_id):
+        saved = False
+        while not saved:
+            testcase_record: TestCaseResponseModel = db.testcases.get(testcase_id)
+            if not testcase_record or testcase_record.archived:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
+            elif str(testcase_record.project_id) != project_id:
+                response.status_code = status.HTTP_404_NOT_FOUND
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+            elif if_match is not None and not etag_matches(if_match, testcase_etag(testcase_record), weak=False):
+                response.status_code = status.HTTP_412_PRECONDITION_FAILED
+                return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PRECONDITION_FAILED)
+            previous_updated_at = testcase_record.updated_at
+            changed = apply_changes(testcase_record, changes)
+            if not changed:
+                break
+            testcase_record.updated_at = next_updated_at(previous_updated_at)
+            testcase_record.updated_by = testcase_record.author
+            saved = db.testcases.save(testcase_record, changed | {"updated_at", "updated_by"}, previous_updated_at)
+        if changed:
+            testcase_cache.invalidate(testcase_id)
+        response.headers["ETag"] = testcase_etag(testcase_record)
+        return testcase_record
+
+
+def change_entry(entry: FeedEntry) -> ChangeEntryModel:
+    if entry.kind == "project":
+        record = db.projects.get(entry.record_id)
+        deleted = not record.active
+    else:
+        record = db.testcases.get(entry.record_id)
+        deleted = record.archived
+    return ChangeEntryModel.construct(
+        seq=entry.seq,
+        type=entry.kind,
+        id=entry.record_id,
+        deleted=deleted,
+        data=None if deleted else record
+    )
+
+
+@app.post(URL_CONF.RUN.CREATE_TESTRUN, status_code=status.HTTP_201_CREATED)
+async def create_testrun(project_id, request: TestRunRequestModel, response: Response):
+    if not db.projects.get(project_id):
         response.status_code = status.HTTP_404_NOT_FOUND
-        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
-    elif str(testcase_record.project_id) != project_id:
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    run = TestRunResponseModel(
+        project_id=uuid.UUID(project_id),
+        id=uuid4(),
+        name=request.name,
+        environment=request.environment,
+        created_at=datetime.utcnow()
+    )
+    db.runs.add(run)
+    return run
+
+
+@app.get(URL_CONF.RUN.GET_ALL_TESTRUN)
+async def get_all_testruns(
+        project_id,
+        response: Response,
+        cursor: Optional[int] = None,
+        limit: int = Query(SETTINGS_CONF.PAGINATION.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.PAGINATION.MAX_LIMIT)):
+    if not db.projects.get(project_id):
         response.status_code = status.HTTP_404_NOT_FOUND
         return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    runs, next_cursor = db.runs.find_by_project(project_id, cursor, limit)
+    return model_response(TestRunListResponseModel(items=runs, next_cursor=next_cursor))
+
+
+@app.get(URL_CONF.RUN.GET_LATEST_RESULTS)
+async def get_latest_results(
+        project_id,
+        response: Response,
+        result_status: Optional[ResultStatus] = Query(None, alias="status"),
+        cursor: Optional[int] = None,
+        limit: int = Query(SETTINGS_CONF.PAGINATION.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.PAGINATION.MAX_LIMIT)):
+    if not db.projects.get(project_id):
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    results, next_cursor = db.runs.latest_by_project(project_id, cursor, limit, status=result_status)
+    return model_response(TestResultListResponseModel(items=results, next_cursor=next_cursor))
+
+
+@app.get(URL_CONF.RUN.GET_PROJECT_HISTORY)
+async def get_project_history(
+        project_id,
+        response: Response,
+        granularity: Granularity = "day",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = Query(SETTINGS_CONF.RUN.DEFAULT_HISTORY_BUCKETS, ge=1, le=SETTINGS_CONF.RUN.MAX_HISTORY_BUCKETS)):
+    if not db.projects.get(project_id):
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST)
+    buckets = db.runs.project_history(project_id, granularity, since, until, limit)
+    return model_response(ResultHistoryResponseModel(granularity=granularity, buckets=buckets))
+
+
+def get_project_testrun(project_id: str, run_id: str) -> Optional[TestRunResponseModel]:
+    run = db.runs.get(run_id)
+    if run is None or str(run.project_id) != project_id:
+        return None
+    return run
+
+
+@app.get(URL_CONF.RUN.GET_TESTRUN_DETAIL)
+async def get_testrun_details(project_id, run_id, response: Response):
+    run = get_project_testrun(project_id, run_id)
+    if not run:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTRUN_DOES_NOT_EXIST)
+    return model_response(run)
+
+
+def build_result_batch(
+        project_id: str,
+        run_id: uuid.UUID,
+        offset: int,
+        batch: List[Any],
+        owned_testcases: Dict[str, bool]) -> Tuple[List[TestResultResponseModel], List[BulkItemResultModel]]:
+    finished_at = datetime.utcnow()
+    requests = []
+    errors = []
+    for index, item in enumerate(batch, start=offset):
+        if item is INVALID_JSON_LINE:
+            errors.append(BulkItemResultModel(
+                index=index,
+                detail=[{"loc": ["body", index], "msg": ERRORS_CONF.GENERAL_ERRORS.INVALID_JSON_LINE,
+                         "type": "value_error.jsondecode"}]
+            ))
+            continue
+        try:
+            requests.append((index, TestResultRequestModel.parse_obj(item)))
+        except ValidationError as error:
+            errors.append(BulkItemResultModel(index=index, detail=error.errors()))
+    unknown_ids = {request.testcase_id for _, request in requests if request.testcase_id not in owned_testcases}
+    for testcase_id in unknown_ids:
+        owned_testcases[testcase_id] = False
+    for testcase in db.testcases.get_many(unknown_ids):
+        owned_testcases[str(testcase.id)] = str(testcase.project_id) == project_id and not testcase.archived
+    results = []
+    for index, request in requests:
+        if not owned_testcases[request.testcase_id]:
+            errors.append(BulkItemResultModel(
+                index=index,
+                detail=[{"loc": ["body", index, "testcase_id"],
+                         "msg": ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST,
+                         "type": "value_error.testcase"}]
+            ))
+            continue
+        results.append(TestResultResponseModel.construct(
+            run_id=run_id,
+            testcase_id=uuid.UUID(request.testcase_id),
+            status=request.status,
+            duration_ms=request.duration_ms,
+            output=request.output,
+            finished_at=request.finished_at or finished_at
+        ))
+    errors.sort(key=lambda error: error.index)
+    return results, errors
+
+
+@app.post(URL_CONF.RUN.INGEST_RESULTS)
+async def ingest_results(project_id, run_id, request: Request, response: Response):
+    run = get_project_testrun(project_id, run_id)
+    if not run:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTRUN_DOES_NOT_EXIST)
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        items = read_ndjson_items(request)
     else:
-        testcase_record.title = request.title
-        testcase_record.description = request.description
-        testcase_record.author = request.author
-        testcase_record.tags = request.tags
-        testcase_record.expected_results = request.expected_results
-        testcase_record.updated_at = datetime.utcnow()
-        testcase_record.updated_by = request.author
+        try:
+            body = json.loads(await request.body())
+        except ValueError:
+            body = None
+        if not isinstance(body, list):
+            response.status_code = status.HTTP_400_BAD_REQUEST
+            return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_BODY)
+        items = iterate_items(body)
 
-        return testcase_record
+    owned_testcases: Dict[str, bool] = {}
+    received = 0
+    accepted = 0
+    errors = []
+    async for batch in batched(items, SETTINGS_CONF.RUN.INGEST_BATCH_SIZE):
+        results, batch_errors = build_result_batch(project_id, run.id, received, batch, owned_testcases)
+        if results:
+            db.runs.append_results(run_id, results)
+        received += len(batch)
+        accepted += len(results)
+        errors.extend(batch_errors)
+    return ResultIngestResponseModel(accepted=accepted, rejected=len(errors), errors=errors)
+
+
+@app.get(URL_CONF.RUN.GET_TESTRUN_RESULTS)
+async def get_testrun_results(
+        project_id,
+        run_id,
+        response: Response,
+        cursor: Optional[int] = None,
+        limit: int = Query(SETTINGS_CONF.PAGINATION.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.PAGINATION.MAX_LIMIT)):
+    if not get_project_testrun(project_id, run_id):
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTRUN_DOES_NOT_EXIST)
+    results, next_cursor = db.runs.results(run_id, cursor, limit)
+    return model_response(TestResultListResponseModel(items=results, next_cursor=next_cursor))
+
+
+@app.get(URL_CONF.RUN.GET_TESTCASE_LATEST_RESULT)
+async def get_testcase_latest_result(project_id, testcase_id, response: Response):
+    testcase = db.testcases.get(testcase_id)
+    if not testcase or str(testcase.project_id) != project_id:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
+    result = db.runs.latest(testcase_id)
+    if not result:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.NO_TESTCASE_RESULTS)
+    return model_response(result)
+
+
+@app.get(URL_CONF.RUN.GET_TESTCASE_HISTORY)
+async def get_testcase_history(
+        project_id,
+        testcase_id,
+        response: Response,
+        granularity: Granularity = "day",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = Query(SETTINGS_CONF.RUN.DEFAULT_HISTORY_BUCKETS, ge=1, le=SETTINGS_CONF.RUN.MAX_HISTORY_BUCKETS)):
+    testcase = db.testcases.get(testcase_id)
+    if not testcase or str(testcase.project_id) != project_id:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return GeneralError(error=ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST)
+    buckets = db.runs.testcase_history(testcase_id, granularity, since, until, limit)
+    return model_response(ResultHistoryResponseModel(granularity=granularity, buckets=buckets))
+
+
+async def wait_for_changes(cursor: int, seconds: float):
+    deadline = asyncio.get_running_loop().time() + seconds
+    while db.feed.last_seq() <= cursor and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(SETTINGS_CONF.FEED.POLL_INTERVAL_SECONDS)
+
+
+@app.get(URL_CONF.CHANGES.GET_CHANGES)
+async def get_changes(
+        cursor: int = Query(0, ge=0),
+        limit: int = Query(SETTINGS_CONF.FEED.DEFAULT_LIMIT, ge=1, le=SETTINGS_CONF.FEED.MAX_LIMIT),
+        wait: float = Query(0, ge=0, le=SETTINGS_CONF.FEED.MAX_WAIT_SECONDS),
+        epoch: Optional[str] = None):
+    reset = epoch is not None and epoch != db.feed.epoch()
+    if reset:
+        cursor = 0
+    await wait_for_changes(cursor, wait)
+    entries = db.feed.read(cursor, limit)
+    return model_response(ChangeFeedResponseModel(
+        epoch=db.feed.epoch(),
+        reset=reset,
+        items=[change_entry(entry) for entry in entries],
+        next_cursor=entries[-1].seq if entries else cursor
+    ))
+
+
+def parse_event_id(last_event_id: Optional[str]) -> Tuple[bool, int]:
+    epoch, _, seq = (last_event_id or "").partition(":")
+    if epoch != db.feed.epoch() or not seq.isdigit():
+        return last_event_id is not None, 0
+    return False, int(seq)
+
+
+async def change_events(request: Request, last_event_id: Optional[str]) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    reset, cursor = parse_event_id(last_event_id)
+    if reset:
+        yield "event: reset\ndata: {}\n\n"
+    deadline = loop.time() + SETTINGS_CONF.FEED.STREAM_SECONDS
+    keepalive_at = loop.time() + SETTINGS_CONF.FEED.KEEPALIVE_SECONDS
+    while loop.time() < deadline and not await request.is_disconnected():
+        entries = db.feed.read(cursor, SETTINGS_CONF.FEED.MAX_LIMIT)
+        for entry in entries:
+            data = encode_json(change_entry(entry)).decode()
+            yield f"id: {db.feed.epoch()}:{entry.seq}\nevent: change\ndata: {data}\n\n"
+            cursor = entry.seq
+        if entries:
+            keepalive_at = loop.time() + SETTINGS_CONF.FEED.KEEPALIVE_SECONDS
+            continue
+        if loop.time() >= keepalive_at:
+            yield ": keepalive\n\n"
+            keepalive_at = loop.time() + SETTINGS_CONF.FEED.KEEPALIVE_SECONDS
+        await asyncio.sleep(SETTINGS_CONF.FEED.POLL_INTERVAL_SECONDS)
+
+
+@app.get(URL_CONF.CHANGES.STREAM_CHANGES)
+async def stream_changes(request: Request, last_event_id: Optional[str] = Header(None)):
+    return StreamingResponse(
+        change_events(request, last_event_id),
+        media_type=EVENT_STREAM_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+@app.get(URL_CONF.METRICS.GET_METRICS)
+async def get_metrics():
+    return Response(content=metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
+if SETTINGS_CONF.METRICS.ENABLED:
+    metrics.instrument(app.routes)
@@ -0,0 +1,52 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from uuid import UUID
+from models.testcase import TestCasePatchModel
+from models.validation import text_fields_validator
+
+
+class BulkItemResultModel(BaseModel):
+    index: int
+    id: Optional[UUID] = None
+    detail: Optional[List[dict]] = None
+
+
+class BulkResponseModel(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResultModel]
+
+
+class TestCaseSelectionModel(BaseModel):
+    ids: Optional[List[str]] = None
+    tags: Optional[List[str]] = None
+    author: Optional[str] = None
+
+
+class TestCaseChangesModel(TestCasePatchModel):
+    add_tags: Optional[List[str]] = None
+    remove_tags: Optional[List[str]] = None
+
+    check_tag_changes = text_fields_validator('add_tags', 'remove_tags')
+
+
+class TestCaseBulkUpdateRequestModel(BaseModel):
+    select: TestCaseSelectionModel
+    changes: TestCaseChangesModel
+    updated_by: str
+
+    check_text_fields = text_fields_validator('updated_by')
+
+
+class TestCaseBulkArchiveRequestModel(BaseModel):
+    select: TestCaseSelectionModel
+
+
+class BulkMutationResponseModel(BaseModel):
+    updated: int
+    ids: List[UUID]
+
+
+class BulkSelectionErrorModel(BaseModel):
+    error: str
+    missing: List[str]
@@ -0,0 +1,19 @@
+from typing import List, Optional, Union
+from pydantic import BaseModel
+from models.projects import ProjectResponseModel
+from models.testcase import TestCaseResponseModel
+
+
+class ChangeEntryModel(BaseModel):
+    seq: int
+    type: str
+    id: str
+    deleted: bool
+    data: Optional[Union[ProjectResponseModel, TestCaseResponseModel]] = None
+
+
+class ChangeFeedResponseModel(BaseModel):
+    epoch: str
+    reset: bool
+    items: List[ChangeEntryModel]
+    next_cursor: int
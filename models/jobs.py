@@ -0,0 +1,14 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+from uuid import UUID
+
+
+class ArchiveJobModel(BaseModel):
+    project_id: UUID
+    status: str
+    total: int
+    processed: int = 0
+    archived: int = 0
+    started_at: datetime
+    finished_at: Optional[datetime] = None
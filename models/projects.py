@@ -1,10 +1,8 @@
 from typing import Optional, List
-from pydantic import BaseModel, validator
+from pydantic import BaseModel
 from datetime import datetime
 from uuid import UUID
-from config.errormessage import ErrorsConfig
-
-ERRORS_CONF = ErrorsConfig()
+from models.validation import text_fields_validator
 
 
 class ProjectRequestModel(BaseModel):
@@ -13,47 +11,7 @@ class ProjectRequestModel(BaseModel):
     owner: str
     tags: List[str]
 
-    @validator('title', 'owner')
-    def fields_should_not_be_space_only(cls, value: str):
-        if value.isspace():
-            raise ValueError(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
-        else:
-            return value
-
-    @validator('title', 'owner',)
-    def fields_should_not_be_empty_string(cls, value: str):
-        if value == "":
-            raise ValueError(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
-        else:
-            return value
-
-    @validator('description')
-    def description_should_not_be_empty_string(cls, value: str):
-        if value is not None:
-            if value == "":
-                raise ValueError(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
-        return value
-
-    @validator('description')
-    def description_should_not_be_space_only(cls, value: str):
-        if value is not None:
-            if value.isspace():
-                raise ValueError(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
-        return value
-
-    @validator('tags')
-    def tag_values_should_not_be_space_only(cls, tag_list: list):
-        for tags in tag_list:
-            if tags.isspace():
-                raise ValueError(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
-        return tag_list
-
-    @validator('tags')
-    def tag_values_should_not_be_empty_string(cls, tag_list: list):
-        for tags in tag_list:
-            if tags == "":
-                raise ValueError(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
-        return tag_list
+    check_text_fields = text_fields_validator('title', 'owner', 'description', 'tags', spaces_first=True)
 
 
 class ProjectResponseModel(ProjectRequestModel):
@@ -61,3 +19,17 @@ class ProjectResponseModel(ProjectRequestModel):
     created_at: datetime
     updated_at: datetime
     active: bool
+
+
+class ProjectPatchModel(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    owner: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+    check_text_fields = text_fields_validator('title', 'owner', 'description', 'tags', spaces_first=True)
+
+
+class ProjectListResponseModel(BaseModel):
+    items: List[ProjectResponseModel]
+    next_cursor: Optional[int] = None
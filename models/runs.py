@@ -0,0 +1,72 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+from uuid import UUID
+from models.bulk import BulkItemResultModel
+from models.validation import text_fields_validator
+
+RESULT_STATUSES = ("passed", "failed", "skipped", "error")
+ResultStatus = Literal["passed", "failed", "skipped", "error"]
+Granularity = Literal["hour", "day", "week"]
+MAX_DURATION_MS = 2 ** 63 - 1
+
+
+class TestRunRequestModel(BaseModel):
+    name: str
+    environment: Optional[str] = None
+
+    check_text_fields = text_fields_validator('name', 'environment')
+
+
+class TestRunResponseModel(TestRunRequestModel):
+    project_id: UUID
+    id: UUID
+    created_at: datetime
+    total: int = 0
+    statuses: Dict[str, int] = {}
+    last_finished_at: Optional[datetime] = None
+
+
+class TestRunListResponseModel(BaseModel):
+    items: List[TestRunResponseModel]
+    next_cursor: Optional[int] = None
+
+
+class TestResultRequestModel(BaseModel):
+    testcase_id: str
+    status: ResultStatus
+    duration_ms: int = Field(..., ge=0, le=MAX_DURATION_MS)
+    output: Optional[str] = None
+    finished_at: Optional[datetime] = None
+
+
+class TestResultResponseModel(BaseModel):
+    run_id: UUID
+    testcase_id: UUID
+    status: ResultStatus
+    duration_ms: int
+    output: Optional[str] = None
+    finished_at: datetime
+
+
+class TestResultListResponseModel(BaseModel):
+    items: List[TestResultResponseModel]
+    next_cursor: Optional[int] = None
+
+
+class ResultIngestResponseModel(BaseModel):
+    accepted: int
+    rejected: int
+    errors: List[BulkItemResultModel]
+
+
+class ResultBucketModel(BaseModel):
+    start: datetime
+    total: int
+    statuses: Dict[str, int]
+    pass_rate: Optional[float] = None
+
+
+class ResultHistoryResponseModel(BaseModel):
+    granularity: Granularity
+    buckets: List[ResultBucketModel]
@@ -0,0 +1,12 @@
+from typing import Dict, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class ProjectStatsResponseModel(BaseModel):
+    total: int
+    active: int
+    archived: int
+    authors: Dict[str, int]
+    tags: Dict[str, int]
+    last_updated_at: Optional[datetime] = None
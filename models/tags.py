@@ -0,0 +1,6 @@
+from typing import Dict
+from pydantic import BaseModel
+
+
+class TagCountResponseModel(BaseModel):
+    tags: Dict[str, int]
@@ -1,46 +1,18 @@
 from typing import List, Optional
-from pydantic import BaseModel, validator
+from pydantic import BaseModel
 from datetime import datetime
 from uuid import UUID
-from config.errormessage import ErrorsConfig
-
-ERRORS_CONF = ErrorsConfig()
+from models.validation import text_fields_validator
 
 
 class TestCaseRequestModel(BaseModel):
     title: str
     description: str
     author: str
-    tags: Optional[List[str]]
+    tags: Optional[List[str]] = None
     expected_results: str
 
-    @validator('title', 'description', 'author', 'expected_results')
-    def fields_should_not_be_space_only(cls, value: str):
-        if value.isspace():
-            raise ValueError(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
-        else:
-            return value
-
-    @validator('title', 'description', 'author', 'expected_results')
-    def fields_should_not_be_empty_string(cls, value: str):
-        if value == "":
-            raise ValueError(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
-        else:
-            return value
-
-    @validator('tags')
-    def tag_values_should_not_be_empty_string(cls, tag_list: str):
-        for tags in tag_list:
-            if tags == "":
-                raise ValueError(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
-        return tag_list
-
-    @validator('tags')
-    def tag_values_should_not_be_space_only(cls, tag_list: str):
-        for tags in tag_list:
-            if tags.isspace():
-                raise ValueError(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
-        return tag_list
+    check_text_fields = text_fields_validator('title', 'description', 'author', 'expected_results', 'tags')
 
 
 class TestCaseResponseModel(TestCaseRequestModel):
@@ -50,3 +22,31 @@ class TestCaseResponseModel(TestCaseRequestModel):
     updated_at: datetime
     updated_by: str
     archived: bool
+
+
+class TestCasePatchModel(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    author: Optional[str] = None
+    tags: Optional[List[str]] = None
+    expected_results: Optional[str] = None
+
+    check_text_fields = text_fields_validator('title', 'description', 'author', 'expected_results', 'tags')
+
+
+class TestCaseListResponseModel(BaseModel):
+    items: List[TestCaseResponseModel]
+    next_cursor: Optional[int] = None
+
+
+class TestCaseSearchResponseModel(BaseModel):
+    items: List[TestCaseResponseModel]
+
+
+class TestCaseBatchRequestModel(BaseModel):
+    ids: List[str]
+
+
+class TestCaseBatchResponseModel(BaseModel):
+    items: List[TestCaseResponseModel]
+    missing: List[str]
@@ -0,0 +1,55 @@
+from typing import Any, List, Set
+from pydantic import BaseModel
+from config.errormessage import ErrorsConfig
+
+try:
+    from pydantic import field_validator
+    from pydantic_core import PydanticCustomError
+except ImportError:
+    from pydantic import validator
+
+    field_validator = None
+
+ERRORS_CONF = ErrorsConfig()
+
+
+def field_value_error(message: str) -> Exception:
+    if field_validator is None:
+        return ValueError(message)
+    return PydanticCustomError("value_error", message)
+
+
+def check_text(value: str) -> str:
+    if not value:
+        raise field_value_error(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
+    if value.isspace():
+        raise field_value_error(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
+    return value
+
+
+def check_text_list(values: List[str], spaces_first: bool) -> List[str]:
+    empty = "" in values
+    if (spaces_first or not empty) and any(map(str.isspace, values)):
+        raise field_value_error(ERRORS_CONF.FIELD_VALUE.SPACES_ONLY)
+    if empty:
+        raise field_value_error(ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS)
+    return values
+
+
+def text_fields_validator(*fields: str, spaces_first: bool = False):
+    def check_text_values(cls, value: Any) -> Any:
+        if value is None:
+            return value
+        if isinstance(value, str):
+            return check_text(value)
+        return check_text_list(value, spaces_first)
+
+    if field_validator is None:
+        return validator(*fields, allow_reuse=True)(check_text_values)
+    return field_validator(*fields)(check_text_values)
+
+
+def supplied_fields(model: BaseModel) -> Set[str]:
+    if field_validator is None:
+        return set(model.__fields_set__)
+    return set(model.model_fields_set)
@@ -0,0 +1,21 @@
+from config.settings import StorageSettings
+from storage.base import ProjectRepository, Storage, TestCaseRepository
+from storage.indexes import SecondaryIndex
+from storage.journal import create_journaled_storage
+from storage.memory import create_memory_storage
+from storage.sqlite import create_sqlite_storage
+
+
+def create_storage(settings: StorageSettings) -> Storage:
+    if settings.BACKEND == "memory" and settings.JOURNAL_DIR:
+        return create_journaled_storage(
+            settings.JOURNAL_DIR,
+            settings.JOURNAL_COMMIT_DELAY_MS / 1000,
+            settings.JOURNAL_SNAPSHOT_EVERY,
+            settings.JOURNAL_FREEZE_HEAP
+        )
+    if settings.BACKEND == "memory":
+        return create_memory_storage()
+    if settings.BACKEND == "sqlite":
+        return create_sqlite_storage(settings.SQLITE_PATH, settings.SQLITE_POOL_SIZE)
+    raise ValueError(f"Unknown storage backend: {settings.BACKEND}")
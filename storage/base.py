@@ -0,0 +1,245 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Collection, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from models.jobs import ArchiveJobModel
+from models.projects import ProjectResponseModel
+from models.runs import ResultBucketModel, TestResultResponseModel, TestRunResponseModel
+from models.stats import ProjectStatsResponseModel
+from models.testcase import TestCaseResponseModel
+
+ProjectPage = Tuple[List[ProjectResponseModel], Optional[int]]
+TestCasePage = Tuple[List[TestCaseResponseModel], Optional[int]]
+TestRunPage = Tuple[List[TestRunResponseModel], Optional[int]]
+TestResultPage = Tuple[List[TestResultResponseModel], Optional[int]]
+Fields = Optional[Collection[str]]
+
+PROJECT_INDEXED_FIELDS = frozenset({"active", "owner", "tags"})
+PROJECT_TAG_FIELDS = frozenset({"active", "tags"})
+TESTCASE_ARCHIVED_FIELDS = frozenset({"archived"})
+TESTCASE_TAG_FIELDS = frozenset({"archived", "tags"})
+TESTCASE_AUTHOR_FIELDS = frozenset({"archived", "author"})
+TESTCASE_SEARCH_FIELDS = frozenset({"archived", "title", "description", "expected_results"})
+
+
+def affects(fields: Fields, indexed_fields: FrozenSet[str]) -> bool:
+    return fields is None or not indexed_fields.isdisjoint(fields)
+
+
+class Change(NamedTuple):
+    kind: str
+    record_id: str
+
+
+class ChangeSet(NamedTuple):
+    reset: bool
+    changes: List[Change]
+
+
+class FeedEntry(NamedTuple):
+    seq: int
+    kind: str
+    record_id: str
+
+
+class ProjectRepository(ABC):
+    @abstractmethod
+    def add(self, project: ProjectResponseModel):
+        pass
+
+    @abstractmethod
+    def get(self, project_id: str) -> Optional[ProjectResponseModel]:
+        pass
+
+    @abstractmethod
+    def save(
+            self,
+            project: ProjectResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        pass
+
+    @abstractmethod
+    def find(
+            self,
+            cursor: Optional[int],
+            limit: int,
+            active: Optional[bool] = None,
+            owner: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            any_tags: Optional[List[str]] = None) -> ProjectPage:
+        pass
+
+    @abstractmethod
+    def tag_counts(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class TestCaseRepository(ABC):
+    @abstractmethod
+    def add(self, testcase: TestCaseResponseModel):
+        pass
+
+    @abstractmethod
+    def add_many(self, testcases: Iterable[TestCaseResponseModel]):
+        pass
+
+    @abstractmethod
+    def get(self, testcase_id: str) -> Optional[TestCaseResponseModel]:
+        pass
+
+    @abstractmethod
+    def get_many(self, testcase_ids: Iterable[str]) -> List[TestCaseResponseModel]:
+        pass
+
+    @abstractmethod
+    def save(
+            self,
+            testcase: TestCaseResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        pass
+
+    @abstractmethod
+    def save_many(
+            self,
+            testcases: Iterable[TestCaseResponseModel],
+            fields: Fields = None,
+            expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        pass
+
+    @abstractmethod
+    def find_by_project(
+            self,
+            project_id: str,
+            cursor: Optional[int],
+            limit: int,
+            tags: Optional[List[str]] = None,
+            any_tags: Optional[List[str]] = None) -> TestCasePage:
+        pass
+
+    @abstractmethod
+    def search(self, project_id: str, query: str, limit: int) -> List[TestCaseResponseModel]:
+        pass
+
+    @abstractmethod
+    def count_by_project(self, project_id: str) -> int:
+        pass
+
+    @abstractmethod
+    def tag_counts(self, project_id: str) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def stats(self, project_id: str) -> ProjectStatsResponseModel:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class ArchiveJobRepository(ABC):
+    @abstractmethod
+    def get(self, project_id: str) -> Optional[ArchiveJobModel]:
+        pass
+
+    @abstractmethod
+    def save(self, job: ArchiveJobModel):
+        pass
+
+
+class TestRunRepository(ABC):
+    @abstractmethod
+    def add(self, run: TestRunResponseModel):
+        pass
+
+    @abstractmethod
+    def get(self, run_id: str) -> Optional[TestRunResponseModel]:
+        pass
+
+    @abstractmethod
+    def find_by_project(self, project_id: str, cursor: Optional[int], limit: int) -> TestRunPage:
+        pass
+
+    @abstractmethod
+    def append_results(self, run_id: str, results: Iterable[TestResultResponseModel]):
+        pass
+
+    @abstractmethod
+    def results(self, run_id: str, cursor: Optional[int], limit: int) -> TestResultPage:
+        pass
+
+    @abstractmethod
+    def latest(self, testcase_id: str) -> Optional[TestResultResponseModel]:
+        pass
+
+    @abstractmethod
+    def latest_by_project(
+            self,
+            project_id: str,
+            cursor: Optional[int],
+            limit: int,
+            status: Optional[str] = None) -> TestResultPage:
+        pass
+
+    @abstractmethod
+    def testcase_history(
+            self,
+            testcase_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        pass
+
+    @abstractmethod
+    def project_history(
+            self,
+            project_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        pass
+
+    @abstractmethod
+    def count_results(self) -> int:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class ChangeFeedRepository(ABC):
+    @abstractmethod
+    def epoch(self) -> str:
+        pass
+
+    @abstractmethod
+    def read(self, after: int, limit: int) -> List[FeedEntry]:
+        pass
+
+    @abstractmethod
+    def last_seq(self) -> int:
+        pass
+
+
+@dataclass
+class Storage:
+    projects: ProjectRepository
+    testcases: TestCaseRepository
+    jobs: ArchiveJobRepository
+    feed: ChangeFeedRepository
+    runs: TestRunRepository
+
+    def poll_changes(self) -> ChangeSet:
+        return ChangeSet(reset=False, changes=[])
+
+    def close(self):
+        pass
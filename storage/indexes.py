@@ -0,0 +1,49 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional
+
+
+class SecondaryIndex:
+    def __init__(self):
+        self._postings: Dict[Hashable, List[int]] = {}
+
+    def add(self, key: Hashable, position: int):
+        postings = self._postings.setdefault(key, [])
+        if not postings or postings[-1] < position:
+            postings.append(position)
+        else:
+            insort(postings, position)
+
+    def remove(self, key: Hashable, position: int):
+        postings = self._postings.get(key)
+        if not postings:
+            return
+        index = bisect_left(postings, position)
+        if index < len(postings) and postings[index] == position:
+            del postings[index]
+        if not postings:
+            del self._postings[key]
+
+    def scan(self, key: Hashable, after: Optional[int]) -> Iterator[int]:
+        postings = self._postings.get(key, [])
+        start = 0 if after is None else bisect_right(postings, after)
+        for index in range(start, len(postings)):
+            yield postings[index]
+
+    def scan_any(self, keys: Iterable[Hashable], after: Optional[int]) -> Iterator[int]:
+        previous = None
+        for position in heapq.merge(*(self.scan(key, after) for key in keys)):
+            if position != previous:
+                yield position
+                previous = position
+
+    def page(self, key: Hashable, after: Optional[int], limit: int) -> List[int]:
+        postings = self._postings.get(key, [])
+        start = 0 if after is None else bisect_right(postings, after)
+        return postings[start:start + limit]
+
+    def count(self, key: Hashable) -> int:
+        return len(self._postings.get(key, []))
+
+    def count_any(self, keys: Iterable[Hashable]) -> int:
+        return sum(self.count(key) for key in keys)
@@ -0,0 +1,558 @@
+import asyncio
+import gc
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+from models.jobs import ArchiveJobModel
+from models.projects import ProjectResponseModel
+from models.runs import TestResultResponseModel, TestRunResponseModel
+from models.testcase import TestCaseResponseModel
+from storage.base import Fields, Storage
+from storage.memory import (
+    MemoryArchiveJobRepository, MemoryChangeFeed, MemoryProjectRepository, MemoryTestCaseRepository,
+    MemoryTestRunRepository
+)
+from storage.records import STATUS_CODES, TestCaseRecord, materialize_testcase, pack_result_time, pack_time
+
+try:
+    from orjson import dumps as dump_json, loads as load_json
+except ImportError:
+    load_json = json.loads
+
+    def dump_json(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+PROJECT = "p"
+TESTCASE = "t"
+JOB = "j"
+BATCH = "b"
+RUN = "r"
+RESULTS = "x"
+RESULT_CHUNK = 1000
+LOAD_CHUNK = 10000
+SNAPSHOT_FILE = "snapshot.ndjson"
+SEGMENT_PREFIX = "journal-"
+SEGMENT_SUFFIX = ".ndjson"
+
+pending_commits: "ContextVar[Optional[Dict[Journal, int]]]" = ContextVar("pending_commits", default=None)
+
+
+def encode_project(project: ProjectResponseModel) -> list:
+    return [
+        PROJECT,
+        str(project.id),
+        project.title,
+        project.description,
+        project.owner,
+        project.tags,
+        project.created_at.isoformat(),
+        project.updated_at.isoformat(),
+        project.active
+    ]
+
+
+def decode_project(row: list) -> ProjectResponseModel:
+    return ProjectResponseModel.construct(
+        id=UUID(row[1]),
+        title=row[2],
+        description=row[3],
+        owner=row[4],
+        tags=row[5],
+        created_at=datetime.fromisoformat(row[6]),
+        updated_at=datetime.fromisoformat(row[7]),
+        active=row[8]
+    )
+
+
+def encode_testcase(testcase: TestCaseResponseModel) -> list:
+    return [
+        TESTCASE,
+        str(testcase.id),
+        str(testcase.project_id),
+        testcase.title,
+        testcase.description,
+        testcase.author,
+        testcase.tags,
+        testcase.expected_results,
+        testcase.created_at.isoformat(),
+        testcase.updated_at.isoformat(),
+        testcase.updated_by,
+        testcase.archived
+    ]
+
+
+def decode_testcase(row: list, tags: Optional[Tuple[str, ...]]) -> TestCaseRecord:
+    return TestCaseRecord(
+        row[1],
+        sys.intern(row[2]),
+        row[3],
+        row[4],
+        sys.intern(row[5]),
+        tags,
+        row[7],
+        pack_time(datetime.fromisoformat(row[8])),
+        pack_time(datetime.fromisoformat(row[9])),
+        sys.intern(row[10]),
+        row[11]
+    )
+
+
+def encode_job(job: ArchiveJobModel) -> list:
+    return [JOB, json.loads(job.json())]
+
+
+def decode_job(row: list) -> ArchiveJobModel:
+    return ArchiveJobModel(**row[1])
+
+
+def encode_run(run: TestRunResponseModel) -> list:
+    return [RUN, str(run.id), str(run.project_id), run.name, run.environment, run.created_at.isoformat()]
+
+
+def decode_run(row: list) -> TestRunResponseModel:
+    return TestRunResponseModel.construct(
+        id=UUID(row[1]),
+        project_id=UUID(row[2]),
+        name=row[3],
+        environment=row[4],
+        created_at=datetime.fromisoformat(row[5])
+    )
+
+
+def encode_result(result: TestResultResponseModel) -> list:
+    return [
+        str(result.testcase_id),
+        STATUS_CODES[result.status],
+        result.duration_ms,
+        result.output,
+        pack_result_time(result.finished_at)
+    ]
+
+
+def encode_line(row: list) -> bytes:
+    return dump_json(row) + b"\n"
+
+
+def segment_name(segment: int) -> str:
+    return f"{SEGMENT_PREFIX}{segment:08d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: str) -> List[int]:
+    return sorted(
+        int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+        for name in os.listdir(directory)
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def read_rows(path: str) -> Iterator[list]:
+    with open(path, "rb") as lines:
+        for line in lines:
+            try:
+                yield load_json(line)
+            except ValueError:
+                return
+
+
+def fsync_directory(directory: str):
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+async def wait_for_commits(pending: Dict["Journal", int]):
+    while pending:
+        journal, ticket = pending.popitem()
+        await journal.synced(ticket)
+
+
+def resolve_waiter(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+class Journal:
+    def __init__(
+            self,
+            directory: str,
+            segment: int,
+            commit_delay: float,
+            snapshot_every: int,
+            dump: Callable[[], Iterable[list]]):
+        self.lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._synced = threading.Condition(self.lock)
+        self._waiters: List[Tuple[int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._directory = directory
+        self._segment = segment
+        self._file = open(os.path.join(directory, segment_name(segment)), "ab")
+        self._commit_delay = commit_delay
+        self._snapshot_every = snapshot_every
+        self._dump = dump
+        self._written = 0
+        self._synced_ticket = 0
+        self._entries_since_snapshot = 0
+        self._closing = False
+        self._snapshotter: Optional[threading.Thread] = None
+        self._flusher = threading.Thread(target=self._run, name="journal-flusher", daemon=True)
+        self._flusher.start()
+
+    def append(self, rows: Iterable[list]) -> int:
+        with self.lock:
+            lines = [encode_line(row) for row in rows]
+            self._file.write(b"".join(lines))
+            self._written += 1
+            self._entries_since_snapshot += len(lines)
+            self._synced.notify_all()
+            return self._written
+
+    def commit(self, ticket: int):
+        pending = pending_commits.get()
+        if pending is None:
+            self.wait(ticket)
+        elif pending.get(self, 0) < ticket:
+            pending[self] = ticket
+
+    def wait(self, ticket: int):
+        with self._synced:
+            while self._synced_ticket < ticket:
+                self._synced.wait()
+
+    def synced(self, ticket: int) -> "asyncio.Future[None]":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.lock:
+            if self._synced_ticket >= ticket:
+                future.set_result(None)
+            else:
+                self._waiters.append((ticket, loop, future))
+        return future
+
+    def snapshot(self):
+        with self._snapshot_lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        with self._sync_lock, self.lock:
+            self._sync_file()
+            self._file.close()
+            self._segment += 1
+            self._file = open(os.path.join(self._directory, segment_name(self._segment)), "ab")
+            self._entries_since_snapshot = 0
+            segment = self._segment
+            rows = self._dump()
+        temporary_path = os.path.join(self._directory, SNAPSHOT_FILE + ".tmp")
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(encode_line([segment]))
+            for row in rows:
+                snapshot_file.write(encode_line(row))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, os.path.join(self._directory, SNAPSHOT_FILE))
+        fsync_directory(self._directory)
+        for old_segment in list_segments(self._directory):
+            if old_segment < segment:
+                os.remove(os.path.join(self._directory, segment_name(old_segment)))
+
+    def close(self):
+        with self._synced:
+            self._closing = True
+            self._synced.notify_all()
+        self._flusher.join()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        with self._sync_lock, self.lock:
+            self._sync_file()
+            self._file.close()
+
+    def _sync(self):
+        with self._sync_lock:
+            with self.lock:
+                self._file.flush()
+                ticket = self._written
+            os.fsync(self._file.fileno())
+            with self.lock:
+                self._mark_synced(ticket)
+
+    def _sync_file(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._mark_synced(self._written)
+
+    def _mark_synced(self, ticket: int):
+        self._synced_ticket = ticket
+        self._synced.notify_all()
+        waiters = self._waiters
+        self._waiters = [waiter for waiter in waiters if waiter[0] > ticket]
+        for waiter_ticket, loop, future in waiters:
+            if waiter_ticket <= ticket and not loop.is_closed():
+                loop.call_soon_threadsafe(resolve_waiter, future)
+
+    def _run(self):
+        while True:
+            with self._synced:
+                while self._synced_ticket == self._written and not self._closing:
+                    self._synced.wait()
+                if self._closing:
+                    return
+            time.sleep(self._commit_delay)
+            self._sync()
+            with self.lock:
+                if self._entries_since_snapshot >= self._snapshot_every:
+                    self._entries_since_snapshot = 0
+                    self._snapshotter = threading.Thread(target=self.snapshot, name="journal-snapshot")
+                    self._snapshotter.start()
+
+
+class JournaledProjectRepository(MemoryProjectRepository):
+    def __init__(self, feed: MemoryChangeFeed):
+        super().__init__(feed)
+        self.journal: Optional[Journal] = None
+
+    def add(self, project: ProjectResponseModel):
+        with self.journal.lock:
+            super().add(project)
+            ticket = self.journal.append([encode_project(project)])
+        self.journal.commit(ticket)
+
+    def save(
+            self,
+            project: ProjectResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        with self.journal.lock:
+            if not super().save(project, fields, expected_updated_at):
+                return False
+            ticket = self.journal.append([encode_project(project)])
+        self.journal.commit(ticket)
+        return True
+
+    def restore(self, project: ProjectResponseModel):
+        if str(project.id) not in self._positions:
+            super().add(project)
+        else:
+            super().save(project)
+
+    def records(self) -> List[ProjectResponseModel]:
+        return [self._records[project_id] for project_id in self._order]
+
+
+class JournaledTestCaseRepository(MemoryTestCaseRepository):
+    def __init__(self, feed: MemoryChangeFeed):
+        super().__init__(feed)
+        self.journal: Optional[Journal] = None
+
+    def add(self, testcase: TestCaseResponseModel):
+        self.add_many([testcase])
+
+    def add_many(self, testcases: Iterable[TestCaseResponseModel]):
+        testcases = list(testcases)
+        with self.journal.lock:
+            for testcase in testcases:
+                super().add(testcase)
+            ticket = self.journal.append(encode_testcase(testcase) for testcase in testcases)
+        self.journal.commit(ticket)
+
+    def save(
+            self,
+            testcase: TestCaseResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        with self.journal.lock:
+            if not super().save(testcase, fields, expected_updated_at):
+                return False
+            ticket = self.journal.append([encode_testcase(testcase)])
+        self.journal.commit(ticket)
+        return True
+
+    def save_many(
+            self,
+            testcases: Iterable[TestCaseResponseModel],
+            fields: Fields = None,
+            expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        testcases = list(testcases)
+        rows = [encode_testcase(testcase) for testcase in testcases]
+        with self.journal.lock:
+            if not super().save_many(testcases, fields, expected_updated_at):
+                return False
+            ticket = self.journal.append(rows if len(rows) == 1 else [[BATCH, rows]])
+        self.journal.commit(ticket)
+        return True
+
+    def restore(self, row: list):
+        record = decode_testcase(row, self._intern_tags(row[6]))
+        position = self._positions.get(record.id)
+        if position is None:
+            self._add_record(record)
+        else:
+            self._replace_record(position, record)
+
+    def load(self, rows: List[list]):
+        self._add_records([decode_testcase(row, self._intern_tags(row[6])) for row in rows])
+
+    def records(self) -> List[TestCaseRecord]:
+        return list(self._records)
+
+
+class JournaledArchiveJobRepository(MemoryArchiveJobRepository):
+    def __init__(self):
+        super().__init__()
+        self.journal: Optional[Journal] = None
+
+    def save(self, job: ArchiveJobModel):
+        with self.journal.lock:
+            super().save(job)
+            ticket = self.journal.append([encode_job(job)])
+        self.journal.commit(ticket)
+
+    def restore(self, job: ArchiveJobModel):
+        super().save(job)
+
+    def records(self) -> List[ArchiveJobModel]:
+        return list(self._jobs.values())
+
+
+class JournaledTestRunRepository(MemoryTestRunRepository):
+    def __init__(self):
+        super().__init__()
+        self.journal: Optional[Journal] = None
+
+    def add(self, run: TestRunResponseModel):
+        with self.journal.lock:
+            super().add(run)
+            ticket = self.journal.append([encode_run(run)])
+        self.journal.commit(ticket)
+
+    def append_results(self, run_id: str, results: Iterable[TestResultResponseModel]):
+        rows = [encode_result(result) for result in results]
+        with self.journal.lock:
+            self.restore_results(run_id, rows)
+            ticket = self.journal.append([[RESULTS, run_id, rows]])
+        self.journal.commit(ticket)
+
+    def restore(self, run: TestRunResponseModel):
+        if str(run.id) not in self._positions:
+            super().add(run)
+
+    def restore_results(self, run_id: str, rows: List[list]):
+        self._append_rows(self._positions[run_id], rows)
+
+    def records(self) -> Iterator[list]:
+        return itertools.chain(map(encode_run, list(self._runs)), self._result_rows(len(self._log)))
+
+    def _result_rows(self, end: int) -> Iterator[list]:
+        log = self._log
+        start = 0
+        while start < end:
+            run = log.runs[start]
+            stop = start + 1
+            while stop < end and stop - start < RESULT_CHUNK and log.runs[stop] == run:
+                stop += 1
+            yield [RESULTS, log.run_ids[run], [
+                [
+                    log.testcase_ids[log.testcases[position]],
+                    log.statuses[position],
+                    log.durations[position],
+                    log.outputs[position],
+                    log.finished_at[position]
+                ]
+                for position in range(start, stop)
+            ]]
+            start = stop
+
+
+@dataclass
+class JournaledStorage(Storage):
+    journal: Optional[Journal] = None
+
+    def snapshot_rows(self) -> Iterator[list]:
+        projects, testcases, jobs = self.projects.records(), self.testcases.records(), self.jobs.records()
+        runs = self.runs.records()
+        return itertools.chain(
+            map(encode_project, projects),
+            map(encode_testcase, map(materialize_testcase, testcases)),
+            map(encode_job, jobs),
+            runs
+        )
+
+    def replay(self, rows: Iterable[list]):
+        for row in rows:
+            if row[0] == TESTCASE:
+                self.testcases.restore(row)
+            elif row[0] == PROJECT:
+                self.projects.restore(decode_project(row))
+            elif row[0] == JOB:
+                self.jobs.restore(decode_job(row))
+            elif row[0] == RESULTS:
+                self.runs.restore_results(row[1], row[2])
+            elif row[0] == RUN:
+                self.runs.restore(decode_run(row))
+            elif row[0] == BATCH:
+                self.replay(row[1])
+
+    def load(self, rows: Iterable[list]):
+        testcases = []
+        for row in rows:
+            if row[0] != TESTCASE:
+                self.replay([row])
+                continue
+            testcases.append(row)
+            if len(testcases) == LOAD_CHUNK:
+                self.testcases.load(testcases)
+                testcases = []
+        self.testcases.load(testcases)
+
+    def snapshot(self):
+        self.journal.snapshot()
+
+    def close(self):
+        self.journal.close()
+
+
+def create_journaled_storage(
+        directory: str,
+        commit_delay: float = 0,
+        snapshot_every: int = 100000,
+        freeze_heap: bool = False) -> JournaledStorage:
+    os.makedirs(directory, exist_ok=True)
+    feed = MemoryChangeFeed()
+    storage = JournaledStorage(
+        projects=JournaledProjectRepository(feed),
+        testcases=JournaledTestCaseRepository(feed),
+        jobs=JournaledArchiveJobRepository(),
+        feed=feed,
+        runs=JournaledTestRunRepository()
+    )
+    first_segment = 0
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        if os.path.exists(snapshot_path):
+            rows = read_rows(snapshot_path)
+            first_segment = next(rows)[0]
+            storage.load(rows)
+        segments = [segment for segment in list_segments(directory) if segment >= first_segment]
+        for segment in segments:
+            storage.replay(read_rows(os.path.join(directory, segment_name(segment))))
+    finally:
+        if collecting:
+            gc.enable()
+    if freeze_heap:
+        gc.freeze()
+    next_segment = segments[-1] + 1 if segments else first_segment
+    storage.journal = Journal(directory, next_segment, commit_delay, snapshot_every, storage.snapshot_rows)
+    for repository in (storage.projects, storage.testcases, storage.jobs, storage.runs):
+        repository.journal = storage.journal
+    return storage
@@ -0,0 +1,599 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Collection, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
+from models.jobs import ArchiveJobModel
+from models.projects import ProjectResponseModel
+from models.runs import RESULT_STATUSES, ResultBucketModel, TestResultResponseModel, TestRunResponseModel
+from models.stats import ProjectStatsResponseModel
+from models.testcase import TestCaseResponseModel
+from storage.base import (
+    PROJECT_INDEXED_FIELDS, TESTCASE_ARCHIVED_FIELDS, TESTCASE_AUTHOR_FIELDS, TESTCASE_SEARCH_FIELDS,
+    TESTCASE_TAG_FIELDS,
+    ArchiveJobRepository, ChangeFeedRepository, FeedEntry, Fields, ProjectPage, ProjectRepository, Storage,
+    TestCasePage, TestCaseRepository, TestResultPage, TestRunPage, TestRunRepository, affects
+)
+from storage.indexes import SecondaryIndex
+from storage.records import (
+    STATUS_CODES, ResultLog, TestCaseRecord, check_result_rows, compact_testcase, materialize_testcase,
+    Timestamp, pack_result_time, pack_time, unpack_time
+)
+from storage.rollups import Rollups, materialize_bucket
+from storage.search import InvertedIndex
+
+
+def smallest_scan(scans: List[Tuple[int, Iterator[int]]]) -> Optional[Iterator[int]]:
+    if not scans:
+        return None
+    return min(scans, key=lambda scan: scan[0])[1]
+
+
+def matches_tags(record_tags: Collection[str], tags: List[str], any_tags: List[str]) -> bool:
+    if not all(tag in record_tags for tag in tags):
+        return False
+    return not any_tags or any(tag in record_tags for tag in any_tags)
+
+
+FEED_COMPACTION_SLACK = 1024
+
+
+def discount(counter: Counter, keys: Iterable[str]):
+    for key in keys:
+        counter[key] -= 1
+        if not counter[key]:
+            del counter[key]
+
+
+class MemoryChangeFeed(ChangeFeedRepository):
+    def __init__(self):
+        self._epoch = uuid4().hex
+        self._entries: List[FeedEntry] = []
+        self._latest: Dict[Tuple[str, str], int] = {}
+
+    def record(self, kind: str, record_id: str):
+        self.record_many(kind, [record_id])
+
+    def record_many(self, kind: str, record_ids: Iterable[str]):
+        seq = self.last_seq()
+        for seq, record_id in enumerate(record_ids, seq + 1):
+            self._latest[(kind, record_id)] = seq
+            self._entries.append(FeedEntry(seq, kind, record_id))
+        if len(self._entries) > 2 * len(self._latest) + FEED_COMPACTION_SLACK:
+            self._entries = [entry for entry in self._entries if self._is_latest(entry)]
+
+    def epoch(self) -> str:
+        return self._epoch
+
+    def read(self, after: int, limit: int) -> List[FeedEntry]:
+        entries = []
+        for index in range(bisect_left(self._entries, (after + 1,)), len(self._entries)):
+            if len(entries) == limit:
+                break
+            if self._is_latest(self._entries[index]):
+                entries.append(self._entries[index])
+        return entries
+
+    def last_seq(self) -> int:
+        return self._entries[-1].seq if self._entries else 0
+
+    def _is_latest(self, entry: FeedEntry) -> bool:
+        return self._latest[(entry.kind, entry.record_id)] == entry.seq
+
+
+class MemoryProjectRepository(ProjectRepository):
+    def __init__(self, feed: Optional[MemoryChangeFeed] = None):
+        self._feed = feed or MemoryChangeFeed()
+        self._records: Dict[str, ProjectResponseModel] = {}
+        self._order: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._indexed_keys: Dict[int, Tuple[bool, str, FrozenSet[str]]] = {}
+        self._active_index = SecondaryIndex()
+        self._owner_index = SecondaryIndex()
+        self._tag_index = SecondaryIndex()
+        self._active_tag_counts: Counter = Counter()
+
+    def add(self, project: ProjectResponseModel):
+        project_id = str(project.id)
+        position = len(self._order)
+        self._records[project_id] = project
+        self._positions[project_id] = position
+        self._order.append(project_id)
+        self._index(position, project)
+        self._feed.record("project", project_id)
+
+    def get(self, project_id: str) -> Optional[ProjectResponseModel]:
+        return self._records.get(project_id)
+
+    def save(
+            self,
+            project: ProjectResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        project_id = str(project.id)
+        if expected_updated_at is not None and self._records[project_id].updated_at != expected_updated_at:
+            return False
+        position = self._positions[project_id]
+        reindex = affects(fields, PROJECT_INDEXED_FIELDS)
+        if reindex:
+            self._unindex(position)
+        self._records[project_id] = project
+        if reindex:
+            self._index(position, project)
+        self._feed.record("project", project_id)
+        return True
+
+    def find(
+            self,
+            cursor: Optional[int],
+            limit: int,
+            active: Optional[bool] = None,
+            owner: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            any_tags: Optional[List[str]] = None) -> ProjectPage:
+        tags = tags or []
+        any_tags = any_tags or []
+        scans = [(self._tag_index.count(tag), self._tag_index.scan(tag, after=cursor)) for tag in tags]
+        if any_tags:
+            scans.append((self._tag_index.count_any(any_tags), self._tag_index.scan_any(any_tags, after=cursor)))
+        if active is not None:
+            scans.append((self._active_index.count(active), self._active_index.scan(active, after=cursor)))
+        if owner is not None:
+            scans.append((self._owner_index.count(owner), self._owner_index.scan(owner, after=cursor)))
+        positions = smallest_scan(scans) or range(0 if cursor is None else cursor + 1, len(self._order))
+
+        projects = []
+        last_position = None
+        for position in positions:
+            project_active, project_owner, project_tags = self._indexed_keys[position]
+            if active is not None and project_active != active:
+                continue
+            if owner is not None and project_owner != owner:
+                continue
+            if not matches_tags(project_tags, tags, any_tags):
+                continue
+            if len(projects) == limit:
+                return projects, last_position
+            projects.append(self._records[self._order[position]])
+            last_position = position
+        return projects, None
+
+    def tag_counts(self) -> Dict[str, int]:
+        return dict(self._active_tag_counts)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _index(self, position: int, project: ProjectResponseModel):
+        active, owner, tags = project.active, project.owner, frozenset(project.tags)
+        self._indexed_keys[position] = (active, owner, tags)
+        self._active_index.add(active, position)
+        self._owner_index.add(owner, position)
+        for tag in tags:
+            self._tag_index.add(tag, position)
+        if active:
+            self._active_tag_counts.update(tags)
+
+    def _unindex(self, position: int):
+        active, owner, tags = self._indexed_keys.pop(position)
+        self._active_index.remove(active, position)
+        self._owner_index.remove(owner, position)
+        for tag in tags:
+            self._tag_index.remove(tag, position)
+        if active:
+            discount(self._active_tag_counts, tags)
+
+
+class MemoryTestCaseRepository(TestCaseRepository):
+    def __init__(self, feed: Optional[MemoryChangeFeed] = None):
+        self._feed = feed or MemoryChangeFeed()
+        self._records: List[TestCaseRecord] = []
+        self._positions: Dict[str, int] = {}
+        self._tag_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._project_index = SecondaryIndex()
+        self._tag_index = SecondaryIndex()
+        self._live_tag_counts: Dict[str, Counter] = {}
+        self._live_author_counts: Dict[str, Counter] = {}
+        self._archived_counts: Counter = Counter()
+        self._last_updated: Dict[str, datetime] = {}
+        self._search_indexes: Dict[str, InvertedIndex] = {}
+
+    def add(self, testcase: TestCaseResponseModel):
+        self._add_record(self._compact(testcase, str(testcase.id)))
+
+    def add_many(self, testcases: Iterable[TestCaseResponseModel]):
+        for testcase in testcases:
+            self.add(testcase)
+
+    def get(self, testcase_id: str) -> Optional[TestCaseResponseModel]:
+        position = self._positions.get(testcase_id)
+        if position is None:
+            return None
+        return materialize_testcase(self._records[position])
+
+    def get_many(self, testcase_ids: Iterable[str]) -> List[TestCaseResponseModel]:
+        positions = (self._positions.get(testcase_id) for testcase_id in testcase_ids)
+        return [materialize_testcase(self._records[position]) for position in positions if position is not None]
+
+    def save(
+            self,
+            testcase: TestCaseResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        position = self._positions[str(testcase.id)]
+        if expected_updated_at is not None and self._records[position].updated_at != pack_time(expected_updated_at):
+            return False
+        self._replace_record(position, self._compact(testcase, self._records[position].id), fields)
+        return True
+
+    def save_many(
+            self,
+            testcases: Iterable[TestCaseResponseModel],
+            fields: Fields = None,
+            expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        testcases = list(testcases)
+        positions = [self._positions[str(testcase.id)] for testcase in testcases]
+        if expected_updated_at is not None and any(
+                self._records[position].updated_at != pack_time(expected)
+                for position, expected in zip(positions, expected_updated_at)):
+            return False
+        updates = dict(zip(positions, testcases))
+        for position in updates:
+            self._unindex(position, fields)
+        for position, testcase in updates.items():
+            record = self._records[position] = self._compact(testcase, self._records[position].id)
+            self._index(position, record, fields)
+            self._feed.record("testcase", record.id)
+        return True
+
+    def find_by_project(
+            self,
+            project_id: str,
+            cursor: Optional[int],
+            limit: int,
+            tags: Optional[List[str]] = None,
+            any_tags: Optional[List[str]] = None) -> TestCasePage:
+        tags = tags or []
+        any_tags = any_tags or []
+        scans = [
+            (self._tag_index.count((project_id, tag)), self._tag_index.scan((project_id, tag), after=cursor))
+            for tag in tags
+        ]
+        if any_tags:
+            keys = [(project_id, tag) for tag in any_tags]
+            scans.append((self._tag_index.count_any(keys), self._tag_index.scan_any(keys, after=cursor)))
+        positions = smallest_scan(scans) or self._project_index.scan(project_id, after=cursor)
+
+        testcases = []
+        last_position = None
+        for position in positions:
+            record = self._records[position]
+            if not matches_tags(record.tags or (), tags, any_tags):
+                continue
+            if len(testcases) == limit:
+                return testcases, last_position
+            testcases.append(materialize_testcase(record))
+            last_position = position
+        return testcases, None
+
+    def search(self, project_id: str, query: str, limit: int) -> List[TestCaseResponseModel]:
+        search_index = self._search_indexes.get(project_id)
+        if search_index is None:
+            search_index = self._search_indexes[project_id] = self._build_search_index(project_id)
+        return [
+            materialize_testcase(self._records[self._positions[testcase_id]])
+            for testcase_id, _ in search_index.search(query, limit)
+        ]
+
+    def count_by_project(self, project_id: str) -> int:
+        return self._project_index.count(project_id)
+
+    def tag_counts(self, project_id: str) -> Dict[str, int]:
+        return dict(self._live_tag_counts.get(project_id, {}))
+
+    def stats(self, project_id: str) -> ProjectStatsResponseModel:
+        total, archived = self._project_index.count(project_id), self._archived_counts[project_id]
+        return ProjectStatsResponseModel(
+            total=total,
+            active=total - archived,
+            archived=archived,
+            authors=dict(self._live_author_counts.get(project_id, {})),
+            tags=self.tag_counts(project_id),
+            last_updated_at=self._last_updated.get(project_id)
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _add_record(self, record: TestCaseRecord):
+        position = len(self._records)
+        self._records.append(record)
+        self._positions[record.id] = position
+        self._project_index.add(record.project_id, position)
+        self._index(position, record)
+        self._feed.record("testcase", record.id)
+
+    def _add_records(self, records: List[TestCaseRecord]):
+        live_tags: Dict[str, List[str]] = {}
+        live_authors: Dict[str, List[str]] = {}
+        last_updated: Dict[str, Timestamp] = {}
+        for position, record in enumerate(records, len(self._records)):
+            project_id = record.project_id
+            self._positions[record.id] = position
+            self._project_index.add(project_id, position)
+            tags = frozenset(record.tags or ())
+            for tag in tags:
+                self._tag_index.add((project_id, tag), position)
+            if record.archived:
+                self._archived_counts[project_id] += 1
+            else:
+                live_tags.setdefault(project_id, []).extend(tags)
+                live_authors.setdefault(project_id, []).append(record.author)
+            if last_updated.get(project_id, record.updated_at) <= record.updated_at:
+                last_updated[project_id] = record.updated_at
+        self._records.extend(records)
+        self._feed.record_many("testcase", [record.id for record in records])
+        for project_id, tags in live_tags.items():
+            self._live_tag_counts.setdefault(project_id, Counter()).update(tags)
+        for project_id, authors in live_authors.items():
+            self._live_author_counts.setdefault(project_id, Counter()).update(authors)
+        for project_id, updated_at in last_updated.items():
+            updated_at = unpack_time(updated_at)
+            if project_id not in self._last_updated or self._last_updated[project_id] < updated_at:
+                self._last_updated[project_id] = updated_at
+            self._search_indexes.pop(project_id, None)
+
+    def _replace_record(self, position: int, record: TestCaseRecord, fields: Fields = None):
+        self._unindex(position, fields)
+        self._records[position] = record
+        self._index(position, record, fields)
+        self._feed.record("testcase", record.id)
+
+    def _compact(self, testcase: TestCaseResponseModel, testcase_id: str) -> TestCaseRecord:
+        return compact_testcase(testcase, testcase_id, self._intern_tags(testcase.tags))
+
+    def _intern_tags(self, tags: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+        if tags is None:
+            return None
+        tags = tuple(sys.intern(tag) for tag in tags)
+        return self._tag_tuples.setdefault(tags, tags)
+
+    def _build_search_index(self, project_id: str) -> InvertedIndex:
+        search_index = InvertedIndex()
+        for position in self._project_index.scan(project_id, after=None):
+            record = self._records[position]
+            if not record.archived:
+                search_index.add(record.id, record.title, record.description, record.expected_results)
+        return search_index
+
+    def _index(self, position: int, record: TestCaseRecord, fields: Fields = None):
+        project_id = record.project_id
+        if affects(fields, TESTCASE_TAG_FIELDS):
+            tags = frozenset(record.tags or ())
+            for tag in tags:
+                self._tag_index.add((project_id, tag), position)
+            if not record.archived:
+                self._live_tag_counts.setdefault(project_id, Counter()).update(tags)
+        if affects(fields, TESTCASE_AUTHOR_FIELDS) and not record.archived:
+            self._live_author_counts.setdefault(project_id, Counter())[record.author] += 1
+        if affects(fields, TESTCASE_ARCHIVED_FIELDS) and record.archived:
+            self._archived_counts[project_id] += 1
+        updated_at = unpack_time(record.updated_at)
+        if project_id not in self._last_updated or self._last_updated[project_id] < updated_at:
+            self._last_updated[project_id] = updated_at
+        search_index = self._search_indexes.get(project_id)
+        if search_index is not None and affects(fields, TESTCASE_SEARCH_FIELDS) and not record.archived:
+            search_index.add(record.id, record.title, record.description, record.expected_results)
+
+    def _unindex(self, position: int, fields: Fields = None):
+        record = self._records[position]
+        project_id = record.project_id
+        if affects(fields, TESTCASE_TAG_FIELDS):
+            tags = frozenset(record.tags or ())
+            for tag in tags:
+                self._tag_index.remove((project_id, tag), position)
+            if not record.archived:
+                discount(self._live_tag_counts[project_id], tags)
+        if affects(fields, TESTCASE_AUTHOR_FIELDS) and not record.archived:
+            discount(self._live_author_counts[project_id], [record.author])
+        if affects(fields, TESTCASE_ARCHIVED_FIELDS) and record.archived:
+            discount(self._archived_counts, [project_id])
+        search_index = self._search_indexes.get(project_id)
+        if search_index is not None and affects(fields, TESTCASE_SEARCH_FIELDS):
+            search_index.remove(record.id)
+
+
+class MemoryArchiveJobRepository(ArchiveJobRepository):
+    def __init__(self):
+        self._jobs: Dict[str, ArchiveJobModel] = {}
+
+    def get(self, project_id: str) -> Optional[ArchiveJobModel]:
+        return self._jobs.get(project_id)
+
+    def save(self, job: ArchiveJobModel):
+        self._jobs[str(job.project_id)] = job
+
+
+def read_history(
+        rollups: Rollups,
+        key: Hashable,
+        granularity: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        limit: int) -> List[ResultBucketModel]:
+    buckets = rollups.window(
+        key,
+        granularity,
+        None if since is None else pack_result_time(since),
+        None if until is None else pack_result_time(until),
+        limit
+    )
+    return [materialize_bucket(start, counts) for start, counts in buckets]
+
+
+class MemoryTestRunRepository(TestRunRepository):
+    def __init__(self):
+        self._runs: List[TestRunResponseModel] = []
+        self._positions: Dict[str, int] = {}
+        self._project_runs = SecondaryIndex()
+        self._run_projects: List[str] = []
+        self._run_results: List[array] = []
+        self._run_counts: List[List[int]] = []
+        self._run_finished: List[Optional[int]] = []
+        self._log = ResultLog()
+        self._latest: Dict[int, int] = {}
+        self._latest_index = SecondaryIndex()
+        self._testcase_rollups = Rollups()
+        self._project_rollups = Rollups()
+
+    def add(self, run: TestRunResponseModel):
+        run_id = str(run.id)
+        position = len(self._runs)
+        self._runs.append(run)
+        self._positions[run_id] = position
+        self._run_projects.append(sys.intern(str(run.project_id)))
+        self._project_runs.add(self._run_projects[position], position)
+        self._run_results.append(array("Q"))
+        self._run_counts.append([0] * len(RESULT_STATUSES))
+        self._run_finished.append(None)
+        self._log.run_ids.append(run_id)
+
+    def get(self, run_id: str) -> Optional[TestRunResponseModel]:
+        position = self._positions.get(run_id)
+        if position is None:
+            return None
+        return self._materialize_run(position)
+
+    def find_by_project(self, project_id: str, cursor: Optional[int], limit: int) -> TestRunPage:
+        positions = self._project_runs.page(project_id, cursor, limit + 1)
+        next_cursor = positions[limit - 1] if len(positions) > limit else None
+        return [self._materialize_run(position) for position in positions[:limit]], next_cursor
+
+    def append_results(self, run_id: str, results: Iterable[TestResultResponseModel]):
+        rows = [
+            (
+                str(result.testcase_id),
+                STATUS_CODES[result.status],
+                result.duration_ms,
+                result.output,
+                pack_result_time(result.finished_at)
+            )
+            for result in results
+        ]
+        self._append_rows(self._positions[run_id], rows)
+
+    def results(self, run_id: str, cursor: Optional[int], limit: int) -> TestResultPage:
+        position = self._positions.get(run_id)
+        if position is None:
+            return [], None
+        positions = self._run_results[position]
+        start = 0 if cursor is None else bisect_right(positions, cursor)
+        page = positions[start:start + limit]
+        next_cursor = page[-1] if start + limit < len(positions) else None
+        return [self._log.materialize(result) for result in page], next_cursor
+
+    def latest(self, testcase_id: str) -> Optional[TestResultResponseModel]:
+        key = self._log.testcase_keys.get(testcase_id)
+        if key is None or key not in self._latest:
+            return None
+        return self._log.materialize(self._latest[key])
+
+    def latest_by_project(
+            self,
+            project_id: str,
+            cursor: Optional[int],
+            limit: int,
+            status: Optional[str] = None) -> TestResultPage:
+        key = project_id if status is None else (project_id, STATUS_CODES[status])
+        positions = self._latest_index.page(key, cursor, limit + 1)
+        next_cursor = positions[limit - 1] if len(positions) > limit else None
+        return [self._log.materialize(result) for result in positions[:limit]], next_cursor
+
+    def testcase_history(
+            self,
+            testcase_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        key = self._log.testcase_keys.get(testcase_id)
+        if key is None:
+            return []
+        return read_history(self._testcase_rollups, key, granularity, since, until, limit)
+
+    def project_history(
+            self,
+            project_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        return read_history(self._project_rollups, project_id, granularity, since, until, limit)
+
+    def count_results(self) -> int:
+        return len(self._log)
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def _append_rows(self, position: int, rows: List[tuple]):
+        check_result_rows(rows)
+        for testcase_id, status, duration_ms, output, finished_at in rows:
+            self._append(position, testcase_id, status, duration_ms, output, finished_at)
+
+    def _append(
+            self,
+            position: int,
+            testcase_id: str,
+            status: int,
+            duration_ms: int,
+            output: Optional[str],
+            finished_at: int):
+        log = self._log
+        testcase = log.testcase_key(testcase_id)
+        result = log.append(position, testcase, status, duration_ms, output, finished_at)
+        self._run_results[position].append(result)
+        self._run_counts[position][status] += 1
+        project_id = self._run_projects[position]
+        self._testcase_rollups.add(testcase, finished_at, status)
+        self._project_rollups.add(project_id, finished_at, status)
+        last_finished = self._run_finished[position]
+        if last_finished is None or last_finished < finished_at:
+            self._run_finished[position] = finished_at
+        previous = self._latest.get(testcase)
+        if previous is not None and log.finished_at[previous] > finished_at:
+            return
+        if previous is not None:
+            self._latest_index.remove(project_id, previous)
+            self._latest_index.remove((project_id, log.statuses[previous]), previous)
+        self._latest[testcase] = result
+        self._latest_index.add(project_id, result)
+        self._latest_index.add((project_id, status), result)
+
+    def _materialize_run(self, position: int) -> TestRunResponseModel:
+        run = self._runs[position]
+        counts = self._run_counts[position]
+        last_finished = self._run_finished[position]
+        return TestRunResponseModel.construct(
+            project_id=run.project_id,
+            id=run.id,
+            name=run.name,
+            environment=run.environment,
+            created_at=run.created_at,
+            total=sum(counts),
+            statuses={status: count for status, count in zip(RESULT_STATUSES, counts) if count},
+            last_finished_at=None if last_finished is None else unpack_time(last_finished)
+        )
+
+
+def create_memory_storage() -> Storage:
+    feed = MemoryChangeFeed()
+    return Storage(
+        projects=MemoryProjectRepository(feed),
+        testcases=MemoryTestCaseRepository(feed),
+        jobs=MemoryArchiveJobRepository(),
+        feed=feed,
+        runs=MemoryTestRunRepository()
+    )
@@ -0,0 +1,170 @@
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+from models.runs import MAX_DURATION_MS, RESULT_STATUSES, TestResultResponseModel
+from models.testcase import TestCaseResponseModel
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+Timestamp = Union[int, datetime]
+
+
+def pack_time(moment: datetime) -> Timestamp:
+    if moment.tzinfo is not None:
+        return moment
+    return (moment - EPOCH) // MICROSECOND
+
+
+def unpack_time(moment: Timestamp) -> datetime:
+    if isinstance(moment, datetime):
+        return moment
+    return EPOCH + timedelta(microseconds=moment)
+
+
+STATUS_CODES = {status: code for code, status in enumerate(RESULT_STATUSES)}
+
+
+def pack_result_time(moment: datetime) -> int:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - EPOCH) // MICROSECOND
+
+
+class TestCaseRecord:
+    __slots__ = (
+        "id",
+        "project_id",
+        "title",
+        "description",
+        "author",
+        "tags",
+        "expected_results",
+        "created_at",
+        "updated_at",
+        "updated_by",
+        "archived"
+    )
+
+    def __init__(
+            self,
+            testcase_id: str,
+            project_id: str,
+            title: str,
+            description: str,
+            author: str,
+            tags: Optional[Tuple[str, ...]],
+            expected_results: str,
+            created_at: Timestamp,
+            updated_at: Timestamp,
+            updated_by: str,
+            archived: bool):
+        self.id = testcase_id
+        self.project_id = project_id
+        self.title = title
+        self.description = description
+        self.author = author
+        self.tags = tags
+        self.expected_results = expected_results
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.updated_by = updated_by
+        self.archived = archived
+
+
+def compact_testcase(
+        testcase: TestCaseResponseModel,
+        testcase_id: str,
+        tags: Optional[Tuple[str, ...]]) -> TestCaseRecord:
+    return TestCaseRecord(
+        testcase_id,
+        sys.intern(str(testcase.project_id)),
+        testcase.title,
+        testcase.description,
+        sys.intern(testcase.author),
+        tags,
+        testcase.expected_results,
+        pack_time(testcase.created_at),
+        pack_time(testcase.updated_at),
+        sys.intern(testcase.updated_by),
+        testcase.archived
+    )
+
+
+def materialize_testcase(record: TestCaseRecord) -> TestCaseResponseModel:
+    return TestCaseResponseModel.construct(
+        title=record.title,
+        description=record.description,
+        author=record.author,
+        tags=None if record.tags is None else list(record.tags),
+        expected_results=record.expected_results,
+        project_id=UUID(record.project_id),
+        id=UUID(record.id),
+        created_at=unpack_time(record.created_at),
+        updated_at=unpack_time(record.updated_at),
+        updated_by=record.updated_by,
+        archived=record.archived
+    )
+
+
+def check_result_rows(rows: Sequence[Sequence]):
+    for row in rows:
+        if not 0 <= row[2] <= MAX_DURATION_MS:
+            raise ValueError(f"duration_ms {row[2]} is outside 0..{MAX_DURATION_MS}")
+
+
+class ResultLog:
+    def __init__(self):
+        self.runs = array("I")
+        self.testcases = array("I")
+        self.statuses = array("B")
+        self.durations = array("Q")
+        self.finished_at = array("q")
+        self.outputs: List[Optional[str]] = []
+        self.run_ids: List[str] = []
+        self.testcase_ids: List[str] = []
+        self.testcase_keys: Dict[str, int] = {}
+
+    def testcase_key(self, testcase_id: str) -> int:
+        key = self.testcase_keys.get(testcase_id)
+        if key is None:
+            key = self.testcase_keys[testcase_id] = len(self.testcase_ids)
+            self.testcase_ids.append(testcase_id)
+        return key
+
+    def append(
+            self,
+            run: int,
+            testcase: int,
+            status: int,
+            duration_ms: int,
+            output: Optional[str],
+            finished_at: int) -> int:
+        position = len(self.outputs)
+        try:
+            self.runs.append(run)
+            self.testcases.append(testcase)
+            self.statuses.append(status)
+            self.durations.append(duration_ms)
+            self.finished_at.append(finished_at)
+        except (OverflowError, TypeError):
+            for column in (self.runs, self.testcases, self.statuses, self.durations, self.finished_at):
+                del column[position:]
+            raise
+        self.outputs.append(output)
+        return position
+
+    def materialize(self, position: int) -> TestResultResponseModel:
+        return TestResultResponseModel.construct(
+            run_id=UUID(self.run_ids[self.runs[position]]),
+            testcase_id=UUID(self.testcase_ids[self.testcases[position]]),
+            status=RESULT_STATUSES[self.statuses[position]],
+            duration_ms=self.durations[position],
+            output=self.outputs[position],
+            finished_at=unpack_time(self.finished_at[position])
+        )
+
+    def __len__(self) -> int:
+        return len(self.outputs)
@@ -0,0 +1,82 @@
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+from models.runs import RESULT_STATUSES, ResultBucketModel
+from storage.records import unpack_time
+
+HOUR = 3600 * 10 ** 6
+GRANULARITIES = {"hour": HOUR, "day": 24 * HOUR, "week": 7 * 24 * HOUR}
+WEEK_ORIGIN = -3 * 24 * HOUR
+EMPTY_COUNTS = array("I", [0] * len(RESULT_STATUSES))
+Bucket = Tuple[int, List[int]]
+
+
+def bucket_start(moment: int, granularity: str) -> int:
+    width = GRANULARITIES[granularity]
+    origin = WEEK_ORIGIN if granularity == "week" else 0
+    return moment - (moment - origin) % width
+
+
+class BucketSeries:
+    __slots__ = ("starts", "slots", "counts")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.slots: Dict[int, int] = {}
+        self.counts = array("I")
+
+    def add(self, start: int, status: int):
+        slot = self.slots.get(start)
+        if slot is None:
+            slot = self.slots[start] = len(self.counts)
+            self.counts.extend(EMPTY_COUNTS)
+            if not self.starts or self.starts[-1] < start:
+                self.starts.append(start)
+            else:
+                insort(self.starts, start)
+        self.counts[slot + status] += 1
+
+    def window(self, since: Optional[int], until: Optional[int], limit: int) -> List[Bucket]:
+        first = 0 if since is None else bisect_left(self.starts, since)
+        last = len(self.starts) if until is None else bisect_left(self.starts, until)
+        first = max(first, last - limit)
+        width = len(EMPTY_COUNTS)
+        return [
+            (start, self.counts[self.slots[start]:self.slots[start] + width].tolist())
+            for start in self.starts[first:last]
+        ]
+
+
+class Rollups:
+    def __init__(self):
+        self._series: Dict[Tuple[Hashable, str], BucketSeries] = {}
+
+    def add(self, key: Hashable, moment: int, status: int):
+        for granularity in GRANULARITIES:
+            series = self._series.get((key, granularity))
+            if series is None:
+                series = self._series[(key, granularity)] = BucketSeries()
+            series.add(bucket_start(moment, granularity), status)
+
+    def window(
+            self,
+            key: Hashable,
+            granularity: str,
+            since: Optional[int],
+            until: Optional[int],
+            limit: int) -> List[Bucket]:
+        series = self._series.get((key, granularity))
+        if series is None:
+            return []
+        return series.window(None if since is None else bucket_start(since, granularity), until, limit)
+
+
+def materialize_bucket(start: int, counts: Sequence[int]) -> ResultBucketModel:
+    statuses = dict(zip(RESULT_STATUSES, counts))
+    executed = statuses["passed"] + statuses["failed"] + statuses["error"]
+    return ResultBucketModel.construct(
+        start=unpack_time(start),
+        total=sum(counts),
+        statuses={status: count for status, count in statuses.items() if count},
+        pass_rate=statuses["passed"] / executed if executed else None
+    )
@@ -0,0 +1,74 @@
+import heapq
+import math
+import re
+import sys
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+TITLE_WEIGHT = 2
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._vocabulary: List[str] = []
+        self._documents: Dict[str, Tuple[str, ...]] = {}
+
+    def add(self, document_id: str, title: str, *fields: str):
+        terms = Counter(map(sys.intern, tokenize(title) * TITLE_WEIGHT))
+        for field in fields:
+            terms.update(map(sys.intern, tokenize(field)))
+        self._documents[document_id] = tuple(terms)
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[document_id] = frequency
+
+    def remove(self, document_id: str):
+        terms = self._documents.pop(document_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[document_id]
+            if not postings:
+                del self._postings[term]
+                del self._vocabulary[bisect_left(self._vocabulary, term)]
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        scores: Dict[str, float] = {}
+        for position, prefix in enumerate(dict.fromkeys(tokenize(query))):
+            term_scores = self._score_prefix(prefix)
+            if position == 0:
+                scores = term_scores
+            else:
+                scores = {
+                    document_id: score + term_scores[document_id]
+                    for document_id, score in scores.items()
+                    if document_id in term_scores
+                }
+            if not scores:
+                break
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+    def _score_prefix(self, prefix: str) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        index = bisect_left(self._vocabulary, prefix)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(prefix):
+            postings = self._postings[self._vocabulary[index]]
+            weight = math.log(1 + len(self._documents) / len(postings))
+            for document_id, frequency in postings.items():
+                scores[document_id] = scores.get(document_id, 0.0) + frequency * weight
+            index += 1
+        return scores
+
+    def __len__(self) -> int:
+        return len(self._documents)
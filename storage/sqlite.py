@@ -0,0 +1,968 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from queue import Queue
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
+from models.jobs import ArchiveJobModel
+from models.projects import ProjectResponseModel
+from models.runs import RESULT_STATUSES, ResultBucketModel, TestResultResponseModel, TestRunResponseModel
+from models.stats import ProjectStatsResponseModel
+from models.testcase import TestCaseResponseModel
+from storage.base import (
+    PROJECT_TAG_FIELDS, TESTCASE_SEARCH_FIELDS, TESTCASE_TAG_FIELDS, ArchiveJobRepository, Change,
+    ChangeFeedRepository, ChangeSet, FeedEntry, Fields, ProjectPage, ProjectRepository, Storage, TestCasePage,
+    TestCaseRepository, TestResultPage, TestRunPage, TestRunRepository, affects
+)
+from storage.records import STATUS_CODES, check_result_rows, pack_result_time, unpack_time
+from storage.rollups import GRANULARITIES, WEEK_ORIGIN, bucket_start, materialize_bucket
+from storage.search import tokenize
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    description TEXT,
+    owner TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    active INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS projects_owner ON projects (owner, seq);
+CREATE INDEX IF NOT EXISTS projects_active ON projects (active, seq);
+
+CREATE TABLE IF NOT EXISTS project_tags (
+    project_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    active INTEGER NOT NULL,
+    PRIMARY KEY (project_id, tag)
+);
+CREATE INDEX IF NOT EXISTS project_tags_tag ON project_tags (tag, project_id);
+CREATE INDEX IF NOT EXISTS project_tags_active ON project_tags (active, tag);
+
+CREATE TABLE IF NOT EXISTS testcases (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    project_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    author TEXT NOT NULL,
+    tags TEXT,
+    expected_results TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    updated_by TEXT NOT NULL,
+    archived INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS testcases_project_id ON testcases (project_id, seq);
+CREATE INDEX IF NOT EXISTS testcases_archived ON testcases (archived);
+
+CREATE TABLE IF NOT EXISTS testcase_tags (
+    testcase_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    archived INTEGER NOT NULL,
+    PRIMARY KEY (testcase_id, tag)
+);
+CREATE INDEX IF NOT EXISTS testcase_tags_tag ON testcase_tags (project_id, tag, testcase_id);
+CREATE INDEX IF NOT EXISTS testcase_tags_archived ON testcase_tags (project_id, archived, tag);
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    record_id TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS feed (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    UNIQUE (kind, record_id)
+);
+
+CREATE TABLE IF NOT EXISTS feed_epoch (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    epoch TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS archive_jobs (
+    project_id TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS testcase_stats (
+    project_id TEXT PRIMARY KEY,
+    total INTEGER NOT NULL,
+    archived INTEGER NOT NULL,
+    last_updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS testcase_author_stats (
+    project_id TEXT NOT NULL,
+    author TEXT NOT NULL,
+    live INTEGER NOT NULL,
+    PRIMARY KEY (project_id, author)
+);
+
+CREATE TABLE IF NOT EXISTS testcase_tag_stats (
+    project_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    live INTEGER NOT NULL,
+    PRIMARY KEY (project_id, tag)
+);
+
+CREATE TRIGGER IF NOT EXISTS testcases_count_insert AFTER INSERT ON testcases BEGIN
+    INSERT INTO testcase_stats (project_id, total, archived, last_updated_at)
+    VALUES (NEW.project_id, 1, NEW.archived, NEW.updated_at)
+    ON CONFLICT (project_id) DO UPDATE SET
+        total = total + 1,
+        archived = archived + excluded.archived,
+        last_updated_at = MAX(last_updated_at, excluded.last_updated_at);
+    INSERT INTO testcase_author_stats (project_id, author, live) VALUES (NEW.project_id, NEW.author, 1 - NEW.archived)
+    ON CONFLICT (project_id, author) DO UPDATE SET live = live + excluded.live;
+END;
+
+CREATE TRIGGER IF NOT EXISTS testcases_count_update AFTER UPDATE ON testcases BEGIN
+    UPDATE testcase_stats SET total = total - 1, archived = archived - OLD.archived
+    WHERE project_id = OLD.project_id;
+    UPDATE testcase_author_stats SET live = live - (1 - OLD.archived)
+    WHERE project_id = OLD.project_id AND author = OLD.author;
+    INSERT INTO testcase_stats (project_id, total, archived, last_updated_at)
+    VALUES (NEW.project_id, 1, NEW.archived, NEW.updated_at)
+    ON CONFLICT (project_id) DO UPDATE SET
+        total = total + 1,
+        archived = archived + excluded.archived,
+        last_updated_at = MAX(last_updated_at, excluded.last_updated_at);
+    INSERT INTO testcase_author_stats (project_id, author, live) VALUES (NEW.project_id, NEW.author, 1 - NEW.archived)
+    ON CONFLICT (project_id, author) DO UPDATE SET live = live + excluded.live;
+END;
+
+CREATE TRIGGER IF NOT EXISTS testcase_tags_count_insert AFTER INSERT ON testcase_tags BEGIN
+    INSERT INTO testcase_tag_stats (project_id, tag, live) VALUES (NEW.project_id, NEW.tag, 1 - NEW.archived)
+    ON CONFLICT (project_id, tag) DO UPDATE SET live = live + excluded.live;
+END;
+
+CREATE TRIGGER IF NOT EXISTS testcase_tags_count_delete AFTER DELETE ON testcase_tags BEGIN
+    UPDATE testcase_tag_stats SET live = live - (1 - OLD.archived)
+    WHERE project_id = OLD.project_id AND tag = OLD.tag;
+END;
+
+CREATE TABLE IF NOT EXISTS test_runs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    project_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    environment TEXT,
+    created_at TEXT NOT NULL,
+    passed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    error INTEGER NOT NULL DEFAULT 0,
+    last_finished_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS test_runs_project_id ON test_runs (project_id, seq);
+
+CREATE TABLE IF NOT EXISTS test_results (
+    seq INTEGER PRIMARY KEY,
+    run_seq INTEGER NOT NULL,
+    testcase_id TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    output TEXT,
+    finished_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_results_run_seq ON test_results (run_seq, seq);
+
+CREATE TABLE IF NOT EXISTS latest_results (
+    testcase_id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    result_seq INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    finished_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS latest_results_project_id ON latest_results (project_id, result_seq);
+CREATE INDEX IF NOT EXISTS latest_results_status ON latest_results (project_id, status, result_seq);
+
+CREATE TABLE IF NOT EXISTS result_rollups (
+    scope TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket_start INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    error INTEGER NOT NULL,
+    PRIMARY KEY (scope, record_id, granularity, bucket_start)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS testcase_search USING fts5 (
+    title, description, expected_results, project_id, prefix = '2 3'
+);
+"""
+
+INSERT_PROJECT = (
+    "INSERT INTO projects (title, description, owner, tags, created_at, updated_at, active, id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+PROJECT_COLUMNS = ("title", "description", "owner", "tags", "created_at", "updated_at", "active")
+SELECT_PROJECT = "SELECT * FROM projects WHERE id = ?"
+COUNT_PROJECTS = "SELECT COUNT(*) FROM projects"
+DELETE_PROJECT_TAGS = "DELETE FROM project_tags WHERE project_id = ?"
+INSERT_PROJECT_TAG = "INSERT OR IGNORE INTO project_tags (project_id, tag, active) VALUES (?, ?, ?)"
+COUNT_PROJECT_TAGS = "SELECT tag, COUNT(*) FROM project_tags WHERE active = 1 GROUP BY tag"
+
+INSERT_TESTCASE = (
+    "INSERT INTO testcases (project_id, title, description, author, tags, expected_results, created_at, "
+    "updated_at, updated_by, archived, id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+TESTCASE_COLUMNS = (
+    "project_id", "title", "description", "author", "tags", "expected_results", "created_at", "updated_at",
+    "updated_by", "archived"
+)
+SELECT_TESTCASE = "SELECT * FROM testcases WHERE id = ?"
+SELECT_TESTCASES_BY_ID = "SELECT * FROM testcases WHERE id IN"
+DELETE_TESTCASE_TAGS = "DELETE FROM testcase_tags WHERE testcase_id = ?"
+INSERT_TESTCASE_TAG = (
+    "INSERT OR IGNORE INTO testcase_tags (testcase_id, project_id, tag, archived) VALUES (?, ?, ?, ?)"
+)
+COUNT_TESTCASE_TAGS = "SELECT tag, live FROM testcase_tag_stats WHERE project_id = ? AND live > 0"
+COUNT_TESTCASE_AUTHORS = "SELECT author, live FROM testcase_author_stats WHERE project_id = ? AND live > 0"
+SELECT_TESTCASE_STATS = "SELECT total, archived, last_updated_at FROM testcase_stats WHERE project_id = ?"
+COUNT_TESTCASES = "SELECT COUNT(*) FROM testcases"
+COUNT_TESTCASES_BY_PROJECT = "SELECT COUNT(*) FROM testcases WHERE project_id = ?"
+DELETE_TESTCASE_SEARCH = "DELETE FROM testcase_search WHERE rowid = (SELECT seq FROM testcases WHERE id = ?)"
+INSERT_TESTCASE_SEARCH = (
+    "INSERT INTO testcase_search (rowid, title, description, expected_results, project_id) "
+    "SELECT seq, title, description, expected_results, project_id FROM testcases WHERE id = ? AND archived = 0"
+)
+SEARCH_TESTCASES = (
+    "SELECT testcases.* FROM testcase_search JOIN testcases ON testcases.seq = testcase_search.rowid "
+    "WHERE testcase_search MATCH ? ORDER BY bm25(testcase_search, 2.0, 1.0, 1.0, 0.0) LIMIT ?"
+)
+NEEDS_STATS_BACKFILL = "SELECT EXISTS (SELECT 1 FROM testcases) AND NOT EXISTS (SELECT 1 FROM testcase_stats)"
+BACKFILL_STATS = (
+    "INSERT INTO testcase_stats (project_id, total, archived, last_updated_at) "
+    "SELECT project_id, COUNT(*), SUM(archived), MAX(updated_at) FROM testcases GROUP BY project_id",
+    "INSERT INTO testcase_author_stats (project_id, author, live) "
+    "SELECT project_id, author, SUM(1 - archived) FROM testcases GROUP BY project_id, author",
+    "INSERT INTO testcase_tag_stats (project_id, tag, live) "
+    "SELECT project_id, tag, SUM(1 - archived) FROM testcase_tags GROUP BY project_id, tag",
+)
+
+INSERT_CHANGE = "INSERT INTO changes (kind, record_id) VALUES (?, ?)"
+PRUNE_CHANGES = "DELETE FROM changes WHERE seq <= (SELECT MAX(seq) FROM changes) - ?"
+SELECT_CHANGES = "SELECT seq, kind, record_id FROM changes WHERE seq > ? ORDER BY seq"
+SELECT_CHANGE_BOUNDS = "SELECT COALESCE(MIN(seq), 0), COALESCE(MAX(seq), 0) FROM changes"
+CHANGE_RETENTION = 100000
+
+UPSERT_FEED = "INSERT OR REPLACE INTO feed (kind, record_id) VALUES (?, ?)"
+SELECT_FEED = "SELECT seq, kind, record_id FROM feed WHERE seq > ? ORDER BY seq LIMIT ?"
+SELECT_FEED_LAST_SEQ = "SELECT COALESCE(MAX(seq), 0) FROM feed"
+INSERT_FEED_EPOCH = "INSERT OR IGNORE INTO feed_epoch (id, epoch) VALUES (1, ?)"
+SELECT_FEED_EPOCH = "SELECT epoch FROM feed_epoch WHERE id = 1"
+NEEDS_FEED_BACKFILL = (
+    "SELECT (EXISTS (SELECT 1 FROM projects) OR EXISTS (SELECT 1 FROM testcases)) "
+    "AND NOT EXISTS (SELECT 1 FROM feed)"
+)
+BACKFILL_FEED = (
+    "INSERT INTO feed (kind, record_id) SELECT 'project', id FROM projects ORDER BY seq",
+    "INSERT INTO feed (kind, record_id) SELECT 'testcase', id FROM testcases ORDER BY seq",
+)
+
+SELECT_ARCHIVE_JOB = "SELECT body FROM archive_jobs WHERE project_id = ?"
+UPSERT_ARCHIVE_JOB = (
+    "INSERT INTO archive_jobs (project_id, body) VALUES (?, ?) "
+    "ON CONFLICT (project_id) DO UPDATE SET body = excluded.body"
+)
+
+INSERT_TESTRUN = "INSERT INTO test_runs (id, project_id, name, environment, created_at) VALUES (?, ?, ?, ?, ?)"
+SELECT_TESTRUN = "SELECT * FROM test_runs WHERE id = ?"
+SELECT_TESTRUNS_BY_PROJECT = "SELECT * FROM test_runs WHERE project_id = ? AND seq > ? ORDER BY seq LIMIT ?"
+SELECT_TESTRUN_SCOPE = "SELECT seq, project_id FROM test_runs WHERE id = ?"
+COUNT_TESTRUNS = "SELECT COUNT(*) FROM test_runs"
+UPDATE_TESTRUN_COUNTS = (
+    "UPDATE test_runs SET passed = passed + ?, failed = failed + ?, skipped = skipped + ?, error = error + ?, "
+    "last_finished_at = MAX(COALESCE(last_finished_at, ?), ?) WHERE seq = ?"
+)
+SELECT_NEXT_RESULT_SEQ = "SELECT COALESCE(MAX(seq), -1) + 1 FROM test_results"
+INSERT_TESTRESULT = (
+    "INSERT INTO test_results (seq, run_seq, testcase_id, status, duration_ms, output, finished_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_LATEST_RESULT = (
+    "INSERT INTO latest_results (testcase_id, project_id, result_seq, status, finished_at) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (testcase_id) DO UPDATE SET project_id = excluded.project_id, result_seq = excluded.result_seq, "
+    "status = excluded.status, finished_at = excluded.finished_at "
+    "WHERE excluded.finished_at >= latest_results.finished_at"
+)
+SELECT_TESTRESULTS = (
+    "SELECT seq, testcase_id, status, duration_ms, output, finished_at FROM test_results "
+    "WHERE run_seq = ? AND seq > ? ORDER BY seq LIMIT ?"
+)
+SELECT_LATEST_RESULTS = (
+    "SELECT test_results.seq, test_runs.id AS run_id, test_results.testcase_id, test_results.status, "
+    "test_results.duration_ms, test_results.output, test_results.finished_at FROM latest_results "
+    "JOIN test_results ON test_results.seq = latest_results.result_seq "
+    "JOIN test_runs ON test_runs.seq = test_results.run_seq WHERE"
+)
+COUNT_TESTRESULTS = "SELECT COALESCE(MAX(seq) + 1, 0) FROM test_results"
+UPSERT_ROLLUP = (
+    "INSERT INTO result_rollups (scope, record_id, granularity, bucket_start, passed, failed, skipped, error) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (scope, record_id, granularity, bucket_start) DO UPDATE SET "
+    "passed = passed + excluded.passed, failed = failed + excluded.failed, skipped = skipped + excluded.skipped, "
+    "error = error + excluded.error"
+)
+SELECT_ROLLUPS = (
+    "SELECT bucket_start, passed, failed, skipped, error FROM result_rollups "
+    "WHERE scope = ? AND record_id = ? AND granularity = ? AND bucket_start >= ? AND bucket_start < ? "
+    "ORDER BY bucket_start DESC LIMIT ?"
+)
+MIN_BUCKET = -2 ** 63
+MAX_BUCKET = 2 ** 63 - 1
+ROLLUP_SOURCES = {
+    "testcase": ("testcase_id", "test_results"),
+    "project": ("test_runs.project_id", "test_results JOIN test_runs ON test_runs.seq = test_results.run_seq"),
+}
+NEEDS_ROLLUP_BACKFILL = "SELECT EXISTS (SELECT 1 FROM test_results) AND NOT EXISTS (SELECT 1 FROM result_rollups)"
+BACKFILL_ROLLUPS = tuple(
+    "INSERT INTO result_rollups (scope, record_id, granularity, bucket_start, passed, failed, skipped, error) "
+    f"SELECT '{scope}', {column}, '{granularity}', "
+    f"finished_at - (finished_at - ({WEEK_ORIGIN if granularity == 'week' else 0})) % {width} AS bucket_start, "
+    "SUM(status = 0), SUM(status = 1), SUM(status = 2), SUM(status = 3) "
+    f"FROM {source} GROUP BY {column}, bucket_start"
+    for scope, (column, source) in ROLLUP_SOURCES.items()
+    for granularity, width in GRANULARITIES.items()
+)
+
+
+class ConnectionPool:
+    def __init__(self, path: str, size: int):
+        self._path = path
+        self._connections: Queue = Queue(maxsize=size)
+        for _ in range(size):
+            self._connections.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, timeout=30, check_same_thread=False, cached_statements=256)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        while not self._connections.empty():
+            self._connections.get().close()
+
+
+def updated_columns(columns: Tuple[str, ...], fields: Fields) -> Tuple[int, ...]:
+    if fields is None:
+        return tuple(range(len(columns)))
+    return tuple(index for index, column in enumerate(columns) if column in fields) or tuple(range(len(columns)))
+
+
+def update_statement(table: str, columns: Tuple[str, ...], updated: Tuple[int, ...], checked: bool) -> str:
+    assignments = ", ".join(f"{columns[index]} = ?" for index in updated)
+    return f"UPDATE {table} SET {assignments} WHERE id = ?" + (" AND updated_at = ?" if checked else "")
+
+
+def update_parameters(row: tuple, updated: Tuple[int, ...], expected_updated_at: Optional[datetime] = None) -> list:
+    parameters = [row[index] for index in updated]
+    parameters.append(row[-1])
+    if expected_updated_at is not None:
+        parameters.append(expected_updated_at.isoformat())
+    return parameters
+
+
+def project_to_row(project: ProjectResponseModel) -> tuple:
+    return (
+        project.title,
+        project.description,
+        project.owner,
+        json.dumps(project.tags),
+        project.created_at.isoformat(),
+        project.updated_at.isoformat(),
+        int(project.active),
+        str(project.id)
+    )
+
+
+def project_from_row(row: sqlite3.Row) -> ProjectResponseModel:
+    return ProjectResponseModel(
+        id=row['id'],
+        title=row['title'],
+        description=row['description'],
+        owner=row['owner'],
+        tags=json.loads(row['tags']),
+        created_at=row['created_at'],
+        updated_at=row['updated_at'],
+        active=bool(row['active'])
+    )
+
+
+def testcase_to_row(testcase: TestCaseResponseModel) -> tuple:
+    return (
+        str(testcase.project_id),
+        testcase.title,
+        testcase.description,
+        testcase.author,
+        json.dumps(testcase.tags),
+        testcase.expected_results,
+        testcase.created_at.isoformat(),
+        testcase.updated_at.isoformat(),
+        testcase.updated_by,
+        int(testcase.archived),
+        str(testcase.id)
+    )
+
+
+def testcase_from_row(row: sqlite3.Row) -> TestCaseResponseModel:
+    return TestCaseResponseModel(
+        project_id=row['project_id'],
+        id=row['id'],
+        title=row['title'],
+        description=row['description'],
+        author=row['author'],
+        tags=json.loads(row['tags']),
+        expected_results=row['expected_results'],
+        created_at=row['created_at'],
+        updated_at=row['updated_at'],
+        updated_by=row['updated_by'],
+        archived=bool(row['archived'])
+    )
+
+
+def testrun_from_row(row: sqlite3.Row) -> TestRunResponseModel:
+    counts = [row[status] for status in RESULT_STATUSES]
+    return TestRunResponseModel(
+        project_id=row['project_id'],
+        id=row['id'],
+        name=row['name'],
+        environment=row['environment'],
+        created_at=row['created_at'],
+        total=sum(counts),
+        statuses={status: count for status, count in zip(RESULT_STATUSES, counts) if count},
+        last_finished_at=None if row['last_finished_at'] is None else unpack_time(row['last_finished_at'])
+    )
+
+
+def testresult_from_row(row: sqlite3.Row, run_id: Optional[str] = None) -> TestResultResponseModel:
+    return TestResultResponseModel(
+        run_id=run_id or row['run_id'],
+        testcase_id=row['testcase_id'],
+        status=RESULT_STATUSES[row['status']],
+        duration_ms=row['duration_ms'],
+        output=row['output'],
+        finished_at=unpack_time(row['finished_at'])
+    )
+
+
+def rollup_rows(project_id: str, rows: List[tuple]) -> Dict[tuple, List[int]]:
+    rollups: Dict[tuple, List[int]] = {}
+    for testcase_id, status, _, _, finished_at in rows:
+        for granularity in GRANULARITIES:
+            start = bucket_start(finished_at, granularity)
+            for key in (("testcase", testcase_id, granularity, start), ("project", project_id, granularity, start)):
+                counts = rollups.get(key)
+                if counts is None:
+                    counts = rollups[key] = [0] * len(RESULT_STATUSES)
+                counts[status] += 1
+    return rollups
+
+
+def backfill(connection: sqlite3.Connection):
+    with connection:
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute(INSERT_FEED_EPOCH, (uuid4().hex,))
+        backfills = (
+            (NEEDS_STATS_BACKFILL, BACKFILL_STATS),
+            (NEEDS_FEED_BACKFILL, BACKFILL_FEED),
+            (NEEDS_ROLLUP_BACKFILL, BACKFILL_ROLLUPS)
+        )
+        for needs_backfill, statements in backfills:
+            if connection.execute(needs_backfill).fetchone()[0]:
+                for statement in statements:
+                    connection.execute(statement)
+
+
+def record_changes(connection: sqlite3.Connection, kind: str, record_ids: List[str]):
+    connection.executemany(INSERT_CHANGE, ((kind, record_id) for record_id in record_ids))
+    connection.executemany(UPSERT_FEED, ((kind, record_id) for record_id in record_ids))
+    connection.execute(PRUNE_CHANGES, (CHANGE_RETENTION,))
+
+
+class ChangeListener:
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._data_version = self._read_data_version()
+        self._last_seq = self._connection.execute(SELECT_CHANGE_BOUNDS).fetchone()[1]
+
+    def _read_data_version(self) -> int:
+        return self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll(self) -> ChangeSet:
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            return ChangeSet(reset=False, changes=[])
+        self._data_version = data_version
+        first_seq, last_seq = self._connection.execute(SELECT_CHANGE_BOUNDS).fetchone()
+        reset = first_seq > self._last_seq + 1
+        rows = self._connection.execute(SELECT_CHANGES, (self._last_seq,)).fetchall()
+        self._last_seq = max(self._last_seq, last_seq)
+        return ChangeSet(reset=reset, changes=[Change(kind, record_id) for _, kind, record_id in rows])
+
+    def close(self):
+        self._connection.close()
+
+
+def project_tag_rows(project: ProjectResponseModel) -> List[tuple]:
+    return [(str(project.id), tag, int(project.active)) for tag in project.tags]
+
+
+def testcase_tag_rows(testcase: TestCaseResponseModel) -> List[tuple]:
+    return [
+        (str(testcase.id), str(testcase.project_id), tag, int(testcase.archived))
+        for tag in testcase.tags or []
+    ]
+
+
+def tag_clauses(
+        column: str,
+        subquery: str,
+        scope: list,
+        tags: List[str],
+        any_tags: List[str]) -> Tuple[List[str], list]:
+    clauses = []
+    parameters: list = []
+    for tag in tags:
+        clauses.append(f"{column} IN ({subquery} tag = ?)")
+        parameters.extend(scope + [tag])
+    if any_tags:
+        clauses.append(f"{column} IN ({subquery} tag IN ({', '.join('?' * len(any_tags))}))")
+        parameters.extend(scope + list(any_tags))
+    return clauses, parameters
+
+
+def search_expression(project_id: str, query: str) -> Optional[str]:
+    terms = " AND ".join(f'"{term}"*' for term in dict.fromkeys(tokenize(query)))
+    if not terms:
+        return None
+    project_phrase = project_id.replace('"', '""')
+    return f'project_id : "{project_phrase}" AND {{title description expected_results}} : ({terms})'
+
+
+class SqliteProjectRepository(ProjectRepository):
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+
+    def add(self, project: ProjectResponseModel):
+        with self._pool.connection() as connection, connection:
+            connection.execute(INSERT_PROJECT, project_to_row(project))
+            connection.executemany(INSERT_PROJECT_TAG, project_tag_rows(project))
+            record_changes(connection, "project", [str(project.id)])
+
+    def get(self, project_id: str) -> Optional[ProjectResponseModel]:
+        with self._pool.connection() as connection:
+            row = connection.execute(SELECT_PROJECT, (project_id,)).fetchone()
+        return project_from_row(row) if row else None
+
+    def save(
+            self,
+            project: ProjectResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        updated = updated_columns(PROJECT_COLUMNS, fields)
+        statement = update_statement("projects", PROJECT_COLUMNS, updated, expected_updated_at is not None)
+        with self._pool.connection() as connection, connection:
+            cursor = connection.execute(
+                statement, update_parameters(project_to_row(project), updated, expected_updated_at)
+            )
+            if not cursor.rowcount:
+                return False
+            if affects(fields, PROJECT_TAG_FIELDS):
+                connection.execute(DELETE_PROJECT_TAGS, (str(project.id),))
+                connection.executemany(INSERT_PROJECT_TAG, project_tag_rows(project))
+            record_changes(connection, "project", [str(project.id)])
+        return True
+
+    def find(
+            self,
+            cursor: Optional[int],
+            limit: int,
+            active: Optional[bool] = None,
+            owner: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            any_tags: Optional[List[str]] = None) -> ProjectPage:
+        clauses = ["seq > ?"]
+        parameters: list = [-1 if cursor is None else cursor]
+        if active is not None:
+            clauses.append("active = ?")
+            parameters.append(int(active))
+        if owner is not None:
+            clauses.append("owner = ?")
+            parameters.append(owner)
+        tag_filters, tag_parameters = tag_clauses(
+            "id", "SELECT project_id FROM project_tags WHERE", [], tags or [], any_tags or []
+        )
+        clauses.extend(tag_filters)
+        parameters.extend(tag_parameters)
+        parameters.append(limit + 1)
+        query = f"SELECT * FROM projects WHERE {' AND '.join(clauses)} ORDER BY seq LIMIT ?"
+        with self._pool.connection() as connection:
+            rows = connection.execute(query, parameters).fetchall()
+        next_cursor = rows[limit - 1]['seq'] if len(rows) > limit else None
+        return [project_from_row(row) for row in rows[:limit]], next_cursor
+
+    def tag_counts(self) -> Dict[str, int]:
+        with self._pool.connection() as connection:
+            return dict(connection.execute(COUNT_PROJECT_TAGS).fetchall())
+
+    def __len__(self) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute(COUNT_PROJECTS).fetchone()[0]
+
+
+class SqliteTestCaseRepository(TestCaseRepository):
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+
+    def add(self, testcase: TestCaseResponseModel):
+        self.add_many([testcase])
+
+    def add_many(self, testcases: Iterable[TestCaseResponseModel]):
+        testcases = list(testcases)
+        testcase_ids = [(str(testcase.id),) for testcase in testcases]
+        with self._pool.connection() as connection, connection:
+            connection.executemany(INSERT_TESTCASE, (testcase_to_row(testcase) for testcase in testcases))
+            connection.executemany(
+                INSERT_TESTCASE_TAG,
+                (row for testcase in testcases for row in testcase_tag_rows(testcase))
+            )
+            connection.executemany(INSERT_TESTCASE_SEARCH, testcase_ids)
+            record_changes(connection, "testcase", [testcase_id for testcase_id, in testcase_ids])
+
+    def get(self, testcase_id: str) -> Optional[TestCaseResponseModel]:
+        with self._pool.connection() as connection:
+            row = connection.execute(SELECT_TESTCASE, (testcase_id,)).fetchone()
+        return testcase_from_row(row) if row else None
+
+    def get_many(self, testcase_ids: Iterable[str]) -> List[TestCaseResponseModel]:
+        testcase_ids = list(testcase_ids)
+        if not testcase_ids:
+            return []
+        query = f"{SELECT_TESTCASES_BY_ID} ({', '.join('?' * len(testcase_ids))})"
+        with self._pool.connection() as connection:
+            rows = connection.execute(query, testcase_ids).fetchall()
+        return [testcase_from_row(row) for row in rows]
+
+    def save(
+            self,
+            testcase: TestCaseResponseModel,
+            fields: Fields = None,
+            expected_updated_at: Optional[datetime] = None) -> bool:
+        return self._update([testcase], fields, None if expected_updated_at is None else [expected_updated_at])
+
+    def save_many(
+            self,
+            testcases: Iterable[TestCaseResponseModel],
+            fields: Fields = None,
+            expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        return self._update(list(testcases), fields, expected_updated_at)
+
+    def _update(
+            self,
+            testcases: List[TestCaseResponseModel],
+            fields: Fields,
+            expected_updated_at: Optional[List[datetime]] = None) -> bool:
+        if not testcases:
+            return True
+        testcase_ids = [(str(testcase.id),) for testcase in testcases]
+        updated = updated_columns(TESTCASE_COLUMNS, fields)
+        statement = update_statement("testcases", TESTCASE_COLUMNS, updated, expected_updated_at is not None)
+        expected = expected_updated_at or [None] * len(testcases)
+        with self._pool.connection() as connection, connection:
+            cursor = connection.executemany(statement, (
+                update_parameters(testcase_to_row(testcase), updated, previous)
+                for testcase, previous in zip(testcases, expected)
+            ))
+            if expected_updated_at is not None and cursor.rowcount != len(testcases):
+                connection.rollback()
+                return False
+            if affects(fields, TESTCASE_TAG_FIELDS):
+                connection.executemany(DELETE_TESTCASE_TAGS, testcase_ids)
+                connection.executemany(
+                    INSERT_TESTCASE_TAG,
+                    (row for testcase in testcases for row in testcase_tag_rows(testcase))
+                )
+            if affects(fields, TESTCASE_SEARCH_FIELDS):
+                connection.executemany(DELETE_TESTCASE_SEARCH, testcase_ids)
+                connection.executemany(INSERT_TESTCASE_SEARCH, testcase_ids)
+            record_changes(connection, "testcase", [testcase_id for testcase_id, in testcase_ids])
+        return True
+
+    def find_by_project(
+            self,
+            project_id: str,
+            cursor: Optional[int],
+            limit: int,
+            tags: Optional[List[str]] = None,
+            any_tags: Optional[List[str]] = None) -> TestCasePage:
+        clauses, parameters = tag_clauses(
+            "id", "SELECT testcase_id FROM testcase_tags WHERE project_id = ? AND", [project_id], tags or [],
+            any_tags or []
+        )
+        query = " AND ".join(["project_id = ?", "seq > ?"] + clauses)
+        with self._pool.connection() as connection:
+            rows = connection.execute(
+                f"SELECT * FROM testcases WHERE {query} ORDER BY seq LIMIT ?",
+                [project_id, -1 if cursor is None else cursor] + parameters + [limit + 1]
+            ).fetchall()
+        next_cursor = rows[limit - 1]['seq'] if len(rows) > limit else None
+        return [testcase_from_row(row) for row in rows[:limit]], next_cursor
+
+    def search(self, project_id: str, query: str, limit: int) -> List[TestCaseResponseModel]:
+        expression = search_expression(project_id, query)
+        if expression is None:
+            return []
+        with self._pool.connection() as connection:
+            rows = connection.execute(SEARCH_TESTCASES, (expression, limit)).fetchall()
+        return [testcase_from_row(row) for row in rows]
+
+    def count_by_project(self, project_id: str) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute(COUNT_TESTCASES_BY_PROJECT, (project_id,)).fetchone()[0]
+
+    def tag_counts(self, project_id: str) -> Dict[str, int]:
+        with self._pool.connection() as connection:
+            return dict(connection.execute(COUNT_TESTCASE_TAGS, (project_id,)).fetchall())
+
+    def stats(self, project_id: str) -> ProjectStatsResponseModel:
+        with self._pool.connection() as connection:
+            row = connection.execute(SELECT_TESTCASE_STATS, (project_id,)).fetchone()
+            authors = dict(connection.execute(COUNT_TESTCASE_AUTHORS, (project_id,)).fetchall())
+            tags = dict(connection.execute(COUNT_TESTCASE_TAGS, (project_id,)).fetchall())
+        total, archived, last_updated_at = row if row else (0, 0, None)
+        return ProjectStatsResponseModel(
+            total=total,
+            active=total - archived,
+            archived=archived,
+            authors=authors,
+            tags=tags,
+            last_updated_at=last_updated_at
+        )
+
+    def __len__(self) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute(COUNT_TESTCASES).fetchone()[0]
+
+
+class SqliteArchiveJobRepository(ArchiveJobRepository):
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+
+    def get(self, project_id: str) -> Optional[ArchiveJobModel]:
+        with self._pool.connection() as connection:
+            row = connection.execute(SELECT_ARCHIVE_JOB, (project_id,)).fetchone()
+        return ArchiveJobModel(**json.loads(row['body'])) if row else None
+
+    def save(self, job: ArchiveJobModel):
+        with self._pool.connection() as connection, connection:
+            connection.execute(UPSERT_ARCHIVE_JOB, (str(job.project_id), job.json()))
+
+
+class SqliteChangeFeedRepository(ChangeFeedRepository):
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        with pool.connection() as connection:
+            self._epoch = connection.execute(SELECT_FEED_EPOCH).fetchone()[0]
+
+    def epoch(self) -> str:
+        return self._epoch
+
+    def read(self, after: int, limit: int) -> List[FeedEntry]:
+        with self._pool.connection() as connection:
+            rows = connection.execute(SELECT_FEED, (after, limit)).fetchall()
+        return [FeedEntry(seq, kind, record_id) for seq, kind, record_id in rows]
+
+    def last_seq(self) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute(SELECT_FEED_LAST_SEQ).fetchone()[0]
+
+
+class SqliteTestRunRepository(TestRunRepository):
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+
+    def add(self, run: TestRunResponseModel):
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                INSERT_TESTRUN,
+                (str(run.id), str(run.project_id), run.name, run.environment, run.created_at.isoformat())
+            )
+
+    def get(self, run_id: str) -> Optional[TestRunResponseModel]:
+        with self._pool.connection() as connection:
+            row = connection.execute(SELECT_TESTRUN, (run_id,)).fetchone()
+        return testrun_from_row(row) if row else None
+
+    def find_by_project(self, project_id: str, cursor: Optional[int], limit: int) -> TestRunPage:
+        with self._pool.connection() as connection:
+            rows = connection.execute(
+                SELECT_TESTRUNS_BY_PROJECT, (project_id, -1 if cursor is None else cursor, limit + 1)
+            ).fetchall()
+        next_cursor = rows[limit - 1]['seq'] if len(rows) > limit else None
+        return [testrun_from_row(row) for row in rows[:limit]], next_cursor
+
+    def append_results(self, run_id: str, results: Iterable[TestResultResponseModel]):
+        rows = [
+            (
+                str(result.testcase_id),
+                STATUS_CODES[result.status],
+                result.duration_ms,
+                result.output,
+                pack_result_time(result.finished_at)
+            )
+            for result in results
+        ]
+        check_result_rows(rows)
+        if not rows:
+            return
+        counts = [0] * len(RESULT_STATUSES)
+        for row in rows:
+            counts[row[1]] += 1
+        last_finished = max(row[4] for row in rows)
+        with self._pool.connection() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            run_seq, project_id = connection.execute(SELECT_TESTRUN_SCOPE, (run_id,)).fetchone()
+            first_seq = connection.execute(SELECT_NEXT_RESULT_SEQ).fetchone()[0]
+            connection.executemany(
+                INSERT_TESTRESULT, ((first_seq + index, run_seq) + row for index, row in enumerate(rows))
+            )
+            connection.execute(UPDATE_TESTRUN_COUNTS, counts + [last_finished, last_finished, run_seq])
+            latest: Dict[str, Tuple[int, tuple]] = {}
+            for index, row in enumerate(rows):
+                previous = latest.get(row[0])
+                if previous is None or previous[1][4] <= row[4]:
+                    latest[row[0]] = (first_seq + index, row)
+            connection.executemany(
+                UPSERT_LATEST_RESULT,
+                ((testcase_id, project_id, seq, row[1], row[4]) for testcase_id, (seq, row) in latest.items())
+            )
+            connection.executemany(
+                UPSERT_ROLLUP, (key + tuple(counts) for key, counts in rollup_rows(project_id, rows).items())
+            )
+
+    def results(self, run_id: str, cursor: Optional[int], limit: int) -> TestResultPage:
+        with self._pool.connection() as connection:
+            scope = connection.execute(SELECT_TESTRUN_SCOPE, (run_id,)).fetchone()
+            if scope is None:
+                return [], None
+            rows = connection.execute(
+                SELECT_TESTRESULTS, (scope['seq'], -1 if cursor is None else cursor, limit + 1)
+            ).fetchall()
+        next_cursor = rows[limit - 1]['seq'] if len(rows) > limit else None
+        return [testresult_from_row(row, run_id) for row in rows[:limit]], next_cursor
+
+    def latest(self, testcase_id: str) -> Optional[TestResultResponseModel]:
+        with self._pool.connection() as connection:
+            row = connection.execute(
+                f"{SELECT_LATEST_RESULTS} latest_results.testcase_id = ?", (testcase_id,)
+            ).fetchone()
+        return testresult_from_row(row) if row else None
+
+    def latest_by_project(
+            self,
+            project_id: str,
+            cursor: Optional[int],
+            limit: int,
+            status: Optional[str] = None) -> TestResultPage:
+        clauses = ["latest_results.project_id = ?", "latest_results.result_seq > ?"]
+        parameters: list = [project_id, -1 if cursor is None else cursor]
+        if status is not None:
+            clauses.append("latest_results.status = ?")
+            parameters.append(STATUS_CODES[status])
+        query = f"{SELECT_LATEST_RESULTS} {' AND '.join(clauses)} ORDER BY latest_results.result_seq LIMIT ?"
+        with self._pool.connection() as connection:
+            rows = connection.execute(query, parameters + [limit + 1]).fetchall()
+        next_cursor = rows[limit - 1]['seq'] if len(rows) > limit else None
+        return [testresult_from_row(row) for row in rows[:limit]], next_cursor
+
+    def testcase_history(
+            self,
+            testcase_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        return self._history("testcase", testcase_id, granularity, since, until, limit)
+
+    def project_history(
+            self,
+            project_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        return self._history("project", project_id, granularity, since, until, limit)
+
+    def count_results(self) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute(COUNT_TESTRESULTS).fetchone()[0]
+
+    def _history(
+            self,
+            scope: str,
+            record_id: str,
+            granularity: str,
+            since: Optional[datetime],
+            until: Optional[datetime],
+            limit: int) -> List[ResultBucketModel]:
+        first = MIN_BUCKET if since is None else bucket_start(pack_result_time(since), granularity)
+        last = MAX_BUCKET if until is None else pack_result_time(until)
+        with self._pool.connection() as connection:
+            rows = connection.execute(SELECT_ROLLUPS, (scope, record_id, granularity, first, last, limit)).fetchall()
+        return [materialize_bucket(row[0], row[1:]) for row in reversed(rows)]
+
+    def __len__(self) -> int:
+        with self._pool.connection() as connection:
+            return connection.execute(COUNT_TESTRUNS).fetchone()[0]
+
+
+@dataclass
+class SqliteStorage(Storage):
+    pool: Optional[ConnectionPool] = None
+    listener: Optional[ChangeListener] = None
+
+    def poll_changes(self) -> ChangeSet:
+        return self.listener.poll()
+
+    def close(self):
+        self.listener.close()
+        self.pool.close()
+
+
+def create_sqlite_storage(path: str, pool_size: int) -> SqliteStorage:
+    pool = ConnectionPool(path, pool_size)
+    with pool.connection() as connection:
+        connection.executescript(SCHEMA)
+        backfill(connection)
+    return SqliteStorage(
+        projects=SqliteProjectRepository(pool),
+        testcases=SqliteTestCaseRepository(pool),
+        jobs=SqliteArchiveJobRepository(pool),
+        feed=SqliteChangeFeedRepository(pool),
+        runs=SqliteTestRunRepository(pool),
+        pool=pool,
+        listener=ChangeListener(path)
+    )
@@ -0,0 +1,108 @@
+import json
+from fastapi.testclient import TestClient
+from fastapi import status
+from config.endpoints import EndpointConfig
+import main
+from main import app
+
+httpclient = TestClient(app)
+URL = EndpointConfig()
+
+
+def create_project() -> str:
+    return httpclient.post(
+        URL.PROJECT.CREATE_PROJECT,
+        json={"title": "Synced project", "owner": "CI", "tags": ["sync"]}
+    ).json()['id']
+
+
+def create_testcase(project_id: str) -> str:
+    return httpclient.post(
+        URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id),
+        json={
+            "title": "Synced testcase",
+            "description": "Testcase description",
+            "author": "CI",
+            "tags": ["sync"],
+            "expected_results": "should pass"
+        }
+    ).json()['id']
+
+
+def read_events(body: str) -> list:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append(fields)
+    return events
+
+
+def test_get_changes_returns_latest_state_of_each_record_since_cursor():
+    cursor = main.db.feed.last_seq()
+    project_id = create_project()
+    kept_id = create_testcase(project_id)
+    deleted_id = create_testcase(project_id)
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=deleted_id))
+
+    response = httpclient.get(URL.CHANGES.GET_CHANGES, params={"cursor": cursor})
+    assert response.status_code == status.HTTP_200_OK
+    feed = response.json()
+    assert feed['reset'] is False
+    assert [(item['type'], item['id']) for item in feed['items']] == [
+        ("project", project_id), ("testcase", kept_id), ("testcase", deleted_id)
+    ]
+    assert feed['items'][1]['data']['title'] == "Synced testcase"
+    assert feed['items'][2]['deleted'] is True
+    assert feed['items'][2]['data'] is None
+    assert feed['next_cursor'] == feed['items'][-1]['seq']
+
+
+def test_get_changes_pages_with_next_cursor():
+    cursor = main.db.feed.last_seq()
+    project_ids = [create_project() for _ in range(3)]
+    first_page = httpclient.get(URL.CHANGES.GET_CHANGES, params={"cursor": cursor, "limit": 2}).json()
+    second_page = httpclient.get(
+        URL.CHANGES.GET_CHANGES, params={"cursor": first_page['next_cursor'], "limit": 2}
+    ).json()
+    assert [item['id'] for item in first_page['items'] + second_page['items']] == project_ids
+
+
+def test_get_changes_without_new_changes_waits_and_returns_empty(monkeypatch):
+    monkeypatch.setattr(main.SETTINGS_CONF.FEED, 'POLL_INTERVAL_SECONDS', 0.01)
+    cursor = main.db.feed.last_seq()
+    feed = httpclient.get(URL.CHANGES.GET_CHANGES, params={"cursor": cursor, "wait": 0.05}).json()
+    assert feed['items'] == []
+    assert feed['next_cursor'] == cursor
+
+
+def test_get_changes_with_unknown_epoch_restarts_from_the_beginning():
+    create_project()
+    cursor = main.db.feed.last_seq()
+    feed = httpclient.get(URL.CHANGES.GET_CHANGES, params={"cursor": cursor, "epoch": "stale"}).json()
+    assert feed['reset'] is True
+    assert feed['epoch'] == main.db.feed.epoch()
+    assert feed['items'][0]['seq'] < cursor
+
+
+def test_stream_changes_sends_server_sent_events(monkeypatch):
+    monkeypatch.setattr(main.SETTINGS_CONF.FEED, 'POLL_INTERVAL_SECONDS', 0.01)
+    monkeypatch.setattr(main.SETTINGS_CONF.FEED, 'STREAM_SECONDS', 0.1)
+    cursor = main.db.feed.last_seq()
+    project_id = create_project()
+
+    response = httpclient.get(
+        URL.CHANGES.STREAM_CHANGES, headers={"Last-Event-ID": f"{main.db.feed.epoch()}:{cursor}"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/event-stream')
+    events = read_events(response.text)
+    assert events[0]['event'] == 'change'
+    assert events[0]['id'] == f"{main.db.feed.epoch()}:{cursor + 1}"
+    assert json.loads(events[0]['data'])['id'] == project_id
+
+
+def test_stream_changes_with_stale_event_id_sends_reset(monkeypatch):
+    monkeypatch.setattr(main.SETTINGS_CONF.FEED, 'STREAM_SECONDS', 0)
+    response = httpclient.get(URL.CHANGES.STREAM_CHANGES, headers={"Last-Event-ID": "stale:10"})
+    assert read_events(response.text)[0]['event'] == 'reset'
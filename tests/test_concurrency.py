@@ -0,0 +1,367 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+import httpx
+from fastapi import status
+from fastapi.testclient import TestClient
+from config.endpoints import EndpointConfig
+from storage import create_journaled_storage, create_sqlite_storage
+from web.locks import RecordLocks
+import main
+from main import app
+
+httpclient = TestClient(app)
+URL = EndpointConfig()
+HOT_UPDATES = 200
+
+
+def create_testcase() -> dict:
+    project = httpclient.post(URL.PROJECT.CREATE_PROJECT, json={"title": "Hot", "owner": "Owner", "tags": ["hot"]})
+    return httpclient.post(URL.TESTCASE.CREATE_TESTCASE.format(project_id=project.json()['id']), json={
+        "title": "Hot testcase",
+        "description": "Testcase description",
+        "author": "Testcase owner",
+        "tags": ["hot"],
+        "expected_results": "should pass"
+    }).json()
+
+
+def generate_update_payload(index: int) -> dict:
+    return {
+        "title": f"Title {index}",
+        "description": f"Description {index}",
+        "author": f"author-{index}",
+        "tags": [f"tag-{index}"],
+        "expected_results": f"Result {index}"
+    }
+
+
+def test_record_locks_serialize_writers_of_the_same_record():
+    locks = RecordLocks()
+    counters = {"hot": 0, "cold": 0}
+
+    async def increment(key: str):
+        async with locks.hold(key):
+            value = counters[key]
+            await asyncio.sleep(0)
+            counters[key] = value + 1
+
+    async def run():
+        await asyncio.gather(*(increment("hot") for _ in range(50)), *(increment("cold") for _ in range(50)))
+
+    asyncio.run(run())
+    assert counters == {"hot": 50, "cold": 50}
+    assert locks.waits > 0
+    assert len(locks) == 0
+
+
+def test_record_locks_do_not_block_other_records():
+    locks = RecordLocks()
+
+    async def run():
+        async with locks.hold("first"):
+            async with locks.hold("second", "third") as waited:
+                assert waited is False
+            waiter = asyncio.ensure_future(locks.hold("first", "second").__aenter__())
+            await asyncio.sleep(0)
+            assert not waiter.done()
+        assert await waiter is True
+
+    asyncio.run(run())
+
+
+def test_record_locks_release_cancelled_waiters():
+    locks = RecordLocks()
+
+    async def run():
+        async with locks.hold("hot"):
+            async def wait():
+                async with locks.hold("hot"):
+                    pass
+
+            waiter = asyncio.ensure_future(wait())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+        assert len(locks) == 0
+
+    asyncio.run(run())
+
+
+def increment_description(path: str, testcase_id: str, increments: int):
+    storage = create_sqlite_storage(path, pool_size=1)
+    done = 0
+    while done < increments:
+        testcase = storage.testcases.get(testcase_id)
+        previous_updated_at = testcase.updated_at
+        testcase.description = f"count {int(testcase.description.split()[-1]) + 1}"
+        testcase.updated_at = datetime.utcnow()
+        if storage.testcases.save(testcase, {"description", "updated_at"}, previous_updated_at):
+            done += 1
+    storage.close()
+
+
+def test_concurrent_updates_to_a_hot_testcase_stay_consistent(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=4))
+    testcase = create_testcase()
+    project_id, testcase_id = testcase['project_id'], testcase['id']
+    patch_url = URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+    httpclient.patch(patch_url, json={"description": "count 0"})
+    other_worker = threading.Thread(target=increment_description, args=(path, testcase_id, HOT_UPDATES))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            other_worker.start()
+            return await asyncio.gather(*(
+                client.patch(patch_url, json={"title": f"Title {index}", "tags": [f"tag-{index}"]})
+                for index in range(HOT_UPDATES)
+            ))
+
+    responses = asyncio.run(run())
+    other_worker.join()
+    assert [response.status_code for response in responses] == [status.HTTP_200_OK] * HOT_UPDATES
+
+    detail = httpclient.get(URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id))
+    final = detail.json()
+    index = final['title'].split()[-1]
+    assert final['description'] == f"count {HOT_UPDATES}"
+    assert final['tags'] == [f"tag-{index}"]
+    tags = httpclient.get(URL.TESTCASE.GET_TESTCASE_TAGS.format(project_id=project_id)).json()['tags']
+    assert tags == {f"tag-{index}": 1}
+    stats = httpclient.get(URL.PROJECT.GET_PROJECT_STATS.format(project_id=project_id)).json()
+    assert sum(stats['authors'].values()) == 1
+    assert len(main.testcase_locks) == 0
+    main.db.close()
+
+
+def write_between_read_and_save(
+        monkeypatch,
+        repository,
+        record_id: str,
+        change: Callable[[], None],
+        method: str = "get"):
+    read = getattr(repository, method)
+
+    def read_then_change(requested):
+        records = read(requested)
+        if record_id in (requested if isinstance(requested, list) else [requested]):
+            monkeypatch.setattr(repository, method, read)
+            change()
+        return records
+
+    monkeypatch.setattr(repository, method, read_then_change)
+
+
+def test_update_retries_after_another_worker_writes_the_record(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=2))
+    other = create_sqlite_storage(path, pool_size=1)
+    testcase = create_testcase()
+    project_id, testcase_id = testcase['project_id'], testcase['id']
+
+    def change_description():
+        record = other.testcases.get(testcase_id)
+        record.description = "Written by another worker"
+        record.updated_at = datetime.utcnow()
+        other.testcases.save(record, {"description", "updated_at"})
+
+    write_between_read_and_save(monkeypatch, main.db.testcases, testcase_id, change_description)
+    response = httpclient.patch(
+        URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id), json={"title": "Patched"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert (response.json()['title'], response.json()['description']) == ("Patched", "Written by another worker")
+    stored = other.testcases.get(testcase_id)
+    assert (stored.title, stored.description) == ("Patched", "Written by another worker")
+    other.close()
+    main.db.close()
+
+
+def test_if_match_fails_when_another_worker_wins_the_race(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=2))
+    other = create_sqlite_storage(path, pool_size=1)
+    project = httpclient.post(URL.PROJECT.CREATE_PROJECT, json={"title": "Raced", "owner": "Owner", "tags": ["a"]})
+    project_id = project.json()['id']
+    etag = httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)).headers['etag']
+
+    def change_title():
+        record = other.projects.get(project_id)
+        record.title = "Written by another worker"
+        record.updated_at = datetime.utcnow()
+        other.projects.save(record, {"title", "updated_at"})
+
+    write_between_read_and_save(monkeypatch, main.db.projects, project_id, change_title)
+    response = httpclient.put(
+        URL.PROJECT.UPDATE_PROJECT.format(project_id=project_id),
+        json={"title": "Stale writer", "owner": "Owner", "tags": ["a"]},
+        headers={"If-Match": etag}
+    )
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert other.projects.get(project_id).title == "Written by another worker"
+    other.close()
+    main.db.close()
+
+
+def test_stale_worker_cannot_revive_deleted_records(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=2))
+    other = create_sqlite_storage(path, pool_size=1)
+    testcase = create_testcase()
+    project_id, testcase_id = testcase['project_id'], testcase['id']
+    stale_project, stale_testcase = other.projects.get(project_id), other.testcases.get(testcase_id)
+
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id))
+    httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+    for repository, record in ((other.projects, stale_project), (other.testcases, stale_testcase)):
+        previous_updated_at = record.updated_at
+        record.title = "Stale writer"
+        record.updated_at = datetime.utcnow()
+        assert not repository.save(record, expected_updated_at=previous_updated_at)
+    assert not other.projects.get(project_id).active
+    assert other.testcases.get(testcase_id).archived
+    other.close()
+    main.db.close()
+
+
+def test_update_fails_when_another_worker_deletes_the_testcase_first(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=2))
+    other = create_sqlite_storage(path, pool_size=1)
+    testcase = create_testcase()
+    project_id, testcase_id = testcase['project_id'], testcase['id']
+
+    def delete_testcase():
+        record = other.testcases.get(testcase_id)
+        previous_updated_at = record.updated_at
+        record.archived = True
+        record.updated_at = datetime.utcnow()
+        assert other.testcases.save(record, {"archived", "updated_at"}, previous_updated_at)
+
+    write_between_read_and_save(monkeypatch, main.db.testcases, testcase_id, delete_testcase)
+    response = httpclient.put(
+        URL.TESTCASE.UPDATE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id),
+        json=generate_update_payload(1)
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    stored = other.testcases.get(testcase_id)
+    assert (stored.title, stored.archived) == ("Hot testcase", True)
+    other.close()
+    main.db.close()
+
+
+def create_second_testcase(project_id: str) -> str:
+    return httpclient.post(URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id), json={
+        "title": "Second testcase",
+        "description": "Testcase description",
+        "author": "Testcase owner",
+        "tags": ["hot"],
+        "expected_results": "should pass"
+    }).json()['id']
+
+
+def test_bulk_update_retries_after_another_worker_changes_a_tag(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=2))
+    other = create_sqlite_storage(path, pool_size=1)
+    testcase = create_testcase()
+    project_id, testcase_ids = testcase['project_id'], [testcase['id'], create_second_testcase(testcase['project_id'])]
+
+    def add_tag():
+        record = other.testcases.get(testcase_ids[1])
+        previous_updated_at = record.updated_at
+        record.tags = record.tags + ["from-other-worker"]
+        record.updated_at = datetime.utcnow()
+        assert other.testcases.save(record, {"tags", "updated_at"}, previous_updated_at)
+
+    write_between_read_and_save(monkeypatch, main.db.testcases, testcase_ids[1], add_tag, "get_many")
+    response = httpclient.post(URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id), json={
+        "select": {"ids": testcase_ids},
+        "changes": {"add_tags": ["release"]},
+        "updated_by": "Release bot"
+    })
+    assert response.status_code == status.HTTP_200_OK
+    assert [other.testcases.get(testcase_id).tags for testcase_id in testcase_ids] == [
+        ["hot", "release"], ["hot", "from-other-worker", "release"]
+    ]
+    other.close()
+    main.db.close()
+
+
+def test_bulk_update_leaves_testcases_archived_by_another_worker(tmp_path, monkeypatch):
+    path = str(tmp_path / "workers.db")
+    monkeypatch.setattr(main, "db", create_sqlite_storage(path, pool_size=2))
+    other = create_sqlite_storage(path, pool_size=1)
+    testcase = create_testcase()
+    project_id, testcase_ids = testcase['project_id'], [testcase['id'], create_second_testcase(testcase['project_id'])]
+
+    def archive():
+        record = other.testcases.get(testcase_ids[0])
+        previous_updated_at = record.updated_at
+        record.archived = True
+        record.updated_at = datetime.utcnow()
+        assert other.testcases.save(record, {"archived", "updated_at"}, previous_updated_at)
+
+    write_between_read_and_save(monkeypatch, main.db.testcases, testcase_ids[0], archive, "get_many")
+    response = httpclient.post(URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id), json={
+        "select": {"ids": testcase_ids},
+        "changes": {"title": "Rewritten"},
+        "updated_by": "Release bot"
+    })
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['missing'] == [testcase_ids[0]]
+    assert [other.testcases.get(testcase_id).title for testcase_id in testcase_ids] == [
+        "Hot testcase", "Second testcase"
+    ]
+    other.close()
+    main.db.close()
+
+
+def test_updates_wait_only_for_their_own_record():
+    hot = create_testcase()
+    cold = create_testcase()
+
+    def patch_url(testcase: dict) -> str:
+        return URL.TESTCASE.PATCH_TESTCASE.format(project_id=testcase['project_id'], testcase_id=testcase['id'])
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            async with main.testcase_locks.hold(hot['id']):
+                blocked = asyncio.ensure_future(client.patch(patch_url(hot), json={"title": "Blocked"}))
+                cold_response = await client.patch(patch_url(cold), json={"title": "Not blocked"})
+                assert cold_response.status_code == status.HTTP_200_OK
+                assert not blocked.done()
+            return await blocked
+
+    assert asyncio.run(run()).json()['title'] == "Blocked"
+
+
+def test_journaled_writes_are_grouped_without_blocking_the_event_loop(tmp_path, monkeypatch):
+    directory = tmp_path / "journal"
+    storage = create_journaled_storage(str(directory), commit_delay=0.05)
+    monkeypatch.setattr(main, "db", storage)
+    writers = 20
+
+    async def create_project(client: httpx.AsyncClient, index: int) -> str:
+        response = await client.post(
+            URL.PROJECT.CREATE_PROJECT, json={"title": f"Durable {index}", "owner": "Owner", "tags": ["durable"]}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()['id'].encode() in (directory / "journal-00000000.ndjson").read_bytes()
+        return response.json()['id']
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            started = time.perf_counter()
+            project_ids = await asyncio.gather(*(create_project(client, index) for index in range(writers)))
+            return project_ids, time.perf_counter() - started
+
+    project_ids, elapsed = asyncio.run(run())
+    assert elapsed < writers * 0.05 / 2
+    storage.close()
+    restored = create_journaled_storage(str(directory))
+    assert all(restored.projects.get(project_id) for project_id in project_ids)
+    restored.close()
@@ -0,0 +1,71 @@
+import re
+import pytest
+from fastapi.testclient import TestClient
+from fastapi import status
+from config.endpoints import EndpointConfig
+from main import SETTINGS_CONF, app
+
+httpclient = TestClient(app)
+URL = EndpointConfig()
+pytestmark = pytest.mark.skipif(not SETTINGS_CONF.METRICS.ENABLED, reason="request timing is turned off")
+
+
+def scrape() -> str:
+    response = httpclient.get(URL.METRICS.GET_METRICS)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith("text/plain")
+    return response.text
+
+
+def sample(metrics: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name + labels)} (\S+)$", metrics, re.MULTILINE)
+    assert match, f"{name}{labels} missing"
+    return float(match.group(1))
+
+
+def create_project() -> str:
+    return httpclient.post(
+        URL.PROJECT.CREATE_PROJECT,
+        json={"title": "Measured project", "owner": "CI", "tags": ["metrics"]}
+    ).json()['id']
+
+
+def test_metrics_record_latency_histogram_per_route_template():
+    project_id = create_project()
+    labels = '{method="GET",route="/projects/{project_id}",status="200"}'
+    before = scrape()
+    count = sample(before, "testshachou_http_request_duration_seconds_count", labels) if labels in before else 0
+    httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id))
+    httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id))
+    metrics = scrape()
+    assert sample(metrics, "testshachou_http_request_duration_seconds_count", labels) == count + 2
+    bucket = labels[:-1] + ',le="+Inf"}'
+    assert sample(metrics, "testshachou_http_request_duration_seconds_bucket", bucket) == count + 2
+    assert project_id not in metrics
+
+
+def test_metrics_split_request_time_into_phases():
+    create_project()
+    metrics = scrape()
+    for phase in ("validation", "handler", "storage", "serialization"):
+        labels = f'{{method="POST",route="/projects/create",phase="{phase}"}}'
+        assert sample(metrics, "testshachou_http_request_phase_seconds_total", labels) >= 0
+    storage_labels = '{method="POST",route="/projects/create",phase="storage"}'
+    assert sample(metrics, "testshachou_http_request_phase_seconds_total", storage_labels) > 0
+
+
+def test_metrics_group_unknown_paths_under_one_route():
+    httpclient.get("/does-not-exist/12345")
+    metrics = scrape()
+    assert sample(
+        metrics, "testshachou_http_request_duration_seconds_count", '{method="GET",route="unmatched",status="404"}'
+    ) >= 1
+    assert "12345" not in metrics
+
+
+def test_metrics_report_in_flight_requests_and_store_sizes():
+    create_project()
+    metrics = scrape()
+    assert sample(metrics, "testshachou_http_requests_in_flight", "") == 1
+    assert sample(metrics, "testshachou_store_records", '{store="projects"}') >= 1
+    assert sample(metrics, "testshachou_store_records", '{store="testcases"}') >= 0
@@ -1,7 +1,9 @@
+import json
 from fastapi.testclient import TestClient
 from fastapi import status
 from config.endpoints import EndpointConfig
 from config.errormessage import ErrorsConfig
+import main
 from main import app
 
 httpclient = TestClient(app)
@@ -92,16 +94,82 @@ def test_create_project_with_empty_values_in_owner():
     assert json_response['detail'][0]['msg'] == ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS
 
 
+def test_create_project_with_mixed_blank_tags_reports_spaces_first():
+    for tags in (["", " "], [" ", ""]):
+        response = httpclient.post(URL.PROJECT.CREATE_PROJECT, json=generate_create_project_payload(tags=tags))
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()['detail'][0]['msg'] == ERRORS_CONF.FIELD_VALUE.SPACES_ONLY
+
+
 def test_get_all_projects():
-    payload = generate_create_project_payload(title='first project')
+    payload = generate_create_project_payload(title='first project', owner='get all projects owner')
     response = httpclient.post(URL.PROJECT.CREATE_PROJECT, json=payload)
     project = response.json()
     assert response.status_code == status.HTTP_201_CREATED
 
-    get_projects_response = httpclient.get(URL.PROJECT.GET_ALL_PROJECT)
+    get_projects_response = httpclient.get(URL.PROJECT.GET_ALL_PROJECT, params={'owner': payload['owner']})
     projects_db = get_projects_response.json()
     assert get_projects_response.status_code == status.HTTP_200_OK
-    assert project in projects_db
+    assert project in projects_db['items']
+
+
+def test_get_all_projects_using_cursor_pagination():
+    payload = generate_create_project_payload(owner='paginated owner')
+    project_ids = [get_id_of_created_project(payload) for _ in range(5)]
+    params = {'owner': payload['owner'], 'limit': 2}
+    first_page = httpclient.get(URL.PROJECT.GET_ALL_PROJECT, params=params).json()
+    second_page = httpclient.get(
+        URL.PROJECT.GET_ALL_PROJECT,
+        params={**params, 'cursor': first_page['next_cursor']}
+    ).json()
+    third_page = httpclient.get(
+        URL.PROJECT.GET_ALL_PROJECT,
+        params={**params, 'cursor': second_page['next_cursor']}
+    ).json()
+    assert [project['id'] for project in first_page['items']] == project_ids[:2]
+    assert [project['id'] for project in second_page['items']] == project_ids[2:4]
+    assert [project['id'] for project in third_page['items']] == project_ids[4:]
+    assert third_page['next_cursor'] is None
+
+
+def test_get_all_projects_filtered_by_tags():
+    tagged_project_id = get_id_of_created_project(
+        generate_create_project_payload(owner='tag filter owner', tags=['api', 'smoke'])
+    )
+    get_id_of_created_project(generate_create_project_payload(owner='tag filter owner', tags=['api']))
+    response = httpclient.get(
+        URL.PROJECT.GET_ALL_PROJECT,
+        params={'owner': 'tag filter owner', 'tags': ['api', 'smoke']}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [project['id'] for project in response.json()['items']] == [tagged_project_id]
+
+
+def test_get_all_projects_excludes_inactive_projects_by_default():
+    payload = generate_create_project_payload(owner='inactive filter owner')
+    active_project_id = get_id_of_created_project(payload)
+    deleted_project_id = get_id_of_created_project(payload)
+    httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=deleted_project_id))
+
+    active_projects = httpclient.get(URL.PROJECT.GET_ALL_PROJECT, params={'owner': payload['owner']}).json()
+    inactive_projects = httpclient.get(
+        URL.PROJECT.GET_ALL_PROJECT,
+        params={'owner': payload['owner'], 'active': False}
+    ).json()
+    assert [project['id'] for project in active_projects['items']] == [active_project_id]
+    assert [project['id'] for project in inactive_projects['items']] == [deleted_project_id]
+
+
+def test_get_all_projects_reflects_updated_owner():
+    project_id = get_id_of_created_project(generate_create_project_payload(owner='owner before update'))
+    httpclient.put(
+        URL.PROJECT.UPDATE_PROJECT.format(project_id=project_id),
+        json=generate_create_project_payload(owner='owner after update')
+    )
+    previous_owner = httpclient.get(URL.PROJECT.GET_ALL_PROJECT, params={'owner': 'owner before update'}).json()
+    current_owner = httpclient.get(URL.PROJECT.GET_ALL_PROJECT, params={'owner': 'owner after update'}).json()
+    assert previous_owner['items'] == []
+    assert [project['id'] for project in current_owner['items']] == [project_id]
 
 
 def test_get_all_projects_using_invalid_method():
@@ -324,3 +392,264 @@ def test_delete_project_details():
     get_deleted_project_response = httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id))
     assert get_deleted_project_response.status_code == status.HTTP_200_OK
     assert get_deleted_project_response.json()['active'] is False
+
+
+def read_export(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_project_with_testcases():
+    project_id = get_id_of_created_project(generate_create_project_payload(title='exported project'))
+    testcase_payload = {
+        "title": "Exported testcase",
+        "description": "Testcase description",
+        "author": "Testcase owner",
+        "tags": ["export"],
+        "expected_results": "should pass"
+    }
+    testcase_ids = [
+        httpclient.post(URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id), json=testcase_payload).json()['id']
+        for _ in range(3)
+    ]
+    response = httpclient.get(URL.PROJECT.EXPORT_PROJECT.format(project_id=project_id))
+    records = read_export(response)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert response.headers['content-encoding'] == 'gzip'
+    assert records[0]['type'] == 'project'
+    assert records[0]['data']['id'] == project_id
+    assert [record['data']['id'] for record in records[1:]] == testcase_ids
+    assert all(record['type'] == 'testcase' for record in records[1:])
+
+
+def test_export_project_without_compression():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    response = httpclient.get(
+        URL.PROJECT.EXPORT_PROJECT.format(project_id=project_id),
+        headers={'accept-encoding': 'identity'}
+    )
+    assert 'content-encoding' not in response.headers
+    assert read_export(response) == [{'type': 'project', 'data': httpclient.get(
+        URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)).json()}]
+
+
+def test_export_project_honours_zero_gzip_quality():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    url = URL.PROJECT.EXPORT_PROJECT.format(project_id=project_id)
+    for accept_encoding in ('gzip;q=0, identity', 'GZIP; q=0.0', '*;q=0, identity', 'br'):
+        response = httpclient.get(url, headers={'accept-encoding': accept_encoding})
+        assert 'content-encoding' not in response.headers
+        assert read_export(response)[0]['data']['id'] == project_id
+    for accept_encoding in ('identity;q=0.5, gzip;q=0.8', '*', 'br, *;q=0.1'):
+        response = httpclient.get(url, headers={'accept-encoding': accept_encoding})
+        assert response.headers['content-encoding'] == 'gzip'
+
+
+def test_export_project_with_non_existing_project_id():
+    response = httpclient.get(URL.PROJECT.EXPORT_PROJECT.format(project_id='random_id'))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_get_all_projects_matching_any_of_the_tags():
+    first_project_id = get_id_of_created_project(generate_create_project_payload(owner='union owner', tags=['ui']))
+    second_project_id = get_id_of_created_project(generate_create_project_payload(owner='union owner', tags=['api']))
+    get_id_of_created_project(generate_create_project_payload(owner='union owner', tags=['perf']))
+    response = httpclient.get(
+        URL.PROJECT.GET_ALL_PROJECT,
+        params={'owner': 'union owner', 'any_tags': ['ui', 'api']}
+    )
+    assert [project['id'] for project in response.json()['items']] == [first_project_id, second_project_id]
+
+
+def test_get_project_tags_counts_active_projects_only():
+    project_id = get_id_of_created_project(generate_create_project_payload(tags=['cardinality-a', 'cardinality-b']))
+    get_id_of_created_project(generate_create_project_payload(tags=['cardinality-a']))
+    tags = httpclient.get(URL.PROJECT.GET_PROJECT_TAGS).json()['tags']
+    assert tags['cardinality-a'] == 2
+    assert tags['cardinality-b'] == 1
+
+    httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+    tags = httpclient.get(URL.PROJECT.GET_PROJECT_TAGS).json()['tags']
+    assert tags['cardinality-a'] == 1
+    assert 'cardinality-b' not in tags
+
+
+def test_get_project_detail_with_matching_etag_returns_not_modified():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    url = URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)
+    etag = httpclient.get(url).headers['etag']
+    response = httpclient.get(url, headers={'if-none-match': etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers['etag'] == etag
+    assert response.content == b''
+
+
+def test_get_project_detail_etag_changes_after_delete():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    url = URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)
+    etag = httpclient.get(url).headers['etag']
+    httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+    response = httpclient.get(url, headers={'if-none-match': etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] != etag
+
+
+def test_update_project_with_stale_etag_should_fail():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    url = URL.PROJECT.UPDATE_PROJECT.format(project_id=project_id)
+    etag = httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)).headers['etag']
+    headers = {'if-match': etag}
+    first_update = httpclient.put(url, json=generate_create_project_payload(title='first'), headers=headers)
+    second_update = httpclient.put(url, json=generate_create_project_payload(title='second'), headers=headers)
+    assert first_update.status_code == status.HTTP_200_OK
+    assert first_update.headers['etag'] != etag
+    assert second_update.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert second_update.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PRECONDITION_FAILED
+    project = httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)).json()
+    assert project['title'] == 'first'
+
+
+def create_testcases(project_id: str, count: int) -> list:
+    payload = {
+        "title": "Cascade testcase",
+        "description": "Testcase description",
+        "author": "Testcase owner",
+        "tags": ["cascade"],
+        "expected_results": "should pass"
+    }
+    return [
+        httpclient.post(URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id), json=payload).json()['id']
+        for _ in range(count)
+    ]
+
+
+def test_delete_project_archives_its_testcases_in_batches(monkeypatch):
+    monkeypatch.setattr(main.SETTINGS_CONF.CASCADE, 'BATCH_SIZE', 2)
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    testcase_ids = create_testcases(project_id, 5)
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_ids[0]))
+
+    response = httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+    assert response.status_code == status.HTTP_200_OK
+    job = httpclient.get(URL.PROJECT.GET_ARCHIVE_JOB.format(project_id=project_id)).json()
+    assert job['status'] == 'completed'
+    assert job['total'] == 5
+    assert job['processed'] == 5
+    assert job['archived'] == 4
+    assert job['finished_at'] is not None
+    for testcase_id in testcase_ids:
+        testcase = httpclient.get(
+            URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+        ).json()
+        assert testcase['archived'] is True
+
+
+def test_get_archive_job_for_project_that_was_not_deleted():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    response = httpclient.get(URL.PROJECT.GET_ARCHIVE_JOB.format(project_id=project_id))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.ARCHIVE_JOB_DOES_NOT_EXIST
+
+
+def test_get_project_stats_reflects_created_updated_and_deleted_testcases():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    testcase_ids = create_testcases(project_id, 3)
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_ids[0]))
+    update_response = httpclient.put(
+        URL.TESTCASE.UPDATE_TESTCASE.format(project_id=project_id, testcase_id=testcase_ids[1]),
+        json={
+            "title": "Updated testcase",
+            "description": "Testcase description",
+            "author": "Another author",
+            "tags": ["smoke"],
+            "expected_results": "should pass"
+        }
+    )
+
+    response = httpclient.get(URL.PROJECT.GET_PROJECT_STATS.format(project_id=project_id))
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()
+    assert stats['total'] == 3
+    assert stats['active'] == 2
+    assert stats['archived'] == 1
+    assert stats['authors'] == {"Testcase owner": 1, "Another author": 1}
+    assert stats['tags'] == {"cascade": 1, "smoke": 1}
+    assert stats['last_updated_at'] == update_response.json()['updated_at']
+
+
+def test_get_project_stats_with_non_existing_project_id():
+    response = httpclient.get(URL.PROJECT.GET_PROJECT_STATS.format(project_id="NON_EXISTING_ID"))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_patch_project_title_keeps_other_fields():
+    payload = generate_create_project_payload(tags=['patch-project'])
+    project_id = get_id_of_created_project(payload)
+    detail_url = URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)
+    etag = httpclient.get(detail_url).headers['etag']
+    response = httpclient.patch(URL.PROJECT.PATCH_PROJECT.format(project_id=project_id), json={'title': 'Patched'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] != etag
+    assert_project_response(dict(payload, title='Patched'), response.json())
+    assert httpclient.get(detail_url).json()['title'] == 'Patched'
+    assert httpclient.get(URL.PROJECT.GET_PROJECT_TAGS).json()['tags']['patch-project'] == 1
+
+
+def test_patch_project_description_to_null():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    response = httpclient.patch(URL.PROJECT.PATCH_PROJECT.format(project_id=project_id), json={'description': None})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['description'] is None
+
+
+def test_patch_project_title_to_null_should_return_error():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    response = httpclient.patch(URL.PROJECT.PATCH_PROJECT.format(project_id=project_id), json={'title': None})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.NULL_NOT_ALLOWED
+
+
+def test_patch_project_title_to_spaces_only_should_return_error():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    response = httpclient.patch(URL.PROJECT.PATCH_PROJECT.format(project_id=project_id), json={'title': '   '})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_patch_project_without_changes_keeps_etag():
+    project_id = get_id_of_created_project(generate_create_project_payload(title='unchanged'))
+    etag = httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)).headers['etag']
+    url = URL.PROJECT.PATCH_PROJECT.format(project_id=project_id)
+    assert httpclient.patch(url, json={}).headers['etag'] == etag
+    assert httpclient.patch(url, json={'title': 'unchanged'}).headers['etag'] == etag
+
+
+def test_patch_project_tags_updates_tag_counts_and_filters():
+    project_id = get_id_of_created_project(generate_create_project_payload(tags=['patch-before']))
+    response = httpclient.patch(
+        URL.PROJECT.PATCH_PROJECT.format(project_id=project_id),
+        json={'tags': ['patch-after']}
+    )
+    assert response.json()['tags'] == ['patch-after']
+    tags = httpclient.get(URL.PROJECT.GET_PROJECT_TAGS).json()['tags']
+    assert 'patch-before' not in tags
+    items = httpclient.get(URL.PROJECT.GET_ALL_PROJECT, params={'tags': ['patch-after']}).json()['items']
+    assert [project['id'] for project in items] == [project_id]
+
+
+def test_patch_deleted_project():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+    response = httpclient.patch(URL.PROJECT.PATCH_PROJECT.format(project_id=project_id), json={'title': 'Patched'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_patch_project_with_stale_etag_should_fail():
+    project_id = get_id_of_created_project(generate_create_project_payload())
+    url = URL.PROJECT.PATCH_PROJECT.format(project_id=project_id)
+    etag = httpclient.get(URL.PROJECT.GET_PROJECT_DETAILS.format(project_id=project_id)).headers['etag']
+    assert httpclient.patch(url, json={'title': 'first'}, headers={'if-match': etag}).status_code == 200
+    response = httpclient.patch(url, json={'title': 'second'}, headers={'if-match': etag})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
@@ -0,0 +1,53 @@
+from datetime import datetime
+from uuid import uuid4
+from models.projects import ProjectResponseModel
+from web.cache import ResponseCache
+
+
+def generate_project(title="Sample Project") -> ProjectResponseModel:
+    return ProjectResponseModel(
+        id=uuid4(),
+        title=title,
+        description=None,
+        owner="Project Owner",
+        tags=["cache"],
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        active=True
+    )
+
+
+def test_cached_record_is_encoded_once():
+    cache = ResponseCache(max_entries=2)
+    project = generate_project()
+    cached = cache.put(str(project.id), project, '"etag"', str(project.id))
+    project.title = "Changed after caching"
+    assert cache.get(str(project.id)) == cached
+    assert b'"title":"Sample Project"' in cached.body
+
+
+def test_least_recently_used_record_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    first, second, third = generate_project(), generate_project(), generate_project()
+    cache.put("first", first, '"1"', "first")
+    cache.put("second", second, '"2"', "second")
+    cache.get("first")
+    cache.put("third", third, '"3"', "third")
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
+
+
+def test_invalidated_record_is_removed():
+    cache = ResponseCache(max_entries=2)
+    cache.put("project", generate_project(), '"1"', "project")
+    cache.invalidate("project")
+    assert cache.get("project") is None
+    assert len(cache) == 0
+
+
+def test_disabled_cache_does_not_store_records():
+    cache = ResponseCache(max_entries=0)
+    cached = cache.put("project", generate_project(), '"1"', "project")
+    assert cached.etag == '"1"'
+    assert cache.get("project") is None
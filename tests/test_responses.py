@@ -0,0 +1,56 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from fastapi.encoders import jsonable_encoder
+from models.changes import ChangeEntryModel
+from models.projects import ProjectListResponseModel, ProjectResponseModel
+from models.stats import ProjectStatsResponseModel
+from web.responses import ENCODERS, RESPONSE_CLASSES, resolve_encoder
+
+
+def project_list() -> ProjectListResponseModel:
+    project = ProjectResponseModel(
+        id=uuid4(),
+        title="Ünïcode project",
+        description=None,
+        owner="CI",
+        tags=["fast", "json"],
+        created_at=datetime(2023, 1, 2, 3, 4, 5, 678901),
+        updated_at=datetime(2023, 1, 2, 3, 4, 5),
+        active=True
+    )
+    return ProjectListResponseModel(items=[project, project.copy(update={"id": uuid4()})], next_cursor=None)
+
+
+@pytest.fixture(params=sorted(ENCODERS))
+def encoder(request) -> str:
+    return request.param
+
+
+def test_encoder_matches_standard_encoding(encoder):
+    for content in (
+            project_list(),
+            ProjectStatsResponseModel(total=1, active=1, archived=0, authors={"CI": 1}, tags={}),
+            ChangeEntryModel(seq=1, type="project", id="1", deleted=True)):
+        assert json.loads(ENCODERS[encoder](content)) == jsonable_encoder(content)
+
+
+def test_encoder_keeps_output_compact_and_unescaped(encoder):
+    body = ENCODERS[encoder](project_list())
+    assert "Ünïcode".encode() in body
+    assert b", " not in body and b'": ' not in body
+
+
+def test_response_class_renders_models(encoder):
+    content = project_list()
+    response = RESPONSE_CLASSES[encoder](content)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == jsonable_encoder(content)
+
+
+def test_resolve_encoder():
+    assert resolve_encoder("auto") in ENCODERS
+    assert resolve_encoder("json") == "json"
+    with pytest.raises(ValueError):
+        resolve_encoder("yaml")
@@ -0,0 +1,241 @@
+import json
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from fastapi import status
+from config.endpoints import EndpointConfig
+from config.errormessage import ErrorsConfig
+from main import app
+from tests.test_testcase import create_testcases_under_project, get_created_project_id
+
+httpclient = TestClient(app)
+URL = EndpointConfig()
+ERRORS_CONF = ErrorsConfig()
+
+
+def create_run(project_id: str, name: str = "Nightly") -> dict:
+    response = httpclient.post(
+        URL.RUN.CREATE_TESTRUN.format(project_id=project_id), json={"name": name, "environment": "staging"}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()
+
+
+def ingest(project_id: str, run_id: str, results: list) -> dict:
+    response = httpclient.post(URL.RUN.INGEST_RESULTS.format(project_id=project_id, run_id=run_id), json=results)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def test_create_and_list_runs():
+    project_id = get_created_project_id()
+    runs = [create_run(project_id, name=f"Run {index}") for index in range(3)]
+    assert runs[0]['total'] == 0
+    assert runs[0]['statuses'] == {}
+
+    response = httpclient.get(URL.RUN.GET_ALL_TESTRUN.format(project_id=project_id), params={"limit": 2})
+    assert [run['name'] for run in response.json()['items']] == ["Run 0", "Run 1"]
+    response = httpclient.get(
+        URL.RUN.GET_ALL_TESTRUN.format(project_id=project_id),
+        params={"limit": 2, "cursor": response.json()['next_cursor']}
+    )
+    assert [run['name'] for run in response.json()['items']] == ["Run 2"]
+    assert response.json()['next_cursor'] is None
+
+
+def test_create_run_under_missing_project():
+    response = httpclient.post(URL.RUN.CREATE_TESTRUN.format(project_id=str(uuid4())), json={"name": "Nightly"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_create_run_rejects_empty_name():
+    project_id = get_created_project_id()
+    response = httpclient.post(URL.RUN.CREATE_TESTRUN.format(project_id=project_id), json={"name": ""})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['msg'] == ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS
+
+
+def test_ingest_results_updates_run_summary():
+    project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 3)
+    run = create_run(project_id)
+    body = ingest(project_id, run['id'], [
+        {"testcase_id": testcase_ids[0], "status": "passed", "duration_ms": 10},
+        {"testcase_id": testcase_ids[1], "status": "failed", "duration_ms": 20, "output": "assertion failed"},
+        {"testcase_id": testcase_ids[2], "status": "passed", "duration_ms": 30,
+         "finished_at": "2024-01-01T12:00:00"},
+    ])
+    assert body == {"accepted": 3, "rejected": 0, "errors": []}
+
+    detail = httpclient.get(URL.RUN.GET_TESTRUN_DETAIL.format(project_id=project_id, run_id=run['id'])).json()
+    assert detail['total'] == 3
+    assert detail['statuses'] == {"passed": 2, "failed": 1}
+    assert detail['last_finished_at'] is not None
+
+    results = httpclient.get(
+        URL.RUN.GET_TESTRUN_RESULTS.format(project_id=project_id, run_id=run['id']), params={"limit": 2}
+    ).json()
+    assert [result['testcase_id'] for result in results['items']] == testcase_ids[:2]
+    assert results['items'][1]['output'] == "assertion failed"
+    rest = httpclient.get(
+        URL.RUN.GET_TESTRUN_RESULTS.format(project_id=project_id, run_id=run['id']),
+        params={"limit": 2, "cursor": results['next_cursor']}
+    ).json()
+    assert rest['items'][0]['finished_at'] == "2024-01-01T12:00:00"
+    assert rest['next_cursor'] is None
+
+
+def test_ingest_results_from_ndjson_stream_reports_rejected_lines():
+    project_id = get_created_project_id()
+    testcase_id, archived_id = create_testcases_under_project(project_id, 2)
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=archived_id))
+    foreign_id = create_testcases_under_project(get_created_project_id(), 1)[0]
+    run = create_run(project_id)
+    lines = [
+        json.dumps({"testcase_id": testcase_id, "status": "passed", "duration_ms": 5}),
+        "{not json",
+        json.dumps({"testcase_id": testcase_id, "status": "unknown", "duration_ms": 5}),
+        json.dumps({"testcase_id": foreign_id, "status": "passed", "duration_ms": 5}),
+        json.dumps({"testcase_id": archived_id, "status": "passed", "duration_ms": 5}),
+        json.dumps({"testcase_id": testcase_id, "status": "failed", "duration_ms": -1}),
+        json.dumps({"testcase_id": testcase_id, "status": "failed", "duration_ms": 7}),
+    ]
+    response = httpclient.post(
+        URL.RUN.INGEST_RESULTS.format(project_id=project_id, run_id=run['id']),
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"}
+    )
+    body = response.json()
+    assert (body['accepted'], body['rejected']) == (2, 5)
+    assert [error['index'] for error in body['errors']] == [1, 2, 3, 4, 5]
+    assert body['errors'][0]['detail'][0]['msg'] == ERRORS_CONF.GENERAL_ERRORS.INVALID_JSON_LINE
+    assert body['errors'][2]['detail'][0]['msg'] == ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST
+    assert body['errors'][3]['detail'][0]['loc'] == ["body", 4, "testcase_id"]
+
+
+def test_ingest_results_rejects_out_of_range_durations():
+    project_id = get_created_project_id()
+    first_id, second_id = create_testcases_under_project(project_id, 2)
+    run = create_run(project_id)
+    body = ingest(project_id, run['id'], [
+        {"testcase_id": first_id, "status": "failed", "duration_ms": 2 ** 64},
+        {"testcase_id": first_id, "status": "failed", "duration_ms": 2 ** 63},
+    ])
+    assert (body['accepted'], body['rejected']) == (0, 2)
+    assert body['errors'][0]['detail'][0]['loc'] == ["duration_ms"]
+
+    body = ingest(project_id, run['id'], [{"testcase_id": second_id, "status": "passed", "duration_ms": 2 ** 63 - 1}])
+    assert body['accepted'] == 1
+    results = httpclient.get(URL.RUN.GET_TESTRUN_RESULTS.format(project_id=project_id, run_id=run['id'])).json()
+    assert [(result['testcase_id'], result['status']) for result in results['items']] == [(second_id, "passed")]
+
+
+def test_ingest_results_rejects_non_array_body():
+    project_id = get_created_project_id()
+    run = create_run(project_id)
+    response = httpclient.post(
+        URL.RUN.INGEST_RESULTS.format(project_id=project_id, run_id=run['id']), json={"status": "passed"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_BODY
+
+
+def test_run_is_scoped_to_its_project():
+    project_id = get_created_project_id()
+    run = create_run(project_id)
+    other_project_id = get_created_project_id()
+    for url in (URL.RUN.GET_TESTRUN_DETAIL, URL.RUN.GET_TESTRUN_RESULTS):
+        response = httpclient.get(url.format(project_id=other_project_id, run_id=run['id']))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.TESTRUN_DOES_NOT_EXIST
+    response = httpclient.post(URL.RUN.INGEST_RESULTS.format(project_id=other_project_id, run_id=run['id']), json=[])
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_latest_result_per_testcase_follows_newest_run():
+    project_id = get_created_project_id()
+    flaky_id, stable_id = create_testcases_under_project(project_id, 2)
+    first, second = create_run(project_id, "First"), create_run(project_id, "Second")
+    ingest(project_id, first['id'], [
+        {"testcase_id": flaky_id, "status": "passed", "duration_ms": 5, "finished_at": "2024-01-01T12:00:00"},
+        {"testcase_id": stable_id, "status": "passed", "duration_ms": 5, "finished_at": "2024-01-01T12:00:00"},
+    ])
+    ingest(project_id, second['id'], [
+        {"testcase_id": flaky_id, "status": "failed", "duration_ms": 5, "finished_at": "2024-01-02T12:00:00"},
+    ])
+
+    url = URL.RUN.GET_TESTCASE_LATEST_RESULT.format(project_id=project_id, testcase_id=flaky_id)
+    latest = httpclient.get(url).json()
+    assert (latest['status'], latest['run_id']) == ("failed", second['id'])
+
+    failing = httpclient.get(
+        URL.RUN.GET_LATEST_RESULTS.format(project_id=project_id), params={"status": "failed"}
+    ).json()
+    assert [result['testcase_id'] for result in failing['items']] == [flaky_id]
+    latest_results = httpclient.get(URL.RUN.GET_LATEST_RESULTS.format(project_id=project_id)).json()['items']
+    assert sorted(result['testcase_id'] for result in latest_results) == sorted([flaky_id, stable_id])
+    response = httpclient.get(URL.RUN.GET_LATEST_RESULTS.format(project_id=project_id), params={"status": "odd"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_latest_result_for_testcase_without_results():
+    project_id = get_created_project_id()
+    testcase_id = create_testcases_under_project(project_id, 1)[0]
+    response = httpclient.get(URL.RUN.GET_TESTCASE_LATEST_RESULT.format(project_id=project_id, testcase_id=testcase_id))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.NO_TESTCASE_RESULTS
+    response = httpclient.get(
+        URL.RUN.GET_TESTCASE_LATEST_RESULT.format(project_id=get_created_project_id(), testcase_id=testcase_id)
+    )
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST
+
+
+def test_pass_rate_history_per_testcase_and_project():
+    project_id = get_created_project_id()
+    flaky_id, stable_id = create_testcases_under_project(project_id, 2)
+    run = create_run(project_id)
+    ingest(project_id, run['id'], [
+        {"testcase_id": flaky_id, "status": "passed", "duration_ms": 5, "finished_at": "2024-01-01T09:00:00"},
+        {"testcase_id": flaky_id, "status": "failed", "duration_ms": 5, "finished_at": "2024-01-01T09:30:00"},
+        {"testcase_id": stable_id, "status": "passed", "duration_ms": 5, "finished_at": "2024-01-02T09:00:00"},
+        {"testcase_id": flaky_id, "status": "passed", "duration_ms": 5, "finished_at": "2024-01-02T10:00:00"},
+    ])
+
+    history = httpclient.get(
+        URL.RUN.GET_TESTCASE_HISTORY.format(project_id=project_id, testcase_id=flaky_id),
+        params={"granularity": "hour"}
+    ).json()
+    assert history['granularity'] == "hour"
+    assert [(bucket['start'], bucket['pass_rate']) for bucket in history['buckets']] == [
+        ("2024-01-01T09:00:00", 0.5), ("2024-01-02T10:00:00", 1.0)
+    ]
+    days = httpclient.get(URL.RUN.GET_PROJECT_HISTORY.format(project_id=project_id)).json()['buckets']
+    assert [(bucket['start'], bucket['total'], bucket['statuses']) for bucket in days] == [
+        ("2024-01-01T00:00:00", 2, {"passed": 1, "failed": 1}),
+        ("2024-01-02T00:00:00", 2, {"passed": 2}),
+    ]
+    weeks = httpclient.get(
+        URL.RUN.GET_PROJECT_HISTORY.format(project_id=project_id),
+        params={"granularity": "week", "since": "2024-01-03T00:00:00"}
+    ).json()['buckets']
+    assert [(bucket['start'], bucket['pass_rate']) for bucket in weeks] == [("2024-01-01T00:00:00", 0.75)]
+    latest_day = httpclient.get(
+        URL.RUN.GET_PROJECT_HISTORY.format(project_id=project_id), params={"limit": 1}
+    ).json()['buckets']
+    assert [bucket['start'] for bucket in latest_day] == ["2024-01-02T00:00:00"]
+
+
+def test_history_rejects_unknown_granularity_and_foreign_testcase():
+    project_id = get_created_project_id()
+    testcase_id = create_testcases_under_project(project_id, 1)[0]
+    response = httpclient.get(
+        URL.RUN.GET_PROJECT_HISTORY.format(project_id=project_id), params={"granularity": "month"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    response = httpclient.get(
+        URL.RUN.GET_TESTCASE_HISTORY.format(project_id=get_created_project_id(), testcase_id=testcase_id)
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST
+    response = httpclient.get(URL.RUN.GET_PROJECT_HISTORY.format(project_id=str(uuid4())))
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
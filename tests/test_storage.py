@@ -0,0 +1,670 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from models.jobs import ArchiveJobModel
+from models.projects import ProjectResponseModel
+from models.runs import TestResultResponseModel, TestRunResponseModel
+from models.testcase import TestCaseResponseModel
+from storage import create_journaled_storage, create_memory_storage, create_sqlite_storage
+from storage.base import Change, ChangeSet
+from storage.records import ResultLog
+import storage.sqlite as storage_sqlite
+
+
+@pytest.fixture(params=["memory", "journal", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        storage = create_memory_storage()
+    elif request.param == "journal":
+        storage = create_journaled_storage(str(tmp_path / "journal"), commit_delay=0)
+    else:
+        storage = create_sqlite_storage(str(tmp_path / "storage.db"), pool_size=2)
+    yield storage
+    storage.close()
+
+
+def generate_project(owner="Project Owner", tags=None) -> ProjectResponseModel:
+    return ProjectResponseModel(
+        id=uuid4(),
+        title="Sample Project",
+        description="Project description",
+        owner=owner,
+        tags=tags if tags is not None else ["Project", "Tags"],
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        active=True
+    )
+
+
+def generate_testcase(project_id) -> TestCaseResponseModel:
+    return TestCaseResponseModel(
+        project_id=project_id,
+        id=uuid4(),
+        title="Sample Testcase",
+        description="Testcase description",
+        author="Testcase owner",
+        tags=["test", "tags"],
+        expected_results="should pass",
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        updated_by="Testcase owner",
+        archived=False
+    )
+
+
+def generate_run(project_id) -> TestRunResponseModel:
+    return TestRunResponseModel(
+        project_id=project_id,
+        id=uuid4(),
+        name="Nightly",
+        environment="staging",
+        created_at=datetime.utcnow()
+    )
+
+
+def generate_result(run_id, testcase_id, status="passed", finished_at=None) -> TestResultResponseModel:
+    return TestResultResponseModel(
+        run_id=run_id,
+        testcase_id=testcase_id,
+        status=status,
+        duration_ms=12,
+        output=f"{status} output",
+        finished_at=finished_at or datetime.utcnow()
+    )
+
+
+def summarize(results) -> list:
+    return [(result.run_id, result.testcase_id, result.status, result.finished_at) for result in results]
+
+
+def test_add_and_get_project(storage):
+    project = generate_project()
+    storage.projects.add(project)
+    assert storage.projects.get(str(project.id)) == project
+    assert len(storage.projects) == 1
+
+
+def test_get_non_existing_project(storage):
+    assert storage.projects.get("NON_EXISTING") is None
+
+
+def test_saved_project_is_reindexed(storage):
+    project = generate_project(owner="first owner", tags=["before"])
+    storage.projects.add(project)
+    project.owner = "second owner"
+    project.tags = ["after"]
+    project.active = False
+    storage.projects.save(project)
+
+    assert storage.projects.get(str(project.id)) == project
+    assert storage.projects.find(None, 10, owner="first owner") == ([], None)
+    assert storage.projects.find(None, 10, tags=["before"]) == ([], None)
+    assert storage.projects.find(None, 10, active=True) == ([], None)
+    assert storage.projects.find(None, 10, owner="second owner", tags=["after"], active=False) == ([project], None)
+
+
+def test_find_projects_paginates_in_creation_order(storage):
+    projects = [generate_project() for _ in range(5)]
+    for project in projects:
+        storage.projects.add(project)
+    first_page, cursor = storage.projects.find(None, 3)
+    second_page, last_cursor = storage.projects.find(cursor, 3)
+    assert first_page == projects[:3]
+    assert second_page == projects[3:]
+    assert last_cursor is None
+
+
+def test_add_get_and_save_testcase(storage):
+    testcase = generate_testcase(uuid4())
+    storage.testcases.add(testcase)
+    testcase.archived = True
+    storage.testcases.save(testcase)
+    assert storage.testcases.get(str(testcase.id)) == testcase
+    assert len(storage.testcases) == 1
+
+
+def test_save_with_expected_updated_at_is_compare_and_set(storage):
+    project = generate_project()
+    storage.projects.add(project)
+    testcase = generate_testcase(project.id)
+    storage.testcases.add(testcase)
+
+    for repository, record in ((storage.projects, project.copy()), (storage.testcases, testcase.copy())):
+        previous_updated_at = record.updated_at
+        record.title = "Stale write"
+        record.updated_at = datetime.utcnow()
+        assert not repository.save(record, {"title", "updated_at"}, previous_updated_at - timedelta(seconds=1))
+        assert repository.get(str(record.id)).title != "Stale write"
+        record.title = "Current write"
+        assert repository.save(record, {"title", "updated_at"}, previous_updated_at)
+        assert repository.get(str(record.id)).title == "Current write"
+        assert not repository.save(record, {"title", "updated_at"}, previous_updated_at)
+
+
+def test_save_many_with_expected_updated_at_is_all_or_nothing(storage):
+    testcases = [generate_testcase(uuid4()) for _ in range(3)]
+    storage.testcases.add_many(testcases)
+    previous_updated_at = [testcase.updated_at for testcase in testcases]
+    for testcase in testcases:
+        testcase.title = "Batched write"
+        testcase.updated_at = datetime.utcnow()
+
+    stale = previous_updated_at[:2] + [previous_updated_at[2] - timedelta(seconds=1)]
+    assert not storage.testcases.save_many(testcases, {"title", "updated_at"}, stale)
+    testcase_ids = [str(testcase.id) for testcase in testcases]
+    assert {found.title for found in storage.testcases.get_many(testcase_ids)} == {"Sample Testcase"}
+    assert storage.testcases.save_many(testcases, {"title", "updated_at"}, previous_updated_at)
+    assert {found.title for found in storage.testcases.get_many(testcase_ids)} == {"Batched write"}
+    assert not storage.testcases.save_many(testcases, {"title", "updated_at"}, previous_updated_at)
+
+
+def test_sqlite_partial_saves_leave_other_columns_alone(tmp_path):
+    first = create_sqlite_storage(str(tmp_path / "shared.db"), pool_size=1)
+    second = create_sqlite_storage(str(tmp_path / "shared.db"), pool_size=1)
+    testcase = generate_testcase(uuid4())
+    first.testcases.add(testcase)
+    described, archived = first.testcases.get(str(testcase.id)), second.testcases.get(str(testcase.id))
+    described.description = "Changed by the first worker"
+    first.testcases.save(described, {"description"})
+    archived.archived = True
+    second.testcases.save_many([archived], {"archived"})
+
+    stored = first.testcases.get(str(testcase.id))
+    assert (stored.description, stored.archived) == ("Changed by the first worker", True)
+    first.close()
+    second.close()
+
+
+def test_get_many_testcases_skips_unknown_ids(storage):
+    testcases = [generate_testcase(uuid4()) for _ in range(3)]
+    storage.testcases.add_many(testcases)
+    found = storage.testcases.get_many([str(testcases[2].id), str(uuid4()), str(testcases[0].id)])
+    assert sorted(str(testcase.id) for testcase in found) == sorted([str(testcases[0].id), str(testcases[2].id)])
+    assert storage.testcases.get_many([]) == []
+
+
+def test_find_testcases_by_project(storage):
+    project_id = uuid4()
+    testcases = [generate_testcase(project_id) for _ in range(3)]
+    storage.testcases.add(generate_testcase(uuid4()))
+    for testcase in testcases:
+        storage.testcases.add(testcase)
+    first_page, cursor = storage.testcases.find_by_project(str(project_id), None, 2)
+    second_page, last_cursor = storage.testcases.find_by_project(str(project_id), cursor, 2)
+    assert first_page == testcases[:2]
+    assert second_page == testcases[2:]
+    assert last_cursor is None
+
+
+def test_search_testcases_within_project(storage):
+    project_id = uuid4()
+    testcase = generate_testcase(project_id)
+    testcase.title = "Login with expired password"
+    archived = generate_testcase(project_id)
+    archived.title = "Login archived"
+    archived.archived = True
+    storage.testcases.add(testcase)
+    storage.testcases.add(archived)
+    storage.testcases.add(generate_testcase(uuid4()))
+    assert storage.testcases.search(str(project_id), "log expir", 10) == [testcase]
+    assert storage.testcases.search(str(project_id), "archived", 10) == []
+    assert storage.testcases.search(str(uuid4()), "login", 10) == []
+
+
+def test_search_index_follows_writes_after_the_first_query(storage):
+    project_id = uuid4()
+    first = generate_testcase(project_id)
+    first.title = "Checkout with coupon"
+    storage.testcases.add(first)
+    assert storage.testcases.search(str(project_id), "checkout", 10) == [first]
+
+    second = generate_testcase(project_id)
+    second.title = "Checkout with gift card"
+    storage.testcases.add(second)
+    first.archived = True
+    storage.testcases.save(first, {"archived"})
+    second.title = "Checkout with voucher"
+    storage.testcases.save(second, {"title"})
+    assert storage.testcases.search(str(project_id), "checkout", 10) == [second]
+    assert storage.testcases.search(str(project_id), "gift", 10) == []
+
+
+def test_find_projects_by_tag_intersection_and_union(storage):
+    both = generate_project(tags=["api", "smoke"])
+    api = generate_project(tags=["api"])
+    ui = generate_project(tags=["ui"])
+    for project in (both, api, ui):
+        storage.projects.add(project)
+    assert storage.projects.find(None, 10, tags=["api", "smoke"]) == ([both], None)
+    assert storage.projects.find(None, 10, any_tags=["smoke", "ui"]) == ([both, ui], None)
+    assert storage.projects.find(None, 10, tags=["api"], any_tags=["smoke", "ui"]) == ([both], None)
+    assert storage.projects.tag_counts() == {"api": 2, "smoke": 1, "ui": 1}
+
+
+def test_find_testcases_by_tags_and_count_live_tags(storage):
+    project_id = uuid4()
+    tagged = generate_testcase(project_id)
+    untagged = generate_testcase(project_id)
+    untagged.tags = None
+    archived = generate_testcase(project_id)
+    archived.tags = ["test"]
+    archived.archived = True
+    storage.testcases.add_many([tagged, untagged, archived])
+    assert storage.testcases.find_by_project(str(project_id), None, 10, tags=["test", "tags"]) == ([tagged], None)
+    assert storage.testcases.find_by_project(str(project_id), None, 10, any_tags=["tags", "test"]) == (
+        [tagged, archived], None
+    )
+    assert storage.testcases.tag_counts(str(project_id)) == {"test": 1, "tags": 1}
+
+
+def test_save_and_get_archive_job(storage):
+    job = ArchiveJobModel(project_id=uuid4(), status="running", total=3, started_at=datetime.utcnow())
+    storage.jobs.save(job)
+    job.processed = 3
+    job.status = "completed"
+    storage.jobs.save(job)
+    assert storage.jobs.get(str(job.project_id)) == job
+    assert storage.jobs.get(str(uuid4())) is None
+
+
+def test_sqlite_change_listener_sees_writes_from_another_storage(tmp_path):
+    writer = create_sqlite_storage(str(tmp_path / "shared.db"), pool_size=1)
+    reader = create_sqlite_storage(str(tmp_path / "shared.db"), pool_size=1)
+    project = generate_project()
+    testcase = generate_testcase(project.id)
+    writer.projects.add(project)
+    writer.testcases.add(testcase)
+
+    assert reader.poll_changes() == ChangeSet(
+        reset=False,
+        changes=[Change("project", str(project.id)), Change("testcase", str(testcase.id))]
+    )
+    assert reader.poll_changes() == ChangeSet(reset=False, changes=[])
+    writer.close()
+    reader.close()
+
+
+def test_sqlite_change_listener_resets_after_pruned_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_sqlite, "CHANGE_RETENTION", 1)
+    writer = create_sqlite_storage(str(tmp_path / "shared.db"), pool_size=1)
+    reader = create_sqlite_storage(str(tmp_path / "shared.db"), pool_size=1)
+    for _ in range(3):
+        writer.projects.add(generate_project())
+    assert reader.poll_changes().reset is True
+    writer.close()
+    reader.close()
+
+
+def test_journal_replays_writes_after_restart(tmp_path):
+    directory = str(tmp_path / "journal")
+    storage = create_journaled_storage(directory, commit_delay=0)
+    project = generate_project()
+    storage.projects.add(project)
+    testcases = [generate_testcase(project.id) for _ in range(3)]
+    storage.testcases.add_many(testcases)
+    testcases[0].archived = True
+    storage.testcases.save(testcases[0])
+    project.active = False
+    storage.projects.save(project)
+    storage.close()
+
+    restored = create_journaled_storage(directory, commit_delay=0)
+    assert restored.projects.get(str(project.id)) == project
+    assert [testcase.id for testcase in restored.testcases.find_by_project(str(project.id), None, 10)[0]] == [
+        testcase.id for testcase in testcases
+    ]
+    assert restored.testcases.get(str(testcases[0].id)).archived is True
+    assert restored.testcases.tag_counts(str(project.id)) == {"test": 2, "tags": 2}
+    restored.close()
+
+
+def test_journal_restores_snapshot_and_log_tail(tmp_path):
+    directory = str(tmp_path / "journal")
+    storage = create_journaled_storage(directory, commit_delay=0)
+    first = generate_project(owner="First")
+    storage.projects.add(first)
+    storage.snapshot()
+    second = generate_project(owner="Second")
+    storage.projects.add(second)
+    storage.close()
+
+    restored = create_journaled_storage(directory, commit_delay=0)
+    assert restored.projects.find(None, 10)[0] == [first, second]
+    restored.close()
+
+
+def test_journal_snapshot_restores_the_same_indexes_as_the_log(tmp_path):
+    directory = str(tmp_path / "journal")
+    storage = create_journaled_storage(directory, commit_delay=0)
+    project_ids = [uuid4(), uuid4()]
+    testcases = [generate_testcase(project_ids[index % 2]) for index in range(6)]
+    for index, testcase in enumerate(testcases):
+        testcase.title = f"Login step {index}"
+        testcase.author = f"author-{index % 3}"
+        testcase.tags = [f"tag-{index % 2}", "shared"]
+    storage.testcases.add_many(testcases)
+    testcases[0].archived = True
+    storage.testcases.save(testcases[0], {"archived"})
+    storage.close()
+
+    def indexed_state(restored) -> list:
+        return [
+            (
+                restored.testcases.stats(str(project_id)),
+                restored.testcases.find_by_project(str(project_id), None, 10, ["shared"])[0],
+                restored.testcases.search(str(project_id), "login", 10)
+            )
+            for project_id in project_ids
+        ]
+
+    from_log = create_journaled_storage(directory, commit_delay=0)
+    expected = indexed_state(from_log)
+    from_log.snapshot()
+    from_log.close()
+    from_snapshot = create_journaled_storage(directory, commit_delay=0)
+    assert indexed_state(from_snapshot) == expected
+    assert expected[0][0].active == 2 and expected[0][0].archived == 1
+    assert len(from_snapshot.feed.read(0, 100)) == 6
+    from_snapshot.close()
+
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    directory = tmp_path / "journal"
+    storage = create_journaled_storage(str(directory), commit_delay=0)
+    project = generate_project()
+    storage.projects.add(project)
+    storage.close()
+    segment = sorted(directory.glob("journal-*.ndjson"))[-1]
+    with open(segment, "ab") as journal_file:
+        journal_file.write(b'["p","')
+
+    restored = create_journaled_storage(str(directory), commit_delay=0)
+    assert len(restored.projects) == 1
+    restored.close()
+
+
+def test_journal_applies_batched_saves_atomically(tmp_path):
+    directory = tmp_path / "journal"
+    storage = create_journaled_storage(str(directory), commit_delay=0)
+    testcases = [generate_testcase(uuid4()) for _ in range(3)]
+    storage.testcases.add_many(testcases)
+    for testcase in testcases:
+        testcase.archived = True
+    storage.testcases.save_many(testcases[:2])
+    storage.close()
+    segment = sorted(directory.glob("journal-*.ndjson"))[-1]
+    batch_line = segment.read_bytes().splitlines()[-1]
+    restored = create_journaled_storage(str(directory), commit_delay=0)
+    assert [restored.testcases.get(str(testcase.id)).archived for testcase in testcases] == [True, True, False]
+    restored.close()
+
+    with open(segment, "r+b") as journal_file:
+        journal_file.truncate(len(segment.read_bytes()) - len(batch_line) - 1)
+        journal_file.seek(0, 2)
+        journal_file.write(batch_line[:-10])
+    restored = create_journaled_storage(str(directory), commit_delay=0)
+    assert [restored.testcases.get(str(testcase.id)).archived for testcase in testcases] == [False, False, False]
+    restored.close()
+
+
+def test_testcase_stats_follow_saves(storage):
+    project_id = uuid4()
+    testcases = [generate_testcase(project_id) for _ in range(3)]
+    storage.testcases.add_many(testcases)
+    testcases[0].archived = True
+    testcases[1].author = "Reviewer"
+    testcases[1].tags = ["smoke"]
+    testcases[1].updated_at = datetime.utcnow()
+    storage.testcases.save_many(testcases[:2])
+
+    stats = storage.testcases.stats(str(project_id))
+    assert (stats.total, stats.active, stats.archived) == (3, 2, 1)
+    assert stats.authors == {"Testcase owner": 1, "Reviewer": 1}
+    assert stats.tags == {"test": 1, "tags": 1, "smoke": 1}
+    assert stats.last_updated_at == testcases[1].updated_at
+    assert storage.testcases.stats(str(uuid4())).total == 0
+
+
+def test_partial_saves_only_rebuild_the_affected_indexes(storage):
+    project_id = uuid4()
+    testcase = generate_testcase(project_id)
+    storage.testcases.add(testcase)
+    testcase.title = "Checkout with coupon"
+    storage.testcases.save(testcase, {"title"})
+    assert storage.testcases.search(str(project_id), "coupon", 10) == [testcase]
+    assert storage.testcases.tag_counts(str(project_id)) == {"test": 1, "tags": 1}
+
+    testcase.tags = ["smoke"]
+    testcase.author = "Reviewer"
+    storage.testcases.save(testcase, {"tags", "author"})
+    assert storage.testcases.get(str(testcase.id)) == testcase
+    assert storage.testcases.find_by_project(str(project_id), None, 10, tags=["smoke"]) == ([testcase], None)
+    assert storage.testcases.tag_counts(str(project_id)) == {"smoke": 1}
+    assert storage.testcases.stats(str(project_id)).authors == {"Reviewer": 1}
+
+    project = generate_project(tags=["before"])
+    storage.projects.add(project)
+    project.title = "Renamed project"
+    storage.projects.save(project, {"title"})
+    assert storage.projects.get(str(project.id)) == project
+    assert storage.projects.find(None, 10, tags=["before"]) == ([project], None)
+
+
+def test_sqlite_stats_are_backfilled_for_existing_databases(tmp_path):
+    path = str(tmp_path / "existing.db")
+    storage = create_sqlite_storage(path, pool_size=1)
+    project_id = uuid4()
+    storage.testcases.add_many([generate_testcase(project_id) for _ in range(2)])
+    with storage.pool.connection() as connection, connection:
+        for table in ("testcase_stats", "testcase_author_stats", "testcase_tag_stats"):
+            connection.execute(f"DELETE FROM {table}")
+    storage.close()
+
+    reopened = create_sqlite_storage(path, pool_size=1)
+    stats = reopened.testcases.stats(str(project_id))
+    assert (stats.total, stats.active, stats.authors) == (2, 2, {"Testcase owner": 2})
+    assert reopened.testcases.tag_counts(str(project_id)) == {"test": 2, "tags": 2}
+    reopened.close()
+
+
+def test_change_feed_keeps_latest_change_per_record(storage):
+    project = generate_project()
+    storage.projects.add(project)
+    testcase = generate_testcase(project.id)
+    storage.testcases.add(testcase)
+    storage.projects.save(project)
+
+    entries = storage.feed.read(0, 10)
+    assert [(entry.kind, entry.record_id) for entry in entries] == [
+        ("testcase", str(testcase.id)), ("project", str(project.id))
+    ]
+    assert entries[-1].seq == storage.feed.last_seq()
+    assert storage.feed.read(entries[0].seq, 10) == entries[1:]
+    assert storage.feed.read(0, 1) == entries[:1]
+
+
+def test_run_results_are_appended_and_counted(storage):
+    project_id = uuid4()
+    run = generate_run(project_id)
+    storage.runs.add(run)
+    testcase_ids = [uuid4() for _ in range(3)]
+    started = datetime(2024, 1, 1, 12)
+    results = [
+        generate_result(run.id, testcase_ids[0], "passed", started),
+        generate_result(run.id, testcase_ids[1], "failed", started + timedelta(seconds=1)),
+        generate_result(run.id, testcase_ids[2], "passed", started + timedelta(seconds=2)),
+    ]
+    storage.runs.append_results(str(run.id), results[:2])
+    storage.runs.append_results(str(run.id), results[2:])
+
+    stored = storage.runs.get(str(run.id))
+    assert (stored.id, stored.name, stored.environment) == (run.id, run.name, run.environment)
+    assert (stored.total, stored.statuses) == (3, {"passed": 2, "failed": 1})
+    assert stored.last_finished_at == started + timedelta(seconds=2)
+    page, cursor = storage.runs.results(str(run.id), None, 2)
+    assert summarize(page) == summarize(results[:2])
+    assert page[0].output == "passed output"
+    assert summarize(storage.runs.results(str(run.id), cursor, 2)[0]) == summarize(results[2:])
+    assert storage.runs.results(str(run.id), cursor, 2)[1] is None
+    assert storage.runs.count_results() == 3
+    assert storage.runs.get(str(uuid4())) is None
+    assert storage.runs.find_by_project(str(project_id), None, 10)[0][0].id == run.id
+    assert len(storage.runs) == 1
+
+
+def test_out_of_range_duration_rejects_the_whole_batch(storage):
+    run = generate_run(uuid4())
+    storage.runs.add(run)
+    first, second = uuid4(), uuid4()
+    oversized = generate_result(run.id, first, "failed")
+    oversized.duration_ms = 2 ** 64
+    with pytest.raises(ValueError):
+        storage.runs.append_results(str(run.id), [generate_result(run.id, first, "passed"), oversized])
+    assert storage.runs.count_results() == 0
+    assert storage.runs.get(str(run.id)).total == 0
+    assert storage.runs.latest(str(first)) is None
+
+    storage.runs.append_results(str(run.id), [generate_result(run.id, second, "passed")])
+    assert summarize(storage.runs.results(str(run.id), None, 10)[0]) == summarize([storage.runs.latest(str(second))])
+    assert storage.runs.latest(str(second)).status == "passed"
+
+
+def test_result_log_rolls_back_rows_that_do_not_fit():
+    log = ResultLog()
+    log.run_ids.append(str(uuid4()))
+    log.append(0, log.testcase_key(str(uuid4())), 0, 5, None, 0)
+    with pytest.raises(OverflowError):
+        log.append(0, log.testcase_key(str(uuid4())), 1, 2 ** 64, None, 0)
+    position = log.append(0, log.testcase_key(str(uuid4())), 0, 7, "ok", 0)
+    assert position == 1
+    assert [len(column) for column in (log.runs, log.testcases, log.statuses, log.durations, log.finished_at)] == [
+        2, 2, 2, 2, 2
+    ]
+    assert (log.materialize(1).status, log.materialize(1).duration_ms) == ("passed", 7)
+
+
+def test_latest_result_keeps_the_most_recent_finish(storage):
+    project_id = uuid4()
+    first, second = generate_run(project_id), generate_run(project_id)
+    storage.runs.add(first)
+    storage.runs.add(second)
+    flaky, stable = uuid4(), uuid4()
+    started = datetime(2024, 1, 1, 12)
+    storage.runs.append_results(str(first.id), [
+        generate_result(first.id, flaky, "passed", started),
+        generate_result(first.id, stable, "passed", started),
+    ])
+    storage.runs.append_results(str(second.id), [
+        generate_result(second.id, flaky, "failed", started + timedelta(minutes=5)),
+        generate_result(second.id, flaky, "error", started + timedelta(minutes=1)),
+    ])
+    storage.runs.append_results(str(first.id), [generate_result(first.id, stable, "skipped", started - timedelta(1))])
+
+    assert storage.runs.latest(str(flaky)).status == "failed"
+    assert storage.runs.latest(str(flaky)).run_id == second.id
+    assert storage.runs.latest(str(stable)).status == "passed"
+    assert storage.runs.latest(str(uuid4())) is None
+    latest = storage.runs.latest_by_project(str(project_id), None, 10)[0]
+    assert sorted((str(result.testcase_id), result.status) for result in latest) == sorted(
+        [(str(flaky), "failed"), (str(stable), "passed")]
+    )
+    failing = storage.runs.latest_by_project(str(project_id), None, 10, status="failed")[0]
+    assert [result.testcase_id for result in failing] == [flaky]
+    assert storage.runs.latest_by_project(str(project_id), None, 10, status="error") == ([], None)
+    page, cursor = storage.runs.latest_by_project(str(project_id), None, 1)
+    assert len(page) == 1 and cursor is not None
+    assert summarize(storage.runs.latest_by_project(str(project_id), cursor, 1)[0]) == summarize([
+        result for result in latest if result.testcase_id != page[0].testcase_id
+    ])
+
+
+def test_result_times_are_stored_in_utc(storage):
+    run = generate_run(uuid4())
+    storage.runs.add(run)
+    finished_at = datetime(2024, 1, 1, 14, tzinfo=timezone(timedelta(hours=2)))
+    storage.runs.append_results(str(run.id), [generate_result(run.id, uuid4(), "passed", finished_at)])
+    assert storage.runs.results(str(run.id), None, 1)[0][0].finished_at == datetime(2024, 1, 1, 12)
+
+
+def test_result_rollups_count_statuses_per_bucket(storage):
+    project_id = uuid4()
+    run = generate_run(project_id)
+    storage.runs.add(run)
+    flaky, stable = uuid4(), uuid4()
+    wednesday = datetime(2024, 1, 3, 10, 15)
+    storage.runs.append_results(str(run.id), [
+        generate_result(run.id, flaky, "passed", wednesday),
+        generate_result(run.id, flaky, "failed", wednesday + timedelta(minutes=30)),
+        generate_result(run.id, flaky, "skipped", wednesday + timedelta(hours=1)),
+        generate_result(run.id, stable, "passed", wednesday + timedelta(days=1)),
+    ])
+    storage.runs.append_results(str(run.id), [generate_result(run.id, flaky, "error", wednesday - timedelta(days=7))])
+
+    hours = storage.runs.testcase_history(str(flaky), "hour", None, None, 10)
+    assert [(bucket.start, bucket.total, bucket.statuses, bucket.pass_rate) for bucket in hours] == [
+        (datetime(2023, 12, 27, 10), 1, {"error": 1}, 0.0),
+        (datetime(2024, 1, 3, 10), 2, {"passed": 1, "failed": 1}, 0.5),
+        (datetime(2024, 1, 3, 11), 1, {"skipped": 1}, None),
+    ]
+    days = storage.runs.project_history(str(project_id), "day", None, None, 10)
+    assert [(bucket.start, bucket.total) for bucket in days] == [
+        (datetime(2023, 12, 27), 1), (datetime(2024, 1, 3), 3), (datetime(2024, 1, 4), 1)
+    ]
+    weeks = storage.runs.project_history(str(project_id), "week", None, None, 10)
+    assert [(bucket.start, bucket.statuses) for bucket in weeks] == [
+        (datetime(2023, 12, 25), {"error": 1}),
+        (datetime(2024, 1, 1), {"passed": 2, "failed": 1, "skipped": 1}),
+    ]
+    assert [bucket.start for bucket in storage.runs.project_history(str(project_id), "day", None, None, 2)] == [
+        datetime(2024, 1, 3), datetime(2024, 1, 4)
+    ]
+    window = storage.runs.project_history(
+        str(project_id), "day", datetime(2024, 1, 3, 12), datetime(2024, 1, 4), 10
+    )
+    assert [bucket.start for bucket in window] == [datetime(2024, 1, 3)]
+    assert storage.runs.testcase_history(str(uuid4()), "day", None, None, 10) == []
+    assert storage.runs.project_history(str(uuid4()), "day", None, None, 10) == []
+
+
+def test_sqlite_rollups_are_backfilled_for_existing_databases(tmp_path):
+    path = str(tmp_path / "existing.db")
+    storage = create_sqlite_storage(path, pool_size=1)
+    run = generate_run(uuid4())
+    storage.runs.add(run)
+    testcase_id = uuid4()
+    storage.runs.append_results(str(run.id), [
+        generate_result(run.id, testcase_id, status, datetime(2024, 1, 3, 10)) for status in ("passed", "failed")
+    ])
+    expected = storage.runs.testcase_history(str(testcase_id), "week", None, None, 10)
+    with storage.pool.connection() as connection, connection:
+        connection.execute("DELETE FROM result_rollups")
+    storage.close()
+
+    reopened = create_sqlite_storage(path, pool_size=1)
+    assert reopened.runs.testcase_history(str(testcase_id), "week", None, None, 10) == expected
+    assert reopened.runs.project_history(str(run.project_id), "hour", None, None, 10)[0].pass_rate == 0.5
+    reopened.close()
+
+
+def test_journal_replays_run_results_after_restart(tmp_path):
+    directory = str(tmp_path / "journal")
+    storage = create_journaled_storage(directory, commit_delay=0)
+    project_id = uuid4()
+    run = generate_run(project_id)
+    storage.runs.add(run)
+    testcase_id = uuid4()
+    storage.runs.append_results(str(run.id), [generate_result(run.id, testcase_id, "failed")])
+    storage.snapshot()
+    storage.runs.append_results(str(run.id), [generate_result(run.id, testcase_id, "passed")])
+    expected = storage.runs.results(str(run.id), None, 10)[0]
+    storage.close()
+
+    restored = create_journaled_storage(directory, commit_delay=0)
+    assert summarize(restored.runs.results(str(run.id), None, 10)[0]) == summarize(expected)
+    assert restored.runs.get(str(run.id)).statuses == {"failed": 1, "passed": 1}
+    assert restored.runs.latest(str(testcase_id)).status == "passed"
+    assert restored.runs.count_results() == 2
+    assert restored.runs.project_history(str(project_id), "day", None, None, 10)[0].statuses == {
+        "failed": 1, "passed": 1
+    }
+    restored.close()
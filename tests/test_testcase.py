@@ -3,11 +3,13 @@ from config.endpoints import EndpointConfig
 from fastapi import status
 from main import app
 from config.errormessage import ErrorsConfig
+from config.settings import SettingsConfig
 from typing import Tuple
 
 httpclient = TestClient(app)
 URL = EndpointConfig()
 ERRORS_CONF = ErrorsConfig()
+SETTINGS_CONF = SettingsConfig()
 
 
 def generate_create_testcase_payload(
@@ -123,6 +125,21 @@ def test_create_testcase_with_non_existing_project_id():
     assert json_response['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
 
 
+def test_create_testcase_under_deleted_project():
+    project_id = get_created_project_id()
+    httpclient.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+    single = httpclient.post(
+        URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id), json=generate_create_testcase_payload()
+    )
+    bulk = httpclient.post(
+        URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id), json=[generate_create_testcase_payload()]
+    )
+    for response in (single, bulk):
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+    assert httpclient.get(URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id)).json()['items'] == []
+
+
 def test_create_testcase_using_title_with_space_only_as_value():
     payload = generate_create_testcase_payload(title=" ")
     assert_create_project_should_return_error_when_mandatory_fields_use_spaces_only(payload)
@@ -153,6 +170,12 @@ def test_create_testcase_using_spaces_only_on_tag_values():
     assert_create_project_should_return_error_when_mandatory_fields_use_spaces_only(payload)
 
 
+def test_create_testcase_with_mixed_blank_tags_reports_empty_strings_first():
+    for tags in ([" ", ""], ["", " "]):
+        payload = generate_create_testcase_payload(tags=tags)
+        assert_empty_field_in_create_project_should_return_error(payload)
+
+
 def test_get_created_testcase_details():
     payload = generate_create_testcase_payload()
     project_id = get_created_project_id()
@@ -524,3 +547,225 @@ def test_delete_a_test_case():
     assert testcase.status_code == 200
     testcase_json = testcase.json()
     assert testcase_json['archived']
+
+
+def create_testcases_under_project(project_id: str, count: int) -> list:
+    testcase_ids = []
+    for index in range(count):
+        response = httpclient.post(
+            URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id),
+            json=generate_create_testcase_payload(title=f"Testcase {index}")
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        testcase_ids.append(response.json()['id'])
+    return testcase_ids
+
+
+def test_get_all_testcases_under_project():
+    project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 3)
+    response = httpclient.get(URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id))
+    json_response = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert [testcase['id'] for testcase in json_response['items']] == testcase_ids
+    assert json_response['next_cursor'] is None
+
+
+def test_get_all_testcases_does_not_include_testcases_from_other_projects():
+    project_id = get_created_project_id()
+    other_project_id = get_created_project_id()
+    create_testcases_under_project(other_project_id, 2)
+    testcase_ids = create_testcases_under_project(project_id, 1)
+    response = httpclient.get(URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id))
+    assert [testcase['id'] for testcase in response.json()['items']] == testcase_ids
+
+
+def test_get_all_testcases_using_cursor_pagination():
+    project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 5)
+    url = URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id)
+    first_page = httpclient.get(url, params={'limit': 2}).json()
+    second_page = httpclient.get(url, params={'limit': 2, 'cursor': first_page['next_cursor']}).json()
+    third_page = httpclient.get(url, params={'limit': 2, 'cursor': second_page['next_cursor']}).json()
+    assert [testcase['id'] for testcase in first_page['items']] == testcase_ids[:2]
+    assert [testcase['id'] for testcase in second_page['items']] == testcase_ids[2:4]
+    assert [testcase['id'] for testcase in third_page['items']] == testcase_ids[4:]
+    assert third_page['next_cursor'] is None
+
+
+def test_get_all_testcases_using_invalid_limit():
+    project_id = get_created_project_id()
+    response = httpclient.get(URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id), params={'limit': 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_all_testcases_using_non_existing_project_id():
+    response = httpclient.get(URL.TESTCASE.GET_ALL_TESTCASE.format(project_id='NON_EXISTING'))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_get_all_testcases_filtered_by_tags():
+    project_id = get_created_project_id()
+    ids = {}
+    for name, tags in (('smoke-api', ['smoke', 'api']), ('smoke-ui', ['smoke', 'ui']), ('regression', ['api'])):
+        response = httpclient.post(
+            URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id),
+            json=generate_create_testcase_payload(title=name, tags=tags)
+        )
+        ids[name] = response.json()['id']
+    url = URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id)
+    every_tag = httpclient.get(url, params={'tags': ['smoke', 'api']}).json()
+    any_tag = httpclient.get(url, params={'any_tags': ['ui', 'api']}).json()
+    assert [testcase['id'] for testcase in every_tag['items']] == [ids['smoke-api']]
+    assert [testcase['id'] for testcase in any_tag['items']] == [ids['smoke-api'], ids['smoke-ui'], ids['regression']]
+
+
+def test_get_testcase_tags_excludes_archived_testcases():
+    project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 2)
+    url = URL.TESTCASE.GET_TESTCASE_TAGS.format(project_id=project_id)
+    assert httpclient.get(url).json()['tags'] == {'test': 2, 'tags': 2}
+
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_ids[0]))
+    assert httpclient.get(url).json()['tags'] == {'test': 1, 'tags': 1}
+
+
+def test_get_testcase_tags_using_non_existing_project_id():
+    response = httpclient.get(URL.TESTCASE.GET_TESTCASE_TAGS.format(project_id='NON_EXISTING'))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_testcase_details_with_matching_etag_returns_not_modified():
+    project_id, testcase_id = get_created_testcase_id_and_project_id(generate_create_testcase_payload())
+    url = URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+    etag = httpclient.get(url).headers['etag']
+    response = httpclient.get(url, headers={'if-none-match': f'"other", W/{etag}'})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers['etag'] == etag
+
+
+def test_update_testcase_with_etag_precondition():
+    project_id, testcase_id = get_created_testcase_id_and_project_id(generate_create_testcase_payload())
+    detail_url = URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+    update_url = URL.TESTCASE.UPDATE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+    etag = httpclient.get(detail_url).headers['etag']
+    stale_response = httpclient.put(
+        update_url,
+        json=generate_create_testcase_payload(title='stale'),
+        headers={'if-match': '"stale"'}
+    )
+    fresh_response = httpclient.put(
+        update_url,
+        json=generate_create_testcase_payload(title='fresh'),
+        headers={'if-match': etag}
+    )
+    assert stale_response.status_code == status.HTTP_412_PRECONDITION_FAILED
+    assert fresh_response.status_code == status.HTTP_200_OK
+    assert httpclient.get(detail_url, headers={'if-none-match': etag}).status_code == status.HTTP_200_OK
+
+
+def test_batch_get_testcases_returns_found_and_missing_ids():
+    project_id = get_created_project_id()
+    other_project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 3)
+    other_testcase_id = create_testcases_under_project(other_project_id, 1)[0]
+    requested = [testcase_ids[2], 'NON_EXISTING', other_testcase_id, testcase_ids[0], testcase_ids[2]]
+    response = httpclient.post(
+        URL.TESTCASE.BATCH_GET_TESTCASE.format(project_id=project_id),
+        json={'ids': requested}
+    )
+    json_response = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert [testcase['id'] for testcase in json_response['items']] == [testcase_ids[2], testcase_ids[0]]
+    assert json_response['items'][0]['project_id'] == project_id
+    assert json_response['missing'] == ['NON_EXISTING', other_testcase_id]
+
+
+def test_batch_get_testcases_using_non_existing_project_id():
+    response = httpclient.post(
+        URL.TESTCASE.BATCH_GET_TESTCASE.format(project_id='NON_EXISTING'),
+        json={'ids': ['NON_EXISTING']}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_batch_get_testcases_with_too_many_ids():
+    project_id = get_created_project_id()
+    response = httpclient.post(
+        URL.TESTCASE.BATCH_GET_TESTCASE.format(project_id=project_id),
+        json={'ids': [str(index) for index in range(SETTINGS_CONF.BULK.MAX_LOOKUP_IDS + 1)]}
+    )
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.TOO_MANY_LOOKUP_IDS
+
+
+def test_patch_testcase_title_keeps_other_fields_and_updates_search():
+    payload = generate_create_testcase_payload()
+    project_id, testcase_id = get_created_testcase_id_and_project_id(payload)
+    url = URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+    response = httpclient.patch(url, json={'title': 'Checkout with voucher'})
+    json_response = response.json()
+    assert response.status_code == status.HTTP_200_OK
+    assert json_response['title'] == 'Checkout with voucher'
+    assert json_response['description'] == payload['description']
+    assert json_response['tags'] == payload['tags']
+    assert json_response['updated_by'] == payload['author']
+    search = httpclient.get(URL.TESTCASE.SEARCH_TESTCASE.format(project_id=project_id), params={'q': 'voucher'})
+    assert [testcase['id'] for testcase in search.json()['items']] == [testcase_id]
+
+
+def test_patch_testcase_tags_updates_tag_counts_and_stats():
+    project_id, testcase_id = get_created_testcase_id_and_project_id(generate_create_testcase_payload())
+    url = URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id)
+    assert httpclient.patch(url, json={'tags': ['smoke']}).json()['tags'] == ['smoke']
+    tags = httpclient.get(URL.TESTCASE.GET_TESTCASE_TAGS.format(project_id=project_id)).json()['tags']
+    assert tags == {'smoke': 1}
+    assert httpclient.patch(url, json={'tags': None}).json()['tags'] is None
+    stats = httpclient.get(URL.PROJECT.GET_PROJECT_STATS.format(project_id=project_id)).json()
+    assert stats['tags'] == {}
+
+
+def test_patch_testcase_required_field_to_null_should_return_error():
+    project_id, testcase_id = get_created_testcase_id_and_project_id(generate_create_testcase_payload())
+    response = httpclient.patch(
+        URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id),
+        json={'expected_results': None}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.NULL_NOT_ALLOWED
+
+
+def test_patch_testcase_without_changes_keeps_etag():
+    payload = generate_create_testcase_payload()
+    project_id, testcase_id = get_created_testcase_id_and_project_id(payload)
+    detail_url = URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+    etag = httpclient.get(detail_url).headers['etag']
+    response = httpclient.patch(
+        URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id),
+        json={'title': payload['title']}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] == etag
+
+
+def test_patch_testcase_using_another_project_id():
+    _, testcase_id = get_created_testcase_id_and_project_id(generate_create_testcase_payload())
+    response = httpclient.patch(
+        URL.TESTCASE.PATCH_TESTCASE.format(project_id=get_created_project_id(), testcase_id=testcase_id),
+        json={'title': 'Patched'}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def test_patch_an_archived_test_case():
+    project_id, testcase_id = get_created_testcase_id_and_project_id(generate_create_testcase_payload())
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id))
+    response = httpclient.patch(
+        URL.TESTCASE.PATCH_TESTCASE.format(project_id=project_id, testcase_id=testcase_id),
+        json={'title': 'Patched'}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.TESTCASE_DOES_NOT_EXIST
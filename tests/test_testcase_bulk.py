@@ -0,0 +1,221 @@
+import asyncio
+import json
+import httpx
+from fastapi.testclient import TestClient
+from fastapi import status
+from config.endpoints import EndpointConfig
+from config.errormessage import ErrorsConfig
+from main import app
+from tests.test_testcase import (
+    create_testcases_under_project, generate_create_testcase_payload, get_created_project_id
+)
+
+httpclient = TestClient(app)
+URL = EndpointConfig()
+ERRORS_CONF = ErrorsConfig()
+
+
+def test_bulk_create_testcases_from_json_array():
+    project_id = get_created_project_id()
+    payload = [generate_create_testcase_payload(title=f"Bulk testcase {index}") for index in range(3)]
+    response = httpclient.post(URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id), json=payload)
+    json_response = response.json()
+    assert response.status_code == status.HTTP_201_CREATED
+    assert json_response['succeeded'] == 3
+    assert json_response['failed'] == 0
+
+    listed = httpclient.get(URL.TESTCASE.GET_ALL_TESTCASE.format(project_id=project_id)).json()
+    assert [testcase['id'] for testcase in listed['items']] == [result['id'] for result in json_response['results']]
+    assert [testcase['title'] for testcase in listed['items']] == [item['title'] for item in payload]
+
+
+def test_bulk_create_testcases_from_ndjson_stream():
+    project_id = get_created_project_id()
+    lines = [json.dumps(generate_create_testcase_payload(title=f"Streamed {index}")) for index in range(2)]
+    response = httpclient.post(
+        URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id),
+        content="\n".join(lines) + "\n",
+        headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()['succeeded'] == 2
+
+
+def test_bulk_create_testcases_reports_invalid_items():
+    project_id = get_created_project_id()
+    lines = [
+        json.dumps(generate_create_testcase_payload()),
+        json.dumps(generate_create_testcase_payload(title="")),
+        "{not json",
+    ]
+    response = httpclient.post(
+        URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id),
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"}
+    )
+    results = response.json()['results']
+    assert response.json()['succeeded'] == 1
+    assert response.json()['failed'] == 2
+    assert results[0]['id'] is not None
+    assert results[1]['detail'][0]['msg'] == ERRORS_CONF.FIELD_VALUE.EMPTY_STRINGS
+    assert results[2]['detail'][0]['msg'] == ERRORS_CONF.GENERAL_ERRORS.INVALID_JSON_LINE
+
+
+def test_bulk_create_testcases_with_non_array_body():
+    project_id = get_created_project_id()
+    response = httpclient.post(
+        URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id),
+        json=generate_create_testcase_payload()
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_BODY
+
+
+def test_bulk_create_testcases_with_non_existing_project_id():
+    response = httpclient.post(
+        URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id="NON_EXISTING"),
+        json=[generate_create_testcase_payload()]
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+
+
+def get_testcase(project_id: str, testcase_id: str) -> dict:
+    return httpclient.get(
+        URL.TESTCASE.GET_TESTCASE_DETAIL.format(project_id=project_id, testcase_id=testcase_id)
+    ).json()
+
+
+def test_bulk_create_testcases_when_project_is_deleted_mid_stream():
+    project_id = get_created_project_id()
+    url = URL.TESTCASE.BULK_CREATE_TESTCASE.format(project_id=project_id)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            async def stream():
+                yield (json.dumps(generate_create_testcase_payload(title="Before delete")) + "\n").encode()
+                deleted = await client.delete(URL.PROJECT.DELETE_PROJECT.format(project_id=project_id))
+                assert deleted.status_code == status.HTTP_200_OK
+                yield (json.dumps(generate_create_testcase_payload(title="After delete")) + "\n").encode()
+
+            return await client.post(url, content=stream(), headers={"content-type": "application/x-ndjson"})
+
+    response = asyncio.run(run())
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
+    assert httpclient.get(URL.PROJECT.GET_ARCHIVE_JOB.format(project_id=project_id)).json()['status'] == "completed"
+    stats = httpclient.get(URL.PROJECT.GET_PROJECT_STATS.format(project_id=project_id)).json()
+    assert (stats['active'], stats['archived']) == (0, 0)
+
+
+def test_bulk_update_testcases_by_ids():
+    project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 3)
+    response = httpclient.post(
+        URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id),
+        json={
+            "select": {"ids": testcase_ids[:2]},
+            "changes": {"expected_results": "should still pass", "add_tags": ["release-2"], "remove_tags": ["test"]},
+            "updated_by": "Release bot"
+        }
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"updated": 2, "ids": testcase_ids[:2]}
+    for testcase_id in testcase_ids[:2]:
+        testcase = get_testcase(project_id, testcase_id)
+        assert testcase['expected_results'] == "should still pass"
+        assert testcase['tags'] == ["tags", "release-2"]
+        assert testcase['updated_by'] == "Release bot"
+    assert get_testcase(project_id, testcase_ids[2])['tags'] == ["test", "tags"]
+    tag_counts = httpclient.get(URL.TESTCASE.GET_TESTCASE_TAGS.format(project_id=project_id)).json()['tags']
+    assert tag_counts == {"test": 1, "tags": 3, "release-2": 2}
+
+
+def test_bulk_update_testcases_by_filter():
+    project_id = get_created_project_id()
+    url = URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id)
+    matching = httpclient.post(url, json=generate_create_testcase_payload(author="Alice", tags=["ui"])).json()['id']
+    httpclient.post(url, json=generate_create_testcase_payload(author="Bob", tags=["ui"]))
+    httpclient.post(url, json=generate_create_testcase_payload(author="Alice", tags=["api"]))
+    response = httpclient.post(
+        URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id),
+        json={"select": {"tags": ["ui"], "author": "Alice"}, "changes": {"title": "Retitled"}, "updated_by": "Bot"}
+    )
+    assert response.json() == {"updated": 1, "ids": [matching]}
+    assert get_testcase(project_id, matching)['title'] == "Retitled"
+
+
+def test_bulk_update_testcases_is_all_or_nothing():
+    project_id = get_created_project_id()
+    other_project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 2)
+    foreign_id = create_testcases_under_project(other_project_id, 1)[0]
+    response = httpclient.post(
+        URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id),
+        json={"select": {"ids": testcase_ids + [foreign_id]}, "changes": {"title": "Partial"}, "updated_by": "Bot"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['missing'] == [foreign_id]
+    assert [get_testcase(project_id, testcase_id)['title'] for testcase_id in testcase_ids] == [
+        "Testcase 0", "Testcase 1"
+    ]
+
+
+def test_bulk_update_testcases_rejects_invalid_requests():
+    project_id = get_created_project_id()
+    url = URL.TESTCASE.BULK_UPDATE_TESTCASE.format(project_id=project_id)
+    both = httpclient.post(
+        url, json={"select": {"ids": [], "author": "Alice"}, "changes": {"title": "x"}, "updated_by": "Bot"}
+    )
+    empty = httpclient.post(url, json={"select": {"author": "Alice"}, "changes": {}, "updated_by": "Bot"})
+    blank = httpclient.post(url, json={"select": {"author": "Alice"}, "changes": {"title": " "}, "updated_by": "Bot"})
+    assert both.status_code == status.HTTP_400_BAD_REQUEST
+    assert both.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_SELECTION
+    assert empty.status_code == status.HTTP_400_BAD_REQUEST
+    assert empty.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.EMPTY_BULK_CHANGES
+    assert blank.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_bulk_archive_rejects_empty_filters():
+    project_id = get_created_project_id()
+    testcase_ids = create_testcases_under_project(project_id, 2)
+    url = URL.TESTCASE.BULK_ARCHIVE_TESTCASE.format(project_id=project_id)
+    for selection in ({"tags": []}, {"author": ""}, {"tags": [], "author": ""}):
+        response = httpclient.post(url, json={"select": selection})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.INVALID_BULK_SELECTION
+    assert [get_testcase(project_id, testcase_id)['archived'] for testcase_id in testcase_ids] == [False, False]
+
+
+def test_bulk_archive_testcases_by_tag():
+    project_id = get_created_project_id()
+    url = URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id)
+    obsolete = [
+        httpclient.post(url, json=generate_create_testcase_payload(tags=["obsolete"])).json()['id'] for _ in range(2)
+    ]
+    kept = httpclient.post(url, json=generate_create_testcase_payload(tags=["current"])).json()['id']
+    response = httpclient.post(
+        URL.TESTCASE.BULK_ARCHIVE_TESTCASE.format(project_id=project_id),
+        json={"select": {"tags": ["obsolete"]}}
+    )
+    assert response.json() == {"updated": 2, "ids": obsolete}
+    assert [get_testcase(project_id, testcase_id)['archived'] for testcase_id in obsolete + [kept]] == [
+        True, True, False
+    ]
+    stats = httpclient.get(URL.PROJECT.GET_PROJECT_STATS.format(project_id=project_id)).json()
+    assert (stats['active'], stats['archived']) == (1, 2)
+
+    again = httpclient.post(
+        URL.TESTCASE.BULK_ARCHIVE_TESTCASE.format(project_id=project_id),
+        json={"select": {"ids": obsolete}}
+    )
+    assert again.json() == {"updated": 0, "ids": []}
+
+
+def test_bulk_archive_testcases_with_non_existing_project_id():
+    response = httpclient.post(
+        URL.TESTCASE.BULK_ARCHIVE_TESTCASE.format(project_id='NON_EXISTING'),
+        json={"select": {"author": "Alice"}}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
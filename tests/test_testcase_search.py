@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+from fastapi import status
+from config.endpoints import EndpointConfig
+from config.errormessage import ErrorsConfig
+from main import app
+from tests.test_testcase import generate_create_testcase_payload, get_created_project_id
+
+httpclient = TestClient(app)
+URL = EndpointConfig()
+ERRORS_CONF = ErrorsConfig()
+
+
+def create_testcase(project_id: str, **fields) -> str:
+    response = httpclient.post(
+        URL.TESTCASE.CREATE_TESTCASE.format(project_id=project_id),
+        json=generate_create_testcase_payload(**fields)
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()['id']
+
+
+def search(project_id: str, query: str) -> list:
+    response = httpclient.get(URL.TESTCASE.SEARCH_TESTCASE.format(project_id=project_id), params={'q': query})
+    assert response.status_code == status.HTTP_200_OK
+    return [testcase['id'] for testcase in response.json()['items']]
+
+
+def test_search_testcases_ranks_title_matches_first():
+    project_id = get_created_project_id()
+    description_match = create_testcase(project_id, title="Checkout flow", description="Verify login redirect")
+    title_match = create_testcase(project_id, title="Login with valid password")
+    create_testcase(project_id, title="Logout")
+    assert search(project_id, "login") == [title_match, description_match]
+
+
+def test_search_testcases_using_prefix_and_multiple_terms():
+    project_id = get_created_project_id()
+    testcase_id = create_testcase(project_id, title="Password reset", expected_results="Email delivered")
+    create_testcase(project_id, title="Password change", expected_results="Saved")
+    assert search(project_id, "pass deliv") == [testcase_id]
+
+
+def test_search_testcases_is_scoped_to_project():
+    project_id = get_created_project_id()
+    other_project_id = get_created_project_id()
+    create_testcase(other_project_id, title="Scoped search term")
+    assert search(project_id, "scoped") == []
+
+
+def test_search_testcases_reflects_updates_and_archives():
+    project_id = get_created_project_id()
+    testcase_id = create_testcase(project_id, title="Original wording")
+    httpclient.put(
+        URL.TESTCASE.UPDATE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id),
+        json=generate_create_testcase_payload(title="Revised wording")
+    )
+    assert search(project_id, "original") == []
+    assert search(project_id, "revised") == [testcase_id]
+
+    httpclient.delete(URL.TESTCASE.DELETE_TESTCASE.format(project_id=project_id, testcase_id=testcase_id))
+    assert search(project_id, "revised") == []
+
+
+def test_search_testcases_with_non_existing_project_id():
+    response = httpclient.get(URL.TESTCASE.SEARCH_TESTCASE.format(project_id='NON_EXISTING'), params={'q': 'login'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json()['error'] == ERRORS_CONF.GENERAL_ERRORS.PROJECT_DOES_NOT_EXIST
@@ -0,0 +1,51 @@
+import json
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+
+class CachedRecord(NamedTuple):
+    body: bytes
+    etag: str
+    project_id: str
+
+
+def encode_record(record: BaseModel) -> bytes:
+    return json.dumps(jsonable_encoder(record), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, encode: Callable[[BaseModel], bytes] = encode_record):
+        self.max_entries = max_entries
+        self.encode = encode
+        self._entries: "OrderedDict[str, CachedRecord]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CachedRecord]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, record: BaseModel, etag: str, project_id: str) -> CachedRecord:
+        entry = CachedRecord(body=self.encode(record), etag=etag, project_id=project_id)
+        if self.max_entries > 0:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def resize(self, max_entries: int):
+        self.max_entries = max_entries
+        while len(self._entries) > max(max_entries, 0):
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,24 @@
+from storage.journal import pending_commits, wait_for_commits
+
+
+class DurableResponseMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        pending = {}
+        token = pending_commits.set(pending)
+
+        async def send_wrapper(message):
+            if pending:
+                await wait_for_commits(pending)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            await wait_for_commits(pending)
+        finally:
+            pending_commits.reset(token)
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Any, Optional
+from models.projects import ProjectResponseModel
+from models.testcase import TestCaseResponseModel
+
+
+def compute_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def project_etag(project: ProjectResponseModel) -> str:
+    return compute_etag(project.id, project.updated_at.isoformat(), project.active)
+
+
+def testcase_etag(testcase: TestCaseResponseModel) -> str:
+    return compute_etag(testcase.id, testcase.updated_at.isoformat(), testcase.archived)
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool) -> bool:
+    if header is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
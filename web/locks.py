@@ -0,0 +1,47 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+
+class RecordLock:
+    __slots__ = ("lock", "holders")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.holders = 0
+
+
+class RecordLocks:
+    def __init__(self):
+        self._locks: Dict[str, RecordLock] = {}
+        self.waits = 0
+
+    @asynccontextmanager
+    async def hold(self, *keys: str) -> AsyncIterator[bool]:
+        entries: List[Tuple[str, RecordLock]] = []
+        for key in sorted(set(keys)):
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = RecordLock()
+            entry.holders += 1
+            entries.append((key, entry))
+        acquired: List[RecordLock] = []
+        waited = False
+        try:
+            for _, entry in entries:
+                if entry.lock.locked():
+                    waited = True
+                    self.waits += 1
+                await entry.lock.acquire()
+                acquired.append(entry)
+            yield waited
+        finally:
+            for entry in acquired:
+                entry.lock.release()
+            for key, entry in entries:
+                entry.holders -= 1
+                if not entry.holders:
+                    del self._locks[key]
+
+    def __len__(self) -> int:
+        return len(self._locks)
@@ -0,0 +1,238 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PHASES = ("validation", "handler", "storage", "serialization")
+INFINITY_BUCKET = 'le="+Inf"'
+UNMATCHED_ROUTE = "unmatched"
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestTimings:
+    __slots__ = ("started", "handler_started", "handler_finished", "response_started", "storage")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.handler_started: Optional[float] = None
+        self.handler_finished: Optional[float] = None
+        self.response_started: Optional[float] = None
+        self.storage = 0.0
+
+
+current_timings: "ContextVar[Optional[RequestTimings]]" = ContextVar("current_timings", default=None)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    labels = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bucket, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_label = f'le="{bucket}"'
+                yield f"{self.name}_bucket{format_labels(self.labels, labels, bucket_label)} {cumulative}"
+            count = cumulative + series[-2]
+            yield f"{self.name}_bucket{format_labels(self.labels, labels, INFINITY_BUCKET)} {count}"
+            yield f"{self.name}_sum{format_labels(self.labels, labels)} {series[-1]}"
+            yield f"{self.name}_count{format_labels(self.labels, labels)} {count}"
+
+
+class Counter:
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], value: float = 1):
+        self._series[labels] = self._series.get(labels, 0) + value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self._series.items()):
+            yield f"{self.name}{format_labels(self.labels, labels)} {value}"
+
+
+class Gauge:
+    def __init__(self, name: str, description: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def track(self, labels: Tuple[str, ...], value: Callable[[], float]):
+        self._values[labels] = value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.description}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{format_labels(self.labels, labels)} {value()}"
+
+
+class Metrics:
+    def __init__(self, namespace: str):
+        self.requests = Histogram(
+            f"{namespace}_http_request_duration_seconds",
+            "Time from receiving a request until its response body is sent.",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS
+        )
+        self.phases = Counter(
+            f"{namespace}_http_request_phase_seconds_total",
+            "Time spent per request phase: validation, handler code, storage calls and serialization.",
+            ("method", "route", "phase")
+        )
+        self.in_flight = 0
+        self.gauges = Gauge(f"{namespace}_http_requests_in_flight", "Requests currently being handled.")
+        self.gauges.track((), lambda: self.in_flight)
+        self.store_records = Gauge(f"{namespace}_store_records", "Records held by the storage backend.", ("store",))
+        self.route_paths: Dict[Callable, str] = {}
+
+    def instrument(self, routes: Iterable):
+        for route in routes:
+            dependant = getattr(route, "dependant", None)
+            if dependant is None or route.endpoint in self.route_paths:
+                continue
+            self.route_paths[route.endpoint] = route.path
+            dependant.call = timed_endpoint(dependant.call)
+
+    def record(self, method: str, route: str, status: str, timings: RequestTimings, finished: float):
+        self.requests.observe((method, route, status), finished - timings.started)
+        if timings.handler_started is None or timings.handler_finished is None:
+            return
+        response_started = timings.response_started or finished
+        handler = timings.handler_finished - timings.handler_started - timings.storage
+        for phase, seconds in zip(PHASES, (
+                timings.handler_started - timings.started,
+                handler,
+                timings.storage,
+                response_started - timings.handler_finished)):
+            self.phases.inc((method, route, phase), seconds)
+
+    def render(self) -> str:
+        lines = []
+        for metric in (self.requests, self.phases, self.gauges, self.store_records):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def timed_storage_call(function: Callable) -> Callable:
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        timings = current_timings.get()
+        if timings is None:
+            return function(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings.storage += time.perf_counter() - started
+
+    return wrapper
+
+
+class TimedRepository:
+    def __init__(self, repository):
+        self._repository = repository
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._repository, name)
+        if callable(attribute):
+            attribute = timed_storage_call(attribute)
+            setattr(self, name, attribute)
+        return attribute
+
+    def __len__(self) -> int:
+        return len(self._repository)
+
+
+def instrument_storage(storage):
+    for field in ("projects", "testcases", "jobs", "feed", "runs"):
+        repository = getattr(storage, field)
+        if not isinstance(repository, TimedRepository):
+            setattr(storage, field, TimedRepository(repository))
+    return storage
+
+
+def timed_endpoint(endpoint: Callable) -> Callable:
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timings = current_timings.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        timings.handler_started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings.handler_finished = time.perf_counter()
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings(time.perf_counter())
+        token = current_timings.set(timings)
+        status_code = "500"
+        recorded = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, recorded
+            if message["type"] == "http.response.start":
+                timings.response_started = time.perf_counter()
+                status_code = str(message["status"])
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not recorded:
+                recorded = True
+                self._record(scope, status_code, timings)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight -= 1
+            current_timings.reset(token)
+            if not recorded:
+                self._record(scope, status_code, timings)
+
+    def _record(self, scope, status_code: str, timings: RequestTimings):
+        route = self.metrics.route_paths.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+        self.metrics.record(scope["method"], route, status_code, timings, time.perf_counter())
@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Callable, Dict, Type
+from uuid import UUID
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_model(value: Any) -> Dict[str, Any]:
+    if isinstance(value, BaseModel):
+        return value.__dict__
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    return json.dumps(content, default=encode_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_orjson(content: Any) -> bytes:
+    return orjson.dumps(content, default=encode_model)
+
+
+class ModelJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class ORJSONModelResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps_orjson(content)
+
+
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {"json": dumps_json}
+RESPONSE_CLASSES: Dict[str, Type[JSONResponse]] = {"json": ModelJSONResponse}
+if orjson is not None:
+    ENCODERS["orjson"] = dumps_orjson
+    RESPONSE_CLASSES["orjson"] = ORJSONModelResponse
+
+
+def resolve_encoder(name: str) -> str:
+    if name == "auto":
+        return "orjson" if orjson is not None else "json"
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder {name!r}, expected one of: auto, {', '.join(sorted(ENCODERS))}")
+    return name
+